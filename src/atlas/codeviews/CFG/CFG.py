@@ -13,13 +13,12 @@ class CFGGraph:
 
     def to_networkx(self, CFG_node_list, CFG_edge_list):
         G = nx.MultiDiGraph()
-        for node in CFG_node_list:
-            label = str(node[1]+1) + "_ " + node[2]
-            G.add_node(node[0], label=label, type_label=node[3])
+        G.add_nodes_from(
+            (node[0], {"label": str(node[1]+1) + "_ " + node[2], "type_label": node[3]})
+            for node in CFG_node_list
+        )
+        edges = []
         for edge in CFG_edge_list:
-            additional_data = None
-            if len(edge) == 4:
-                additional_data = edge[3]
             if edge[2].startswith("constructor_call"):
                 normal_label = "constructor_call"
             elif edge[2].startswith("method_call"):
@@ -28,15 +27,14 @@ class CFGGraph:
                 normal_label = "virtual_call"
             else:
                 normal_label = edge[2]
-            G.add_edge(
-                edge[0],
-                edge[1],
-                controlflow_type=edge[2],
-                edge_type="CFG_edge",
-                label=normal_label,
-                color="red",
-            )
-            if additional_data:
-                for key,value in additional_data.items():
-                    G.edges[edge[0], edge[1], 0][key] = value
+            edge_data = {
+                "controlflow_type": edge[2],
+                "edge_type": "CFG_edge",
+                "label": normal_label,
+                "color": "red",
+            }
+            if len(edge) == 4 and edge[3]:
+                edge_data.update(edge[3])
+            edges.append((edge[0], edge[1], edge_data))
+        G.add_edges_from(edges)
         return G
@@ -40,8 +40,12 @@ class CFGGraph_c(CFGGraph):
 
     def get_basic_blocks(self, CFG_node_list, CFG_edge_list):
         """Partition CFG into basic blocks using weakly connected components"""
-        G = self.to_networkx(CFG_node_list, CFG_edge_list)
-        components = nx.weakly_connected_components(G)
+        # Only the connectivity matters here, so use a bare undirected graph
+        # over node ids instead of materializing the attributed MultiDiGraph
+        G = nx.Graph()
+        G.add_nodes_from(node[0] for node in CFG_node_list)
+        G.add_edges_from((edge[0], edge[1]) for edge in CFG_edge_list)
+        components = nx.connected_components(G)
         block_index = 1
         for block in components:
             block_list = sorted(list(block))
@@ -1,4 +1,5 @@
 import traceback
+from functools import lru_cache
 
 import networkx as nx
 from loguru import logger
@@ -6,15 +7,107 @@ from loguru import logger
 from ...utils import cpp_nodes
 from .CFG import CFGGraph
 
+jump_statement_types = frozenset({
+    "break_statement",
+    "continue_statement",
+    "return_statement",
+    "goto_statement",
+    "throw_statement",
+})
+
+break_target_types = frozenset({
+    "while_statement",
+    "for_statement",
+    "for_range_loop",
+    "do_statement",
+    "switch_statement",
+})
+
+# records consumed by add_function_call_edges
+call_record_types = (
+    "function_calls",
+    "method_calls",
+    "static_method_calls",
+    "operator_calls",
+    "constructor_calls",
+    "destructor_calls",
+    "indirect_calls",
+)
+
+# node type -> CFGGraph_cpp handler, filled in by @handles when the class is defined
+node_handlers = {}
+
+
+def handles(*node_types):
+    """Register the decorated CFGGraph_cpp method as the handler for node_types"""
+    def register(handler):
+        for node_type in node_types:
+            node_handlers[node_type] = handler
+        return handler
+    return register
+
+
+primitive_exception_types = frozenset({"int", "float", "string"})
+std_exception_names = frozenset({"std::exception", "exception"})
+
+
+@lru_cache(maxsize=4096)
+def exception_type_matches(thrown_type, catch_type):
+    """
+    Check if a thrown exception type matches a catch parameter type.
+
+    Returns True if the exception can be caught by the catch block.
+    Implements C++ exception matching rules:
+    1. Exact type match
+    2. Derived class to base class (polymorphism)
+    3. Catch-all (...) catches everything
+
+    Args:
+        thrown_type: tuple (type_category, type_string) from extract_thrown_type
+        catch_type: tuple (type_category, type_string) from extract_catch_parameter_type
+    """
+    thrown_cat, thrown_str = thrown_type
+    catch_cat, catch_str = catch_type
+
+    if catch_cat == 'catch_all':
+        return True
+
+    if thrown_cat == 'rethrow':
+        return False
+
+    if thrown_cat == catch_cat:
+        if thrown_cat in primitive_exception_types:
+            return True
+
+        if thrown_cat == 'class':
+            thrown_normalized = thrown_str.replace(' ', '') if thrown_str else ''
+            catch_normalized = catch_str.replace(' ', '') if catch_str else ''
+
+            if thrown_normalized == catch_normalized:
+                return True
+
+            if catch_normalized in std_exception_names:
+                if thrown_normalized.startswith('std::'):
+                    thrown_lower = thrown_normalized.lower()
+                    if 'error' in thrown_lower or 'exception' in thrown_lower:
+                        return True
+
+    return False
+
 
 class CFGGraph_cpp(CFGGraph):
     def __init__(self, src_language, src_code, properties, root_node, parser):
         super().__init__(src_language, src_code, properties, root_node, parser)
 
         self.node_list = None
-        self.statement_types = cpp_nodes.statement_types
+        self.statement_types = {
+            statement_type: frozenset(node_types)
+            for statement_type, node_types in cpp_nodes.statement_types.items()
+        }
         self.CFG_node_list = []
         self.CFG_edge_list = []
+        # hashable keys of the edges in CFG_edge_list, for O(1) deduplication
+        self.CFG_edge_set = set()
         self.records = {
             "basic_blocks": {},
             "function_list": {},
@@ -41,6 +134,7 @@ class CFGGraph_cpp(CFGGraph):
             "lambda_map": {},
             "switch_child_map": {},
             "label_statement_map": {},
+            # function index -> {return site index: None}, kept in insertion order
             "return_statement_map": {},
             "implicit_return_map": {},
             "constexpr_functions": {},
@@ -63,6 +157,12 @@ class CFGGraph_cpp(CFGGraph):
         self.object_scope_map = {}
         self.scope_nodes = {}
         self.pointer_targets = {}
+        self.containing_function_cache = {}
+        self.jump_targets = None
+        self.try_catch_clauses = {}
+        self.goto_label_indices = None
+        self.next_index_cache = {}
+        self.block_last_line_cache = {}
 
         self.symbol_table = self.parser.symbol_table
         self.declaration = self.parser.declaration
@@ -71,6 +171,29 @@ class CFGGraph_cpp(CFGGraph):
         self.CFG_node_list, self.CFG_edge_list = self.CFG_cpp()
         self.graph = self.to_networkx(self.CFG_node_list, self.CFG_edge_list)
 
+    def get_node_key(self, node):
+        """Get the (start_point, end_point, type) key used by node_list and index"""
+        return (node.start_point, node.end_point, node.type)
+
+    def get_first_named_child(self, node):
+        """Get the first named child of node (or None) without building named_children"""
+        if node.named_child_count == 0:
+            return None
+        cursor = node.walk()
+        cursor.goto_first_child()
+        while not cursor.node.is_named:
+            cursor.goto_next_sibling()
+        return cursor.node
+
+    def get_last_named_child(self, node):
+        """Get the last named child of node (or None) without building named_children"""
+        if node.named_child_count == 0:
+            return None
+        for child in reversed(node.children):
+            if child.is_named:
+                return child
+        return None
+
     def get_index(self, node):
         """Get the unique index for a given AST node"""
         return self.index[(node.start_point, node.end_point, node.type)]
@@ -82,8 +205,12 @@ class CFGGraph_cpp(CFGGraph):
 
     def get_basic_blocks(self, CFG_node_list, CFG_edge_list):
         """Partition CFG into basic blocks using weakly connected components"""
-        G = self.to_networkx(CFG_node_list, CFG_edge_list)
-        components = nx.weakly_connected_components(G)
+        # Only the connectivity matters here, so use a bare undirected graph
+        # over node ids instead of materializing the attributed MultiDiGraph
+        G = nx.Graph()
+        G.add_nodes_from(node[0] for node in CFG_node_list)
+        G.add_edges_from((edge[0], edge[1]) for edge in CFG_edge_list)
+        components = nx.connected_components(G)
         block_index = 1
         for block in components:
             block_list = sorted(list(block))
@@ -111,11 +238,22 @@ class CFGGraph_cpp(CFGGraph):
 
     def get_containing_function(self, node):
         """Find the enclosing function definition for a given node"""
+        visited_keys = []
+        function_node = None
         while node is not None:
+            node_key = self.get_node_key(node)
+            if node_key in self.containing_function_cache:
+                function_node = self.containing_function_cache[node_key]
+                break
+            visited_keys.append(node_key)
             if node.type == "function_definition":
-                return node
+                function_node = node
+                break
             node = node.parent
-        return None
+
+        for node_key in visited_keys:
+            self.containing_function_cache[node_key] = function_node
+        return function_node
 
     def get_containing_class(self, node):
         """Find the enclosing class or struct definition for a given node"""
@@ -512,15 +650,7 @@ class CFGGraph_cpp(CFGGraph):
         if node is None:
             return False
 
-        jump_types = [
-            "break_statement",
-            "continue_statement",
-            "return_statement",
-            "goto_statement",
-            "throw_statement"
-        ]
-
-        return node.type in jump_types
+        return node.type in jump_statement_types
 
     def statement_invokes_lambda(self, node):
         """
@@ -673,46 +803,22 @@ class CFGGraph_cpp(CFGGraph):
     def exception_type_matches(self, thrown_type, catch_type):
         """
         Check if a thrown exception type matches a catch parameter type.
-
-        Returns True if the exception can be caught by the catch block.
-        Implements C++ exception matching rules:
-        1. Exact type match
-        2. Derived class to base class (polymorphism)
-        3. Catch-all (...) catches everything
-
-        Args:
-            thrown_type: tuple (type_category, type_string) from extract_thrown_type
-            catch_type: tuple (type_category, type_string) from extract_catch_parameter_type
+        Delegates to the memoized module-level exception_type_matches().
         """
-        thrown_cat, thrown_str = thrown_type
-        catch_cat, catch_str = catch_type
-
-        if catch_cat == 'catch_all':
-            return True
-
-        if thrown_cat == 'rethrow':
-            return False
-
-        if thrown_cat == catch_cat:
-            if thrown_cat in ['int', 'float', 'string']:
-                return True
-
-            if thrown_cat == 'class':
-                thrown_normalized = thrown_str.replace(' ', '') if thrown_str else ''
-                catch_normalized = catch_str.replace(' ', '') if catch_str else ''
-
-                if thrown_normalized == catch_normalized:
-                    return True
-
-                if catch_normalized in ['std::exception', 'exception']:
-                    if thrown_normalized.startswith('std::'):
-                        if ('error' in thrown_normalized.lower() or
-                            'exception' in thrown_normalized.lower()):
-                            return True
-
-        return False
+        return exception_type_matches(thrown_type, catch_type)
 
     def get_next_index(self, current_node, node_list):
+        """
+        Cached wrapper around find_next_index, keyed by node key.
+        The cache is cleared whenever a new implicit return is registered,
+        since that changes where the end of a function body leads.
+        """
+        node_key = self.get_node_key(current_node)
+        if node_key not in self.next_index_cache:
+            self.next_index_cache[node_key] = self.find_next_index(current_node, node_list)
+        return self.next_index_cache[node_key]
+
+    def find_next_index(self, current_node, node_list):
         """
         Find the next executable statement after current_node.
         Handles:
@@ -731,8 +837,9 @@ class CFGGraph_cpp(CFGGraph):
                 return (2, None)
 
             if parent.type in self.statement_types["loop_control_statement"]:
-                if (parent.start_point, parent.end_point, parent.type) in node_list:
-                    return (self.get_index(parent), parent)
+                parent_key = self.get_node_key(parent)
+                if parent_key in node_list:
+                    return (self.index[parent_key], parent)
 
             if parent.type in self.statement_types["control_statement"]:
                 current_node = parent
@@ -755,8 +862,9 @@ class CFGGraph_cpp(CFGGraph):
                 return (2, parent)
 
             if parent.type == "function_definition":
-                if (parent.start_point, parent.end_point, parent.type) in node_list:
-                    fn_index = self.get_index(parent)
+                parent_key = self.get_node_key(parent)
+                if parent_key in node_list:
+                    fn_index = self.index[parent_key]
                     if self.records.get("implicit_return_map") and fn_index in self.records["implicit_return_map"]:
                         implicit_return_id = self.records["implicit_return_map"][fn_index]
                         return (implicit_return_id, None)
@@ -778,22 +886,23 @@ class CFGGraph_cpp(CFGGraph):
             current_node = parent
             next_node = current_node.next_named_sibling
 
-        if next_node.type == "compound_statement" and len(list(next_node.named_children)) == 0:
+        if next_node.type == "compound_statement" and next_node.named_child_count == 0:
             current_node = next_node
             return self.get_next_index(current_node, node_list)
 
         if next_node.type == "compound_statement":
-            children_list = list(next_node.named_children)
-            if children_list:
-                first_child = children_list[0]
-                if (first_child.start_point, first_child.end_point, first_child.type) in node_list:
-                    return (self.get_index(first_child), first_child)
+            first_child = self.get_first_named_child(next_node)
+            if first_child:
+                first_child_key = self.get_node_key(first_child)
+                if first_child_key in node_list:
+                    return (self.index[first_child_key], first_child)
 
         if next_node.type == "field_declaration":
             def find_first_in_wrapper(wrapper_node):
                 for child in wrapper_node.named_children:
-                    if (child.start_point, child.end_point, child.type) in node_list:
-                        return (self.get_index(child), child)
+                    child_key = self.get_node_key(child)
+                    if child_key in node_list:
+                        return (self.index[child_key], child)
                     result = find_first_in_wrapper(child)
                     if result:
                         return result
@@ -807,8 +916,9 @@ class CFGGraph_cpp(CFGGraph):
                               "preproc_if", "preproc_ifdef", "preproc_elif", "preproc_else"]:
             return self.get_next_index(next_node, node_list)
 
-        if (next_node.start_point, next_node.end_point, next_node.type) in node_list:
-            return (self.get_index(next_node), next_node)
+        next_key = self.get_node_key(next_node)
+        if next_key in node_list:
+            return (self.index[next_key], next_node)
 
         return self.get_next_index(next_node, node_list)
 
@@ -824,8 +934,7 @@ class CFGGraph_cpp(CFGGraph):
         parent = node.parent
 
         if parent.type == "compound_statement":
-            children = list(parent.named_children)
-            if children and children[-1] == node:
+            if self.get_last_named_child(parent) == node:
                 grandparent = parent.parent
                 if grandparent and grandparent.type in [
                     "if_statement", "while_statement", "for_statement",
@@ -861,6 +970,13 @@ class CFGGraph_cpp(CFGGraph):
         Find the last executable statement in a block.
         Used for connecting end of if/else/loop bodies to next statement.
         """
+        cache_key = (self.get_node_key(current_node), body_field)
+        if cache_key not in self.block_last_line_cache:
+            self.block_last_line_cache[cache_key] = self.find_block_last_line(current_node, body_field)
+        return self.block_last_line_cache[cache_key]
+
+    def find_block_last_line(self, current_node, body_field):
+        """Uncached body of get_block_last_line"""
         block_node = current_node.child_by_field_name(body_field)
 
         if block_node is None:
@@ -873,12 +989,10 @@ class CFGGraph_cpp(CFGGraph):
             return (current_node, current_node.type)
 
         while block_node.type in self.statement_types["statement_holders"]:
-            children = list(block_node.named_children)
-            if not children:
+            last_child = self.get_last_named_child(block_node)
+            if last_child is None:
                 return (current_node, current_node.type)
 
-            last_child = children[-1]
-
             if last_child.type in self.statement_types["node_list_type"]:
                 return (last_child, last_child.type)
 
@@ -918,8 +1032,9 @@ class CFGGraph_cpp(CFGGraph):
             return None
 
         for child in body_node.named_children:
-            if (child.start_point, child.end_point, child.type) in node_list:
-                return (self.get_index(child), child)
+            child_key = self.get_node_key(child)
+            if child_key in node_list:
+                return (self.index[child_key], child)
 
         return None
 
@@ -987,13 +1102,30 @@ class CFGGraph_cpp(CFGGraph):
         if body_node is None:
             return None
 
-        named_children = list(body_node.named_children)
-        for child in reversed(named_children):
-            if (child.start_point, child.end_point, child.type) in node_list:
-                return (self.get_index(child), child)
+        for child in reversed(body_node.named_children):
+            child_key = self.get_node_key(child)
+            if child_key in node_list:
+                return (self.index[child_key], child)
 
         return None
 
+    def add_fallthrough_edge(self, src_index, node, node_list, edge_type="next_line"):
+        """
+        Connect src_index to the statement that follows node. When node is the last
+        statement of its function, fall through to the function's implicit return instead.
+        """
+        next_index, next_node = self.get_next_index(node, node_list)
+        if next_index != 2:
+            self.add_edge(src_index, next_index, edge_type)
+            return
+
+        func = self.get_containing_function(node)
+        if func:
+            func_index = self.get_index(func)
+            if func_index in self.records["implicit_return_map"]:
+                implicit_return_id = self.records["implicit_return_map"][func_index]
+                self.add_edge(src_index, implicit_return_id, edge_type)
+
     def add_edge(self, src, dest, edge_type, additional_data=None):
         """Add an edge to the CFG edge list with validation and deduplication"""
         if src is None or dest is None:
@@ -1002,12 +1134,15 @@ class CFGGraph_cpp(CFGGraph):
 
         if additional_data:
             edge_tuple = (src, dest, edge_type, additional_data)
+            edge_key = (src, dest, edge_type, repr(additional_data))
         else:
             edge_tuple = (src, dest, edge_type)
+            edge_key = edge_tuple
 
-        if edge_tuple in self.CFG_edge_list:
+        if edge_key in self.CFG_edge_set:
             return
 
+        self.CFG_edge_set.add(edge_key)
         self.CFG_edge_list.append(edge_tuple)
 
     def insert_scope_destructors(self, node_list):
@@ -1116,6 +1251,15 @@ class CFGGraph_cpp(CFGGraph):
                                     self._pending_destructor_returns = []
                                 self._pending_destructor_returns.append((implicit_return_id, next_after_scope_id, edge_label, class_name))
 
+    def has_destructors(self):
+        """Whether any destructor was recorded or a destructor return is still pending"""
+        if getattr(self, "_pending_destructor_returns", None):
+            return True
+        return any(
+            fn_name.startswith("~")
+            for ((_, fn_name), _), _ in self.records.get("function_list", {}).items()
+        )
+
     def chain_base_class_destructors(self):
         """
         Chain base class destructors to derived class destructors.
@@ -2376,16 +2520,11 @@ class CFGGraph_cpp(CFGGraph):
                                         if caller_parent.type == "try_statement":
                                             thrown_type = self.extract_thrown_type(return_node)
 
-                                            for child in caller_parent.children:
-                                                if child.type == "catch_clause":
-                                                    if (child.start_point, child.end_point, child.type) in self.node_list:
-                                                        catch_type = self.extract_catch_parameter_type(child)
-
-                                                        if self.exception_type_matches(thrown_type, catch_type):
-                                                            catch_index = self.get_index(child)
-                                                            self.add_edge(return_id, catch_index, "function_return")
-                                                            found_caller_try = True
-                                                            break  # Stop at first matching catch
+                                            for catch_index, catch_type in self.get_catch_clauses(caller_parent, self.node_list):
+                                                if self.exception_type_matches(thrown_type, catch_type):
+                                                    self.add_edge(return_id, catch_index, "function_return")
+                                                    found_caller_try = True
+                                                    break  # Stop at first matching catch
 
                                             break  # Stop looking for try blocks
                                         caller_parent = caller_parent.parent
@@ -2558,16 +2697,11 @@ class CFGGraph_cpp(CFGGraph):
                                         if caller_parent.type == "try_statement":
                                             thrown_type = self.extract_thrown_type(return_node)
 
-                                            for child in caller_parent.children:
-                                                if child.type == "catch_clause":
-                                                    if (child.start_point, child.end_point, child.type) in self.node_list:
-                                                        catch_type = self.extract_catch_parameter_type(child)
-
-                                                        if self.exception_type_matches(thrown_type, catch_type):
-                                                            catch_index = self.get_index(child)
-                                                            self.add_edge(return_id, catch_index, "method_return")
-                                                            found_caller_try = True
-                                                            break
+                                            for catch_index, catch_type in self.get_catch_clauses(caller_parent, self.node_list):
+                                                if self.exception_type_matches(thrown_type, catch_type):
+                                                    self.add_edge(return_id, catch_index, "method_return")
+                                                    found_caller_try = True
+                                                    break
 
                                             break
                                         caller_parent = caller_parent.parent
@@ -2618,16 +2752,11 @@ class CFGGraph_cpp(CFGGraph):
                                         if caller_parent.type == "try_statement":
                                             thrown_type = self.extract_thrown_type(return_node)
 
-                                            for child in caller_parent.children:
-                                                if child.type == "catch_clause":
-                                                    if (child.start_point, child.end_point, child.type) in self.node_list:
-                                                        catch_type = self.extract_catch_parameter_type(child)
-
-                                                        if self.exception_type_matches(thrown_type, catch_type):
-                                                            catch_index = self.get_index(child)
-                                                            self.add_edge(return_id, catch_index, "static_return")
-                                                            found_caller_try = True
-                                                            break
+                                            for catch_index, catch_type in self.get_catch_clauses(caller_parent, self.node_list):
+                                                if self.exception_type_matches(thrown_type, catch_type):
+                                                    self.add_edge(return_id, catch_index, "static_return")
+                                                    found_caller_try = True
+                                                    break
 
                                             break
                                         caller_parent = caller_parent.parent
@@ -3220,7 +3349,7 @@ class CFGGraph_cpp(CFGGraph):
                                 lambda_id = self.index[lambda_key]
                                 self.add_lambda_return_edges(lambda_node, lambda_id, parent_id, self.node_list)
 
-        edges_to_remove = []
+        edges_to_remove = set()
 
         for (func_name, signature), call_list in self.records["function_calls"].items():
             for ((class_name, fn_name), fn_sig), fn_id in self.records["function_list"].items():
@@ -3234,12 +3363,12 @@ class CFGGraph_cpp(CFGGraph):
                         for call_id, parent_id in call_list:
                             for edge in self.CFG_edge_list:
                                 if edge[0] == parent_id and edge[2] == "next_line":
-                                    edges_to_remove.append(edge)
+                                    edges_to_remove.add(tuple(edge))
                                     break
 
-        for edge in edges_to_remove:
-            if edge in self.CFG_edge_list:
-                self.CFG_edge_list.remove(edge)
+        if edges_to_remove:
+            self.CFG_edge_list = [edge for edge in self.CFG_edge_list if edge not in edges_to_remove]
+            self.CFG_edge_set.difference_update(edges_to_remove)
 
     def track_lambda_variables(self, node_list):
         """
@@ -3402,9 +3531,8 @@ class CFGGraph_cpp(CFGGraph):
         """
         body = lambda_node.child_by_field_name("body")
         if body and body.type == "compound_statement":
-            children = list(body.named_children)
-            if children:
-                first_stmt = children[0]
+            first_stmt = self.get_first_named_child(body)
+            if first_stmt:
                 first_stmt_key = (first_stmt.start_point, first_stmt.end_point, first_stmt.type)
                 if first_stmt_key in node_list:
                     return self.get_index(first_stmt)
@@ -3439,8 +3567,7 @@ class CFGGraph_cpp(CFGGraph):
 
                 parent = node.parent
                 if parent == body:
-                    siblings = list(body.named_children)
-                    if siblings and siblings[-1] == node:
+                    if self.get_last_named_child(body) == node:
                         if node.type != "return":
                             exit_points.append(node)
 
@@ -3535,6 +3662,521 @@ class CFGGraph_cpp(CFGGraph):
 
                             self.add_lambda_return_edges(lambda_node, lambda_id, call_site_id, self.node_list)
 
+    def map_jump_targets(self, root_node):
+        """
+        Map every break, continue and throw statement to its nearest enclosing
+        break target (loop or switch), loop and try statement in a single descent.
+        """
+        jump_targets = {}
+        break_targets = [None]
+        loops = [None]
+        try_statements = [None]
+
+        stack = [(root_node, False)]
+        while stack:
+            node, is_exit = stack.pop()
+            node_type = node.type
+
+            if is_exit:
+                if node_type in break_target_types:
+                    break_targets.pop()
+                if node_type in self.statement_types["loop_control_statement"]:
+                    loops.pop()
+                if node_type == "try_statement":
+                    try_statements.pop()
+                continue
+
+            if node_type in ("break_statement", "continue_statement", "throw_statement"):
+                jump_targets[self.get_node_key(node)] = (break_targets[-1], loops[-1], try_statements[-1])
+
+            if node_type in break_target_types:
+                break_targets.append(node)
+            if node_type in self.statement_types["loop_control_statement"]:
+                loops.append(node)
+            if node_type == "try_statement":
+                try_statements.append(node)
+
+            stack.append((node, True))
+            for child in reversed(node.named_children):
+                stack.append((child, False))
+
+        return jump_targets
+
+    def get_jump_targets(self, node):
+        """Return the (break target, loop, try statement) enclosing a jump statement"""
+        if self.jump_targets is None:
+            self.jump_targets = self.map_jump_targets(self.root_node)
+        return self.jump_targets.get(self.get_node_key(node), (None, None, None))
+
+    def get_catch_clauses(self, try_node, node_list):
+        """
+        Return [(catch_index, catch_type), ...] for the catch clauses of a try statement
+        in source order. Computed once per try statement and shared by every throw that
+        can reach it.
+        """
+        try_key = self.get_node_key(try_node)
+        if try_key not in self.try_catch_clauses:
+            catch_clauses = []
+            for child in try_node.children:
+                if child.type == "catch_clause":
+                    child_key = self.get_node_key(child)
+                    if child_key in node_list:
+                        catch_clauses.append((self.index[child_key], self.extract_catch_parameter_type(child)))
+            self.try_catch_clauses[try_key] = catch_clauses
+        return self.try_catch_clauses[try_key]
+
+    @handles("function_definition")
+    def handle_function_definition(self, node, current_index, node_list):
+        """Connect a function to its first statement and set up its return bookkeeping"""
+        implicit_return_map = self.records["implicit_return_map"]
+        return_statement_map = self.records["return_statement_map"]
+
+        if "main_function" in self.records and self.records["main_function"] == current_index:
+            pass
+
+        attributes = self.extract_attributes_from_node(node)
+        if attributes:
+            self.records["attributed_functions"][current_index] = attributes
+
+        first_line = self.edge_first_line(node, node_list)
+        has_statements = first_line is not None
+        if first_line:
+            first_index, first_node = first_line
+            self.add_edge(current_index, first_index, "first_next_line")
+
+        return_type_node = node.child_by_field_name("type")
+        is_void = False
+        is_constructor = False
+        is_destructor = False
+        is_pure_virtual = False
+
+        if return_type_node:
+            return_type_text = return_type_node.text.decode('utf-8')
+            is_void = return_type_text == "void"
+        else:
+            declarator = node.child_by_field_name("declarator")
+            if declarator:
+                for child in declarator.named_children:
+                    if child.type == "destructor_name":
+                        is_destructor = True
+                        break
+                    elif child.type == "qualified_identifier":
+                        qualified_text = child.text.decode('utf-8')
+                        if '~' in qualified_text:
+                            is_destructor = True
+                            break
+                    elif child.type == "identifier":
+                        is_constructor = True
+                        break
+
+        has_body = node.child_by_field_name("body") is not None
+        for child in node.children:
+            if child.type == "pure_virtual_clause":
+                is_pure_virtual = True
+                break
+
+        should_create_implicit_return = (
+            is_destructor and has_body and not is_pure_virtual
+        )
+
+        should_add_last_stmt_as_return = (
+            is_void and has_body and not is_pure_virtual
+        )
+
+        if should_create_implicit_return:
+            implicit_return_id = self.get_new_synthetic_index()
+
+            declarator = node.child_by_field_name("declarator")
+            func_name = "unknown"
+            if declarator:
+                for child in declarator.named_children:
+                    if child.type == "identifier":
+                        func_name = child.text.decode('utf-8')
+                        break
+                    elif child.type == "field_identifier":
+                        func_name = child.text.decode('utf-8')
+                        break
+                    elif child.type == "destructor_name":
+                        func_name = child.text.decode('utf-8')
+                        break
+                    elif child.type == "qualified_identifier":
+                        func_name = child.text.decode('utf-8')
+                        break
+
+            implicit_return_label = f"implicit_return_{func_name}"
+            self.CFG_node_list.append((implicit_return_id, 0, implicit_return_label, "implicit_return"))
+
+            implicit_return_map[current_index] = implicit_return_id
+            self.next_index_cache.clear()
+
+            return_statement_map.setdefault(current_index, {})[implicit_return_id] = None
+
+            has_noreturn = "noreturn" in attributes if attributes else False
+
+            if not has_noreturn:
+                if not has_statements:
+                    self.add_edge(current_index, implicit_return_id, "implicit_return")
+                else:
+                    last_stmt = self.get_last_statement_in_function_body(node, node_list)
+                    if last_stmt:
+                        last_stmt_id, last_stmt_node = last_stmt
+                        compound_control_stmts = ["if_statement", "while_statement", "for_statement",
+                                                  "for_range_loop", "do_statement", "switch_statement",
+                                                  "try_statement"]
+
+                        invokes_lambda = self.statement_invokes_lambda(last_stmt_node)
+
+                        if (not self.is_jump_statement(last_stmt_node)
+                            and last_stmt_node.type not in compound_control_stmts
+                            and not invokes_lambda):
+                            self.add_edge(last_stmt_id, implicit_return_id, "implicit_return")
+
+        if should_add_last_stmt_as_return:
+            has_explicit_returns = current_index in return_statement_map
+
+            if not has_explicit_returns:
+                last_stmt = self.get_last_statement_in_function_body(node, node_list)
+                if last_stmt:
+                    last_stmt_id, last_stmt_node = last_stmt
+                    return_statement_map.setdefault(current_index, {})[last_stmt_id] = None
+
+    @handles("if_statement")
+    def handle_if_statement(self, node, current_index, node_list):
+        """Add branch edges for an if statement and fall-through edges out of its arms"""
+        consequence = node.child_by_field_name("consequence")
+        if consequence:
+            if consequence.type == "compound_statement":
+                first_stmt = self.get_first_named_child(consequence)
+                if first_stmt:
+                    first_stmt_key = self.get_node_key(first_stmt)
+                    if first_stmt_key in node_list:
+                        self.add_edge(current_index, self.index[first_stmt_key], "pos_next")
+            else:
+                consequence_key = self.get_node_key(consequence)
+                if consequence_key in node_list:
+                    self.add_edge(current_index, self.index[consequence_key], "pos_next")
+
+            last_line, _ = self.get_block_last_line(node, "consequence")
+            last_line_key = self.get_node_key(last_line)
+            if last_line_key in node_list:
+                if not self.is_jump_statement(last_line):
+                    self.add_fallthrough_edge(self.index[last_line_key], node, node_list)
+
+        alternative = node.child_by_field_name("alternative")
+        if alternative:
+            else_body = alternative
+            if alternative.type == "else_clause":
+                first_else_child = self.get_first_named_child(alternative)
+                if first_else_child:
+                    else_body = first_else_child
+
+            if else_body.type == "compound_statement":
+                first_stmt = self.get_first_named_child(else_body)
+                if first_stmt:
+                    first_stmt_key = self.get_node_key(first_stmt)
+                    if first_stmt_key in node_list:
+                        self.add_edge(current_index, self.index[first_stmt_key], "neg_next")
+            elif else_body.type == "if_statement":
+                else_body_key = self.get_node_key(else_body)
+                if else_body_key in node_list:
+                    self.add_edge(current_index, self.index[else_body_key], "neg_next")
+            else:
+                else_body_key = self.get_node_key(else_body)
+                if else_body_key in node_list:
+                    self.add_edge(current_index, self.index[else_body_key], "neg_next")
+
+            if alternative.type == "else_clause":
+                if else_body.type == "compound_statement":
+                    last_stmt = self.get_last_named_child(else_body)
+                    if last_stmt:
+                        last_stmt_key = self.get_node_key(last_stmt)
+                        if last_stmt_key in node_list:
+                            if not self.is_jump_statement(last_stmt):
+                                self.add_fallthrough_edge(self.index[last_stmt_key], node, node_list)
+                elif else_body.type != "if_statement":
+                    else_body_key = self.get_node_key(else_body)
+                    if else_body_key in node_list:
+                        if not self.is_jump_statement(else_body):
+                            self.add_fallthrough_edge(self.index[else_body_key], node, node_list)
+            elif else_body.type == "compound_statement" or else_body.type != "if_statement":
+                last_line, _ = self.get_block_last_line(node, "alternative")
+                last_line_key = self.get_node_key(last_line)
+                if last_line_key in node_list:
+                    if not self.is_jump_statement(last_line):
+                        self.add_fallthrough_edge(self.index[last_line_key], node, node_list)
+        else:
+            self.add_fallthrough_edge(current_index, node, node_list, "neg_next")
+
+    @handles("while_statement")
+    def handle_while_statement(self, node, current_index, node_list):
+        """Add loop entry, back and exit edges for a while loop"""
+        body = node.child_by_field_name("body")
+        if body:
+            if body.type == "compound_statement":
+                first_stmt = self.get_first_named_child(body)
+                if first_stmt:
+                    first_stmt_key = self.get_node_key(first_stmt)
+                    if first_stmt_key in node_list:
+                        self.add_edge(current_index, self.index[first_stmt_key], "pos_next")
+            else:
+                body_key = self.get_node_key(body)
+                if body_key in node_list:
+                    self.add_edge(current_index, self.index[body_key], "pos_next")
+
+            last_line, _ = self.get_block_last_line(node, "body")
+            last_line_key = self.get_node_key(last_line)
+            if last_line_key in node_list:
+                if not self.is_jump_statement(last_line) and last_line.type != "try_statement":
+                    self.add_edge(self.index[last_line_key], current_index, "loop_control")
+
+        next_index, next_node = self.get_next_index(node, node_list)
+        if next_index != 2:
+            self.add_edge(current_index, next_index, "neg_next")
+
+    @handles("for_statement", "for_range_loop")
+    def handle_for_statement(self, node, current_index, node_list):
+        """Add loop entry, back, update and exit edges for for and range-for loops"""
+        body = node.child_by_field_name("body")
+        if body:
+            if body.type == "compound_statement":
+                first_stmt = self.get_first_named_child(body)
+                if first_stmt:
+                    first_stmt_key = self.get_node_key(first_stmt)
+                    if first_stmt_key in node_list:
+                        self.add_edge(current_index, self.index[first_stmt_key], "pos_next")
+            else:
+                body_key = self.get_node_key(body)
+                if body_key in node_list:
+                    self.add_edge(current_index, self.index[body_key], "pos_next")
+
+            last_line, _ = self.get_block_last_line(node, "body")
+            last_line_key = self.get_node_key(last_line)
+            if last_line_key in node_list:
+                if not self.is_jump_statement(last_line) and last_line.type != "try_statement":
+                    self.add_edge(self.index[last_line_key], current_index, "loop_control")
+
+        next_index, next_node = self.get_next_index(node, node_list)
+        if next_index != 2:
+            self.add_edge(current_index, next_index, "neg_next")
+
+        self.add_edge(current_index, current_index, "loop_update")
+
+    @handles("do_statement")
+    def handle_do_statement(self, node, current_index, node_list):
+        """Add body, condition and exit edges for a do-while loop"""
+        body = node.child_by_field_name("body")
+        first_stmt_index = None
+        if body:
+            if body.type == "compound_statement":
+                first_stmt = self.get_first_named_child(body)
+                if first_stmt:
+                    first_stmt_key = self.get_node_key(first_stmt)
+                    if first_stmt_key in node_list:
+                        first_stmt_index = self.index[first_stmt_key]
+                        self.add_edge(current_index, first_stmt_index, "first_next_line")
+            else:
+                body_key = self.get_node_key(body)
+                if body_key in node_list:
+                    first_stmt_index = self.index[body_key]
+                    self.add_edge(current_index, first_stmt_index, "first_next_line")
+
+            last_line, _ = self.get_block_last_line(node, "body")
+            last_line_key = self.get_node_key(last_line)
+            if last_line_key in node_list:
+                condition = node.child_by_field_name("condition")
+                if condition:
+                    cond_key = self.get_node_key(condition)
+                    if cond_key in node_list:
+                        cond_index = self.index[cond_key]
+                        if not self.is_jump_statement(last_line) and last_line.type != "try_statement":
+                            self.add_edge(self.index[last_line_key], cond_index, "next_line")
+
+        condition = node.child_by_field_name("condition")
+        if condition:
+            cond_key = self.get_node_key(condition)
+            if cond_key in node_list:
+                cond_index = self.index[cond_key]
+
+                if first_stmt_index is not None:
+                    self.add_edge(cond_index, first_stmt_index, "pos_next")
+
+                next_index, next_node = self.get_next_index(node, node_list)
+                if next_index != 2:
+                    self.add_edge(cond_index, next_index, "neg_next")
+
+    @handles("break_statement")
+    def handle_break_statement(self, node, current_index, node_list):
+        """Jump from a break to the statement after the enclosing loop or switch"""
+        break_target, _, _ = self.get_jump_targets(node)
+        if break_target is not None:
+            next_index, next_node = self.get_next_index(break_target, node_list)
+            if next_index != 2:
+                self.add_edge(current_index, next_index, "jump_next")
+
+    @handles("continue_statement")
+    def handle_continue_statement(self, node, current_index, node_list):
+        """Jump from a continue back to the enclosing loop header"""
+        _, loop, _ = self.get_jump_targets(node)
+        if loop is not None:
+            loop_key = self.get_node_key(loop)
+            if loop_key in node_list:
+                loop_index = self.index[loop_key]
+                self.add_edge(current_index, loop_index, "jump_next")
+
+    @handles("return_statement")
+    def handle_return_statement(self, node, current_index, node_list):
+        """Record a return statement against its enclosing function"""
+        return_statement_map = self.records["return_statement_map"]
+
+        func = self.get_containing_function(node)
+        func_key = self.get_node_key(func) if func else None
+        if func_key in node_list:
+            func_index = self.index[func_key]
+            return_statement_map.setdefault(func_index, {})[current_index] = None
+
+    @handles("goto_statement")
+    def handle_goto_statement(self, node, current_index, node_list):
+        """Jump from a goto to its target label"""
+        label_node = node.child_by_field_name("label")
+        if label_node:
+            if self.goto_label_indices is None:
+                # label_statement_map is keyed by "name:"; index targets by the raw name
+                # bytes once so each goto resolves without decoding its label
+                self.goto_label_indices = {
+                    label_name[:-1].encode('utf-8'): self.index[label_key]
+                    for label_name, label_key in self.records["label_statement_map"].items()
+                    if label_key in node_list
+                }
+            label_index = self.goto_label_indices.get(label_node.text)
+            if label_index is not None:
+                self.add_edge(current_index, label_index, "jump_next")
+
+    @handles("labeled_statement")
+    def handle_labeled_statement(self, node, current_index, node_list):
+        """Connect a label to the statement it labels"""
+        children = list(node.named_children)
+        if len(children) >= 2:
+            stmt = children[1]  # The statement after the label
+            stmt_key = self.get_node_key(stmt)
+            if stmt_key in node_list:
+                self.add_edge(current_index, self.index[stmt_key], "next_line")
+
+    @handles("switch_statement")
+    def handle_switch_statement(self, node, current_index, node_list):
+        """Add edges from a switch to its cases, and to the exit when there is no default"""
+        body = node.child_by_field_name("body")
+        has_default = False
+        if body:
+            case_nodes = []
+            for child in body.named_children:
+                if child.type == "case_statement":
+                    case_nodes.append(child)
+                    if child.child_by_field_name("value") is None:
+                        has_default = True
+
+            for case_node in case_nodes:
+                case_node_key = self.get_node_key(case_node)
+                if case_node_key in node_list:
+                    case_index = self.index[case_node_key]
+                    self.add_edge(current_index, case_index, "switch_case")
+
+        if not has_default:
+            next_index, next_node = self.get_next_index(node, node_list)
+            if next_index != 2:
+                self.add_edge(current_index, next_index, "switch_exit")
+
+    @handles("case_statement")
+    def handle_case_statement(self, node, current_index, node_list):
+        """Connect a case label to its first statement"""
+        children = list(node.named_children)
+        if children:
+            value_field = node.child_by_field_name("value")
+
+            start_index = 0 if value_field is None else 1
+
+            for i in range(start_index, len(children)):
+                if children[i].type in self.statement_types["node_list_type"]:
+                    child_key = self.get_node_key(children[i])
+                    if child_key in node_list:
+                        self.add_edge(current_index, self.index[child_key], "case_next")
+                    break
+
+    @handles("try_statement")
+    def handle_try_statement(self, node, current_index, node_list):
+        """Add edges from a try to its body and catch clauses, and out of the body"""
+        body = node.child_by_field_name("body")
+        if body:
+            if body.type == "compound_statement":
+                first_stmt = self.get_first_named_child(body)
+                if first_stmt:
+                    first_stmt_key = self.get_node_key(first_stmt)
+                    if first_stmt_key in node_list:
+                        self.add_edge(current_index, self.index[first_stmt_key], "try_next")
+
+        catch_clauses = []
+        for child in node.children:
+            if child.type == "catch_clause":
+                catch_clauses.append(child)
+
+        for catch_node in catch_clauses:
+            catch_node_key = self.get_node_key(catch_node)
+            if catch_node_key in node_list:
+                catch_index = self.index[catch_node_key]
+                self.add_edge(current_index, catch_index, "catch_exception")
+
+        last_line, _ = self.get_block_last_line(node, "body")
+        last_line_key = self.get_node_key(last_line)
+        if last_line_key in node_list:
+            if not self.is_jump_statement(last_line):
+                next_index, next_node = self.get_next_index(node, node_list)
+                if next_index != 2:
+                    self.add_edge(self.index[last_line_key], next_index, "try_exit")
+
+    @handles("catch_clause")
+    def handle_catch_clause(self, node, current_index, node_list):
+        """Connect a catch clause to its body and the body to the statement after the try"""
+        body = node.child_by_field_name("body")
+        if body:
+            if body.type == "compound_statement":
+                first_stmt = self.get_first_named_child(body)
+                if first_stmt:
+                    first_stmt_key = self.get_node_key(first_stmt)
+                    if first_stmt_key in node_list:
+                        self.add_edge(current_index, self.index[first_stmt_key], "catch_next")
+
+        last_line, _ = self.get_block_last_line(node, "body")
+        last_line_key = self.get_node_key(last_line)
+        if last_line_key in node_list:
+            if not self.is_jump_statement(last_line):
+                parent_try = node.parent
+                if parent_try and parent_try.type == "try_statement":
+                    next_index, next_node = self.get_next_index(parent_try, node_list)
+                    if next_index != 2:
+                        self.add_edge(self.index[last_line_key], next_index, "catch_exit")
+
+    @handles("throw_statement")
+    def handle_throw_statement(self, node, current_index, node_list):
+        """Route a throw to the first matching catch, or record it as a function exit"""
+        return_statement_map = self.records["return_statement_map"]
+
+        thrown_type = self.extract_thrown_type(node)
+
+        _, _, try_statement = self.get_jump_targets(node)
+        found_try = False
+        if try_statement is not None:
+            for catch_index, catch_type in self.get_catch_clauses(try_statement, node_list):
+                if self.exception_type_matches(thrown_type, catch_type):
+                    self.add_edge(current_index, catch_index, "throw_exit")
+                    found_try = True
+                    break  # Stop at first matching catch (C++ behavior)
+
+        if not found_try:
+            func = self.get_containing_function(node)
+            func_key = self.get_node_key(func) if func else None
+            if func_key in node_list:
+                func_index = self.index[func_key]
+                return_statement_map.setdefault(func_index, {})[current_index] = None
+
     def CFG_cpp(self):
         """
         Main CFG construction function for C++.
@@ -3607,9 +4249,10 @@ class CFGGraph_cpp(CFGGraph):
                         if next_case:
                             for child in next_case.named_children:
                                 if child.type in self.statement_types["node_list_type"]:
-                                    if (child.start_point, child.end_point, child.type) in node_list:
-                                        current_index = self.get_index(node)
-                                        first_stmt_index = self.get_index(child)
+                                    child_key = self.get_node_key(child)
+                                    if child_key in node_list:
+                                        current_index = self.index[key]
+                                        first_stmt_index = self.index[child_key]
                                         self.add_edge(current_index, first_stmt_index, "fallthrough")
                                         break
                             continue
@@ -3629,7 +4272,7 @@ class CFGGraph_cpp(CFGGraph):
                     if next_parent and next_parent.type == "translation_unit":
                         continue
 
-                    current_index = self.get_index(node)
+                    current_index = self.index[key]
                     self.add_edge(current_index, next_index, "next_line")
 
         self.get_basic_blocks(self.CFG_node_list, self.CFG_edge_list)
@@ -3650,518 +4293,23 @@ class CFGGraph_cpp(CFGGraph):
         self.handle_static_initialization_phase(node_list)
 
         for key, node in node_list.items():
-            current_index = self.get_index(node)
-
-            if node.type == "function_definition":
-                if "main_function" in self.records and self.records["main_function"] == current_index:
-                    pass
-
-                attributes = self.extract_attributes_from_node(node)
-                if attributes:
-                    self.records["attributed_functions"][current_index] = attributes
-
-                first_line = self.edge_first_line(node, node_list)
-                has_statements = first_line is not None
-                if first_line:
-                    first_index, first_node = first_line
-                    self.add_edge(current_index, first_index, "first_next_line")
-
-                return_type_node = node.child_by_field_name("type")
-                is_void = False
-                is_constructor = False
-                is_destructor = False
-                is_pure_virtual = False
-
-                if return_type_node:
-                    return_type_text = return_type_node.text.decode('utf-8')
-                    is_void = return_type_text == "void"
-                else:
-                    declarator = node.child_by_field_name("declarator")
-                    if declarator:
-                        for child in declarator.named_children:
-                            if child.type == "destructor_name":
-                                is_destructor = True
-                                break
-                            elif child.type == "qualified_identifier":
-                                qualified_text = child.text.decode('utf-8')
-                                if '~' in qualified_text:
-                                    is_destructor = True
-                                    break
-                            elif child.type == "identifier":
-                                is_constructor = True
-                                break
-
-                has_body = node.child_by_field_name("body") is not None
-                for child in node.children:
-                    if child.type == "pure_virtual_clause":
-                        is_pure_virtual = True
-                        break
-
-                should_create_implicit_return = (
-                    is_destructor and has_body and not is_pure_virtual
-                )
-
-                should_add_last_stmt_as_return = (
-                    is_void and has_body and not is_pure_virtual
-                )
-
-                if should_create_implicit_return:
-                    implicit_return_id = self.get_new_synthetic_index()
-
-                    declarator = node.child_by_field_name("declarator")
-                    func_name = "unknown"
-                    if declarator:
-                        for child in declarator.named_children:
-                            if child.type == "identifier":
-                                func_name = child.text.decode('utf-8')
-                                break
-                            elif child.type == "field_identifier":
-                                func_name = child.text.decode('utf-8')
-                                break
-                            elif child.type == "destructor_name":
-                                func_name = child.text.decode('utf-8')
-                                break
-                            elif child.type == "qualified_identifier":
-                                func_name = child.text.decode('utf-8')
-                                break
-
-                    implicit_return_label = f"implicit_return_{func_name}"
-                    self.CFG_node_list.append((implicit_return_id, 0, implicit_return_label, "implicit_return"))
-
-                    self.records["implicit_return_map"][current_index] = implicit_return_id
-
-                    if current_index not in self.records["return_statement_map"]:
-                        self.records["return_statement_map"][current_index] = []
-                    self.records["return_statement_map"][current_index].append(implicit_return_id)
-
-                    has_noreturn = "noreturn" in attributes if attributes else False
-
-                    if not has_noreturn:
-                        if not has_statements:
-                            self.add_edge(current_index, implicit_return_id, "implicit_return")
-                        else:
-                            last_stmt = self.get_last_statement_in_function_body(node, node_list)
-                            if last_stmt:
-                                last_stmt_id, last_stmt_node = last_stmt
-                                compound_control_stmts = ["if_statement", "while_statement", "for_statement",
-                                                          "for_range_loop", "do_statement", "switch_statement",
-                                                          "try_statement"]
-
-                                invokes_lambda = self.statement_invokes_lambda(last_stmt_node)
-
-                                if (not self.is_jump_statement(last_stmt_node)
-                                    and last_stmt_node.type not in compound_control_stmts
-                                    and not invokes_lambda):
-                                    self.add_edge(last_stmt_id, implicit_return_id, "implicit_return")
-
-                if should_add_last_stmt_as_return:
-                    has_explicit_returns = current_index in self.records.get("return_statement_map", {})
-
-                    if not has_explicit_returns:
-                        last_stmt = self.get_last_statement_in_function_body(node, node_list)
-                        if last_stmt:
-                            last_stmt_id, last_stmt_node = last_stmt
-                            if current_index not in self.records["return_statement_map"]:
-                                self.records["return_statement_map"][current_index] = []
-                            self.records["return_statement_map"][current_index].append(last_stmt_id)
-
-            elif node.type in ["class_specifier", "struct_specifier"]:
-                pass
-
-            elif node.type == "namespace_definition":
-                pass
-
-            elif node.type == "if_statement":
-                consequence = node.child_by_field_name("consequence")
-                if consequence:
-                    if consequence.type == "compound_statement":
-                        children = list(consequence.named_children)
-                        if children:
-                            first_stmt = children[0]
-                            if (first_stmt.start_point, first_stmt.end_point, first_stmt.type) in node_list:
-                                self.add_edge(current_index, self.get_index(first_stmt), "pos_next")
-                    else:
-                        if (consequence.start_point, consequence.end_point, consequence.type) in node_list:
-                            self.add_edge(current_index, self.get_index(consequence), "pos_next")
-
-                    last_line, _ = self.get_block_last_line(node, "consequence")
-                    if last_line and (last_line.start_point, last_line.end_point, last_line.type) in node_list:
-                        if not self.is_jump_statement(last_line):
-                            next_index, next_node = self.get_next_index(node, node_list)
-                            if next_index != 2:
-                                self.add_edge(self.get_index(last_line), next_index, "next_line")
-                            else:
-                                func = self.get_containing_function(node)
-                                if func:
-                                    func_index = self.get_index(func)
-                                    if func_index in self.records["implicit_return_map"]:
-                                        implicit_return_id = self.records["implicit_return_map"][func_index]
-                                        self.add_edge(self.get_index(last_line), implicit_return_id, "next_line")
-
-                alternative = node.child_by_field_name("alternative")
-                if alternative:
-                    else_body = alternative
-                    if alternative.type == "else_clause":
-                        else_children = list(alternative.named_children)
-                        if else_children:
-                            else_body = else_children[0]
-
-                    if else_body.type == "compound_statement":
-                        children = list(else_body.named_children)
-                        if children:
-                            first_stmt = children[0]
-                            if (first_stmt.start_point, first_stmt.end_point, first_stmt.type) in node_list:
-                                self.add_edge(current_index, self.get_index(first_stmt), "neg_next")
-                    elif else_body.type == "if_statement":
-                        if (else_body.start_point, else_body.end_point, else_body.type) in node_list:
-                            self.add_edge(current_index, self.get_index(else_body), "neg_next")
-                    else:
-                        if (else_body.start_point, else_body.end_point, else_body.type) in node_list:
-                            self.add_edge(current_index, self.get_index(else_body), "neg_next")
-
-                    if alternative.type == "else_clause":
-                        if else_body.type == "compound_statement":
-                            children = list(else_body.named_children)
-                            if children:
-                                last_stmt = children[-1]
-                                if (last_stmt.start_point, last_stmt.end_point, last_stmt.type) in node_list:
-                                    if not self.is_jump_statement(last_stmt):
-                                        next_index, next_node = self.get_next_index(node, node_list)
-                                        if next_index != 2:
-                                            self.add_edge(self.get_index(last_stmt), next_index, "next_line")
-                                        else:
-                                            func = self.get_containing_function(node)
-                                            if func:
-                                                func_index = self.get_index(func)
-                                                if func_index in self.records["implicit_return_map"]:
-                                                    implicit_return_id = self.records["implicit_return_map"][func_index]
-                                                    self.add_edge(self.get_index(last_stmt), implicit_return_id, "next_line")
-                        elif else_body.type != "if_statement":
-                            if (else_body.start_point, else_body.end_point, else_body.type) in node_list:
-                                if not self.is_jump_statement(else_body):
-                                    next_index, next_node = self.get_next_index(node, node_list)
-                                    if next_index != 2:
-                                        self.add_edge(self.get_index(else_body), next_index, "next_line")
-                                    else:
-                                        func = self.get_containing_function(node)
-                                        if func:
-                                            func_index = self.get_index(func)
-                                            if func_index in self.records["implicit_return_map"]:
-                                                implicit_return_id = self.records["implicit_return_map"][func_index]
-                                                self.add_edge(self.get_index(else_body), implicit_return_id, "next_line")
-                    elif else_body.type == "compound_statement" or else_body.type != "if_statement":
-                        last_line, _ = self.get_block_last_line(node, "alternative")
-                        if last_line and (last_line.start_point, last_line.end_point, last_line.type) in node_list:
-                            if not self.is_jump_statement(last_line):
-                                next_index, next_node = self.get_next_index(node, node_list)
-                                if next_index != 2:
-                                    self.add_edge(self.get_index(last_line), next_index, "next_line")
-                                else:
-                                    func = self.get_containing_function(node)
-                                    if func:
-                                        func_index = self.get_index(func)
-                                        if func_index in self.records["implicit_return_map"]:
-                                            implicit_return_id = self.records["implicit_return_map"][func_index]
-                                            self.add_edge(self.get_index(last_line), implicit_return_id, "next_line")
-                else:
-                    next_index, next_node = self.get_next_index(node, node_list)
-                    if next_index != 2:
-                        self.add_edge(current_index, next_index, "neg_next")
-                    else:
-                        func = self.get_containing_function(node)
-                        if func:
-                            func_index = self.get_index(func)
-                            if func_index in self.records["implicit_return_map"]:
-                                implicit_return_id = self.records["implicit_return_map"][func_index]
-                                self.add_edge(current_index, implicit_return_id, "neg_next")
-
-            elif node.type == "while_statement":
-                body = node.child_by_field_name("body")
-                if body:
-                    if body.type == "compound_statement":
-                        children = list(body.named_children)
-                        if children:
-                            first_stmt = children[0]
-                            if (first_stmt.start_point, first_stmt.end_point, first_stmt.type) in node_list:
-                                self.add_edge(current_index, self.get_index(first_stmt), "pos_next")
-                    else:
-                        if (body.start_point, body.end_point, body.type) in node_list:
-                            self.add_edge(current_index, self.get_index(body), "pos_next")
-
-                    last_line, _ = self.get_block_last_line(node, "body")
-                    if last_line and (last_line.start_point, last_line.end_point, last_line.type) in node_list:
-                        if not self.is_jump_statement(last_line) and last_line.type != "try_statement":
-                            self.add_edge(self.get_index(last_line), current_index, "loop_control")
-
-                next_index, next_node = self.get_next_index(node, node_list)
-                if next_index != 2:
-                    self.add_edge(current_index, next_index, "neg_next")
-
-            elif node.type == "for_statement":
-                body = node.child_by_field_name("body")
-                if body:
-                    if body.type == "compound_statement":
-                        children = list(body.named_children)
-                        if children:
-                            first_stmt = children[0]
-                            if (first_stmt.start_point, first_stmt.end_point, first_stmt.type) in node_list:
-                                self.add_edge(current_index, self.get_index(first_stmt), "pos_next")
-                    else:
-                        if (body.start_point, body.end_point, body.type) in node_list:
-                            self.add_edge(current_index, self.get_index(body), "pos_next")
-
-                    last_line, _ = self.get_block_last_line(node, "body")
-                    if last_line and (last_line.start_point, last_line.end_point, last_line.type) in node_list:
-                        if not self.is_jump_statement(last_line) and last_line.type != "try_statement":
-                            self.add_edge(self.get_index(last_line), current_index, "loop_control")
-
-                next_index, next_node = self.get_next_index(node, node_list)
-                if next_index != 2:
-                    self.add_edge(current_index, next_index, "neg_next")
-
-                self.add_edge(current_index, current_index, "loop_update")
-
-            elif node.type == "for_range_loop":
-                body = node.child_by_field_name("body")
-                if body:
-                    if body.type == "compound_statement":
-                        children = list(body.named_children)
-                        if children:
-                            first_stmt = children[0]
-                            if (first_stmt.start_point, first_stmt.end_point, first_stmt.type) in node_list:
-                                self.add_edge(current_index, self.get_index(first_stmt), "pos_next")
-                    else:
-                        if (body.start_point, body.end_point, body.type) in node_list:
-                            self.add_edge(current_index, self.get_index(body), "pos_next")
+            handler = node_handlers.get(node.type)
+            if handler:
+                handler(self, node, self.index[key], node_list)
 
-                    last_line, _ = self.get_block_last_line(node, "body")
-                    if last_line and (last_line.start_point, last_line.end_point, last_line.type) in node_list:
-                        if not self.is_jump_statement(last_line) and last_line.type != "try_statement":
-                            self.add_edge(self.get_index(last_line), current_index, "loop_control")
-
-                next_index, next_node = self.get_next_index(node, node_list)
-                if next_index != 2:
-                    self.add_edge(current_index, next_index, "neg_next")
-
-                self.add_edge(current_index, current_index, "loop_update")
-
-            elif node.type == "do_statement":
-                body = node.child_by_field_name("body")
-                first_stmt_index = None
-                if body:
-                    if body.type == "compound_statement":
-                        children = list(body.named_children)
-                        if children:
-                            first_stmt = children[0]
-                            if (first_stmt.start_point, first_stmt.end_point, first_stmt.type) in node_list:
-                                first_stmt_index = self.get_index(first_stmt)
-                                self.add_edge(current_index, first_stmt_index, "first_next_line")
-                    else:
-                        if (body.start_point, body.end_point, body.type) in node_list:
-                            first_stmt_index = self.get_index(body)
-                            self.add_edge(current_index, first_stmt_index, "first_next_line")
-
-                    last_line, _ = self.get_block_last_line(node, "body")
-                    if last_line and (last_line.start_point, last_line.end_point, last_line.type) in node_list:
-                        condition = node.child_by_field_name("condition")
-                        if condition:
-                            cond_key = (condition.start_point, condition.end_point, condition.type)
-                            if cond_key in node_list:
-                                cond_index = self.get_index(condition)
-                                if not self.is_jump_statement(last_line) and last_line.type != "try_statement":
-                                    self.add_edge(self.get_index(last_line), cond_index, "next_line")
-
-                condition = node.child_by_field_name("condition")
-                if condition:
-                    cond_key = (condition.start_point, condition.end_point, condition.type)
-                    if cond_key in node_list:
-                        cond_index = self.get_index(condition)
-
-                        if first_stmt_index is not None:
-                            self.add_edge(cond_index, first_stmt_index, "pos_next")
-
-                        next_index, next_node = self.get_next_index(node, node_list)
-                        if next_index != 2:
-                            self.add_edge(cond_index, next_index, "neg_next")
-
-            elif node.type == "break_statement":
-                parent = node.parent
-                while parent is not None:
-                    if parent.type in ["while_statement", "for_statement", "for_range_loop", "do_statement", "switch_statement"]:
-                        next_index, next_node = self.get_next_index(parent, node_list)
-                        if next_index != 2:
-                            self.add_edge(current_index, next_index, "jump_next")
-                        break
-                    parent = parent.parent
-
-            elif node.type == "continue_statement":
-                parent = node.parent
-                while parent is not None:
-                    if parent.type in self.statement_types["loop_control_statement"]:
-                        if (parent.start_point, parent.end_point, parent.type) in node_list:
-                            loop_index = self.get_index(parent)
-                            self.add_edge(current_index, loop_index, "jump_next")
-                        break
-                    parent = parent.parent
-
-            elif node.type == "return_statement":
-                func = self.get_containing_function(node)
-                if func and (func.start_point, func.end_point, func.type) in node_list:
-                    func_index = self.get_index(func)
-                    if func_index not in self.records["return_statement_map"]:
-                        self.records["return_statement_map"][func_index] = []
-                    if current_index not in self.records["return_statement_map"][func_index]:
-                        self.records["return_statement_map"][func_index].append(current_index)
-
-            elif node.type == "goto_statement":
-                label_node = node.child_by_field_name("label")
-                if label_node:
-                    label_name = label_node.text.decode('utf-8') + ":"
-                    if label_name in self.records["label_statement_map"]:
-                        label_key = self.records["label_statement_map"][label_name]
-                        if label_key in node_list:
-                            label_index = self.index[label_key]
-                            self.add_edge(current_index, label_index, "jump_next")
-
-            elif node.type == "labeled_statement":
-                children = list(node.named_children)
-                if len(children) >= 2:
-                    stmt = children[1]  # The statement after the label
-                    if (stmt.start_point, stmt.end_point, stmt.type) in node_list:
-                        self.add_edge(current_index, self.get_index(stmt), "next_line")
-
-            elif node.type == "switch_statement":
-                body = node.child_by_field_name("body")
-                has_default = False
-                if body:
-                    case_nodes = []
-                    for child in body.named_children:
-                        if child.type == "case_statement":
-                            case_nodes.append(child)
-                            if child.child_by_field_name("value") is None:
-                                has_default = True
-
-                    for case_node in case_nodes:
-                        if (case_node.start_point, case_node.end_point, case_node.type) in node_list:
-                            case_index = self.get_index(case_node)
-                            self.add_edge(current_index, case_index, "switch_case")
-
-                if not has_default:
-                    next_index, next_node = self.get_next_index(node, node_list)
-                    if next_index != 2:
-                        self.add_edge(current_index, next_index, "switch_exit")
-
-            elif node.type == "case_statement":
-                children = list(node.named_children)
-                if children:
-                    value_field = node.child_by_field_name("value")
-
-                    start_index = 0 if value_field is None else 1
-
-                    for i in range(start_index, len(children)):
-                        if children[i].type in self.statement_types["node_list_type"]:
-                            if (children[i].start_point, children[i].end_point, children[i].type) in node_list:
-                                self.add_edge(current_index, self.get_index(children[i]), "case_next")
-                            break
-
-            elif node.type == "try_statement":
-                body = node.child_by_field_name("body")
-                if body:
-                    if body.type == "compound_statement":
-                        children = list(body.named_children)
-                        if children:
-                            first_stmt = children[0]
-                            if (first_stmt.start_point, first_stmt.end_point, first_stmt.type) in node_list:
-                                self.add_edge(current_index, self.get_index(first_stmt), "try_next")
-
-                catch_clauses = []
-                for child in node.children:
-                    if child.type == "catch_clause":
-                        catch_clauses.append(child)
-
-                for catch_node in catch_clauses:
-                    if (catch_node.start_point, catch_node.end_point, catch_node.type) in node_list:
-                        catch_index = self.get_index(catch_node)
-                        self.add_edge(current_index, catch_index, "catch_exception")
-
-                last_line, _ = self.get_block_last_line(node, "body")
-                if last_line and (last_line.start_point, last_line.end_point, last_line.type) in node_list:
-                    if not self.is_jump_statement(last_line):
-                        next_index, next_node = self.get_next_index(node, node_list)
-                        if next_index != 2:
-                            self.add_edge(self.get_index(last_line), next_index, "try_exit")
-
-            elif node.type == "catch_clause":
-                body = node.child_by_field_name("body")
-                if body:
-                    if body.type == "compound_statement":
-                        children = list(body.named_children)
-                        if children:
-                            first_stmt = children[0]
-                            if (first_stmt.start_point, first_stmt.end_point, first_stmt.type) in node_list:
-                                self.add_edge(current_index, self.get_index(first_stmt), "catch_next")
-
-                last_line, _ = self.get_block_last_line(node, "body")
-                if last_line and (last_line.start_point, last_line.end_point, last_line.type) in node_list:
-                    if not self.is_jump_statement(last_line):
-                        parent_try = node.parent
-                        if parent_try and parent_try.type == "try_statement":
-                            next_index, next_node = self.get_next_index(parent_try, node_list)
-                            if next_index != 2:
-                                self.add_edge(self.get_index(last_line), next_index, "catch_exit")
-
-            elif node.type == "throw_statement":
-                thrown_type = self.extract_thrown_type(node)
-
-                parent = node.parent
-                found_try = False
-                while parent is not None:
-                    if parent.type == "try_statement":
-                        for child in parent.children:
-                            if child.type == "catch_clause":
-                                if (child.start_point, child.end_point, child.type) in node_list:
-                                    catch_type = self.extract_catch_parameter_type(child)
-
-                                    if self.exception_type_matches(thrown_type, catch_type):
-                                        catch_index = self.get_index(child)
-                                        self.add_edge(current_index, catch_index, "throw_exit")
-                                        found_try = True
-                                        break  # Stop at first matching catch (C++ behavior)
-
-                        break
-                    parent = parent.parent
-
-                if not found_try:
-                    func = self.get_containing_function(node)
-                    if func and (func.start_point, func.end_point, func.type) in node_list:
-                        func_index = self.get_index(func)
-                        if func_index not in self.records["return_statement_map"]:
-                            self.records["return_statement_map"][func_index] = []
-                        if current_index not in self.records["return_statement_map"][func_index]:
-                            self.records["return_statement_map"][func_index].append(current_index)
-
-            elif node.type == "lambda_expression":
-                pass
-
-        self.insert_scope_destructors(node_list)
-
-        self.chain_base_class_destructors()
-
-        global_declarations = []
-
-        for key, node in node_list.items():
-            if node.parent and node.parent.type == "translation_unit":
-                if node.type in ["class_specifier", "struct_specifier",
-                                "enum_specifier", "type_definition", "namespace_definition",
-                                "declaration"]:
-                    node_id = self.get_index(node)
-                    global_declarations.append((node_id, node.start_point[0]))
+        # The post-passes below only act on what the earlier passes recorded,
+        # so skip each one outright when there is nothing for it to do.
+        if any(self.scope_objects.values()):
+            self.insert_scope_destructors(node_list)
 
-        global_declarations.sort(key=lambda x: x[1])
+        if self.has_destructors():
+            self.chain_base_class_destructors()
 
-        self.add_function_call_edges()
+        if any(self.records[record] for record in call_record_types):
+            self.add_function_call_edges()
 
-        self.add_lambda_edges()
+        if self.records["lambda_map"]:
+            self.add_lambda_edges()
 
         if "main_function" not in self.records:
             first_function_id = None
@@ -4169,7 +4317,7 @@ class CFGGraph_cpp(CFGGraph):
                 if node.type == "function_definition":
                     parent = node.parent
                     if parent and parent.type == "translation_unit":
-                        first_function_id = self.get_index(node)
+                        first_function_id = self.index[key]
                         break
 
             if first_function_id:
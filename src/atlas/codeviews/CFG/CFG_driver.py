@@ -1,3 +1,5 @@
+from concurrent.futures import ThreadPoolExecutor
+
 from .CFG_c import CFGGraph_c
 from .CFG_cpp import CFGGraph_cpp
 from ...tree_parser.parser_driver import ParserDriver
@@ -34,8 +36,16 @@ class CFGDriver:
         self.node_list = self.CFG.node_list
         self.graph = self.CFG.graph
         if output_file:
-            self.json = postprocessor.write_networkx_to_json(self.graph, output_file)
-            postprocessor.write_to_dot(
-                self.graph, output_file.split(".")[0] + ".dot",
-                output_png=True, src_language=self.src_language
-            )
+            # Graphviz renders the png in a separate process, so the JSON
+            # dump can run alongside it
+            with ThreadPoolExecutor(max_workers=2) as executor:
+                json_future = executor.submit(
+                    postprocessor.write_networkx_to_json, self.graph, output_file
+                )
+                dot_future = executor.submit(
+                    postprocessor.write_to_dot,
+                    self.graph, output_file.split(".")[0] + ".dot",
+                    output_png=True, src_language=self.src_language
+                )
+                self.json = json_future.result()
+                dot_future.result()
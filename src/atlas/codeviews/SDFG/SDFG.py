@@ -1,5 +1,10 @@
+import hashlib
+import json
 import os.path
+import threading
 import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 
 import networkx as nx
 from loguru import logger
@@ -11,8 +16,55 @@ from atlas.utils import postprocessor, DFG_utils
 
 debug = False
 
+# CFGDriver results keyed by (language, sha256 of source, CFG properties).
+# dfg_c/dfg_cpp never modify the CFG graph or node_list (whatever they
+# change is done on a copy), and anything they store on the parser is
+# rebuilt identically on every run, so a cached result can be shared
+# between DfgRda runs. Each entry keeps a parser and tree alive, so only
+# the last few sources are kept; batch drivers can drop them all with
+# clear_caches(). cfg_cache_lock guards the dict, not the CFG builds.
+cfg_cache = OrderedDict()
+cfg_cache_size = 4
+cfg_cache_lock = threading.Lock()
+
+
+def clear_caches():
+    """Drop the cached CFG results and the parsers and trees they hold"""
+    with cfg_cache_lock:
+        cfg_cache.clear()
+
+
+def get_cfg_results(src_language, src_code, cfg_properties):
+    """Return the CFGDriver result for the source, building it only once"""
+    key = (
+        src_language,
+        hashlib.sha256(src_code.encode("utf-8")).hexdigest(),
+        json.dumps(cfg_properties, sort_keys=True, default=str),
+    )
+    with cfg_cache_lock:
+        if key in cfg_cache:
+            cfg_cache.move_to_end(key)
+            return cfg_cache[key]
+    cfg_results = CFGDriver(src_language, src_code, "", cfg_properties)
+    with cfg_cache_lock:
+        # another thread may have built the same source meanwhile; keep
+        # the first result so all runs share one CFG
+        cfg_results = cfg_cache.setdefault(key, cfg_results)
+        cfg_cache.move_to_end(key)
+        if len(cfg_cache) > cfg_cache_size:
+            cfg_cache.popitem(last=False)
+    return cfg_results
+
 
 class DfgRda:
+    """
+    Data flow graph of src_code built from reaching definitions.
+
+    The CFG comes from get_cfg_results, so instances built from the same
+    source and CFG properties share one CFGDriver result: CFG_Results, CFG
+    and the parser behind them are the same objects. Treat them as read
+    only, or call clear_caches() first to get a fresh build.
+    """
     def __init__(
             self,
             src_language="c",
@@ -35,50 +87,67 @@ class DfgRda:
         self.properties = properties
         self.graph = nx.MultiDiGraph()
         start = time.time()
-        self.CFG_Results = CFGDriver(
-            self.src_language, self.src_code, "", self.properties["CFG"]
+        self.CFG_Results = get_cfg_results(
+            self.src_language, self.src_code, self.properties["CFG"]
         )
         end = time.time()
         self.CFG = self.CFG_Results.graph
         self.rda_table = None
         self.rda_result = None
         start_dfg = time.time()
-        self.graph, self.debug_graph, self.rda_table, self.rda_result = self.rda(
+        self.graph, self.debug_graph, rda_table, self.rda_result = self.rda(
             self.properties["DFG"]
         )
+        # The builders keep DEF/USE entries in insertion-ordered dicts;
+        # callers get them as lists, as they always have
+        self.rda_table = {
+            statement_id: {kind: list(entries) for kind, entries in entry.items()}
+            for statement_id, entry in rda_table.items()
+        }
         end_dfg = time.time()
         if debug:
             logger.warning("CFG time: " + str(end - start) + " DFG time: " + str(end_dfg - start_dfg))
+        self.json = None
         if output_file:
-            if graph_format == "all" or graph_format == "json":
-                self.json = postprocessor.write_networkx_to_json(
-                    self.graph, output_file
-                )
-            if graph_format == "all" or graph_format == "dot":
-                postprocessor.write_to_dot(
-                    self.graph, output_file.rsplit(".", 1)[0] + ".dot", output_png=True, src_language=self.src_language
-                )
-            if graph_format == "all" or graph_format == "dot":
-                postprocessor.write_to_dot(
-                    self.debug_graph, output_file.rsplit(".", 1)[0] + "_debug.dot", output_png=True, src_language=self.src_language
-                )
-            self.json = postprocessor.write_networkx_to_json(self.graph, output_file)
+            # The writers are independent and the png rendering happens in
+            # Graphviz subprocesses, so run them side by side
+            with ThreadPoolExecutor(max_workers=3) as executor:
+                futures = []
+                if graph_format == "all" or graph_format == "dot":
+                    futures.append(executor.submit(
+                        postprocessor.write_to_dot,
+                        self.graph, output_file.rsplit(".", 1)[0] + ".dot", output_png=True, src_language=self.src_language
+                    ))
+                    futures.append(executor.submit(
+                        postprocessor.write_to_dot,
+                        self.debug_graph, output_file.rsplit(".", 1)[0] + "_debug.dot", output_png=True, src_language=self.src_language
+                    ))
+                if graph_format == "all" or graph_format == "json":
+                    self.json = postprocessor.write_networkx_to_json(
+                        self.graph, output_file
+                    )
+                for future in futures:
+                    future.result()
 
     def get_graph(self):
         return self.graph
 
     def index_to_code(self):
         tokens_index = DFG_utils.tree_to_token_index(self.CFG_Results.root_node)
-        code = self.src_code.split("\n")
-        code_tokens = [DFG_utils.index_to_code_token(x, code) for x in tokens_index]
+        lines = self.src_code.split("\n")
+        parser_index = self.CFG_Results.parser.index
         index_to_code = {}
 
-        for (ind, code) in zip(tokens_index, code_tokens):
-            if ind in self.CFG_Results.parser.index:
-                idx = self.CFG_Results.parser.index[ind]
+        for ind in tokens_index:
+            (start_row, start_col), (end_row, end_col) = ind[0], ind[1]
+            # Columns are byte offsets, so slice within the token's own line
+            # exactly as index_to_code_token does; on a line with non-ASCII
+            # text they can run past its end.
+            if start_row == end_row:
+                code = lines[start_row][start_col:end_col]
             else:
-                idx = -1
-            index_to_code[ind] = (idx, code)
+                code = DFG_utils.index_to_code_token(ind, lines)
+            index_to_code[ind] = (parser_index.get(ind, -1), code)
 
         return index_to_code
 
@@ -1,12 +1,12 @@
-import copy
 import time
-from collections import defaultdict
+from collections import deque
+from functools import lru_cache
+from itertools import chain
 
-import networkx as nx
-from deepdiff import DeepDiff
 from loguru import logger
 
 from ...utils.c_nodes import statement_types
+from ...utils.DFG_utils import load_rda_table, rda_cache_path, store_rda_table
 from ...utils.src_parser import traverse_tree
 
 assignment = ["assignment_expression"]
@@ -18,36 +18,67 @@ function_calls = ["call_expression"]
 literal_types = ["number_literal", "string_literal", "char_literal",
                  "true", "false", "null"]
 
-input_functions = ["scanf", "gets", "fgets", "getline", "fscanf", "sscanf",
-                   "fread", "read", "recv", "recvfrom", "getchar", "fgetc"]
-
-inner_types = ["declaration", "expression_statement"]
-handled_types = (assignment + def_statement + increment_statement +
-                function_calls + ["function_definition", "return_statement",
-                                 "for_statement", "switch_statement"])
+input_functions = frozenset({"scanf", "gets", "fgets", "getline", "fscanf", "sscanf",
+                             "fread", "read", "recv", "recvfrom", "getchar", "fgetc"})
+
+# expressions that can write through a pointer or reference parameter
+write_expression_types = frozenset({"assignment_expression", "update_expression"})
+# attributes shared by every interprocedural data flow edge
+interprocedural_edge_attrib = {'dataflow_type': 'comesFrom',
+                               'edge_type': 'DFG_edge',
+                               'color': '#00A3FF'}
+# nodes collect_function_metadata looks at
+function_metadata_types = write_expression_types | {"function_definition"}
+# statements whose identifiers build_rda_table already records itself
+handled_types = frozenset(def_statement + assignment + increment_statement +
+                          function_calls + ["return_statement"])
+parent_statement_types = frozenset(statement_types["non_control_statement"] +
+                                   statement_types["control_statement"])
+parent_stop_types = frozenset(statement_types.get("statement_holders", [])) | handled_types
+
+# membership sets built once instead of concatenating lists per check
+literal_type_set = frozenset(literal_types)
+variable_type_set = frozenset(variable_type)
+statement_list_types = frozenset(statement_types["node_list_type"])
+no_modified_params = frozenset()
+# statements that never get lastDef edges, as source or target
+last_def_ignore_types = frozenset(['for_statement', 'while_statement',
+                                   'if_statement', 'switch_statement'])
+variable_or_field_types = variable_type_set | {"field_expression"}
+variable_access_types = variable_or_field_types | {"pointer_expression", "subscript_expression"}
+returned_value_types = variable_access_types | literal_type_set
+used_value_types = returned_value_types | {"unary_expression"}
+# node types build_rda_table has a branch for; every other node is skipped
+# with one lookup instead of falling through the whole if/elif chain
+rda_node_types = handled_types | variable_type_set | frozenset(declaration_statement + [
+    "function_definition", "switch_statement", "for_statement", "while_statement",
+    "parenthesized_expression", "if_statement", "conditional_expression"])
+# ancestors under which a call's return value counts as used
+value_use_parent_types = frozenset({"init_declarator", "assignment_expression",
+                                    "return_statement", "argument_list",
+                                    "if_statement", "while_statement", "for_statement",
+                                    "do_while_statement", "switch_statement"})
 
 debug = False
 
 
-def st(child):
-    """Get text from AST node"""
+def st(child, parser):
+    """Get text from AST node, decoded once per tree through the parser"""
     if child is None:
         return ""
-    else:
-        return child.text.decode()
+    return parser.node_text(child)
 
 
 def get_index(node, index):
     """Get unique index for AST node"""
-    try:
-        return index[(node.start_point, node.end_point, node.type)]
-    except:
+    if node is None:
         return None
+    return index.get((node.start_point, node.end_point, node.type))
 
 
-def read_index(index, idx):
-    """Get AST node key from index value"""
-    return list(index.keys())[list(index.values()).index(idx)]
+def read_index(reverse_index, idx):
+    """Get AST node key from index value, given the parser's reverse_index"""
+    return reverse_index[idx]
 
 
 def scope_check(parent_scope, child_scope):
@@ -62,30 +93,28 @@ def scope_check(parent_scope, child_scope):
     - [0, 1] (parent scope)
     - [0, 1, 3] (sibling scope)
     """
-    for p in parent_scope:
-        if p not in child_scope:
-            return False
-    return True
+    # scopes are scope_stack snapshots, so containment is a prefix match
+    return parent_scope == child_scope[:len(parent_scope)]
 
 
-def set_add(lst, item):
-    """Add item to list if not already present (set-like behavior)"""
-    for entry in lst:
-        if item == entry:
-            return
-    lst.append(item)
+def set_add(entries, item):
+    """
+    Add item to an insertion-ordered dict of entries if not already present.
+    RDA table DEF/USE collections are dicts used as ordered sets
+    (item -> None), so membership is a hash lookup and the first equal
+    entry added is the one that is kept.
+    """
+    entries.setdefault(item, None)
 
 
-def set_union(first_list, second_list):
-    """Union of two lists (set-like)"""
-    resulting_list = list(first_list)
-    resulting_list.extend(x for x in second_list if x not in resulting_list)
-    return resulting_list
+def set_union(first_entries, second_entries):
+    """Union of two ordered sets (set-like)"""
+    return dict.fromkeys(chain(first_entries, second_entries))
 
 
-def set_difference(first_list, second_list):
-    """Difference of two lists (set-like)"""
-    return [item for item in first_list if item not in second_list]
+def set_difference(first_entries, second_entries):
+    """Difference of two ordered sets (set-like)"""
+    return dict.fromkeys(item for item in first_entries if item not in second_entries)
 
 
 def return_first_parent_of_types(node, parent_types, stop_types=None):
@@ -108,52 +137,113 @@ def return_first_parent_of_types(node, parent_types, stop_types=None):
 
 def recursively_get_children_of_types(node, st_types, check_list=None,
                                      index=None, result=None, stop_types=None):
-    """Recursively find child nodes of given types"""
+    """
+    Find child nodes of given types, in pre-order.
+    Walks the named descendants iteratively, so deep expressions cannot
+    exhaust the interpreter's recursion limit.
+    check_list, when given, is an index bitmap (see CustomParser.index_bitmap).
+    """
     if isinstance(st_types, str):
         st_types = [st_types]
-    if stop_types is None:
-        stop_types = []
+    st_types = frozenset(st_types)
+    stop_types = frozenset(stop_types) if stop_types else frozenset()
     if result is None:
         result = []
 
     if node.type in stop_types:
         return result
 
-    if check_list and index:
-        result.extend([
-            child for child in node.children
-            if child.type in st_types and
-               get_index(child, index) in check_list
-        ])
-    else:
-        result.extend([
-            child for child in node.children
-            if child.type in st_types
-        ])
-
-    for child in node.named_children:
-        if child.type not in stop_types:
-            result = recursively_get_children_of_types(
-                child, st_types, result=result, stop_types=stop_types,
-                index=index, check_list=check_list
-            )
-
+    filter_by_index = check_list is not None and bool(index)
+
+    # A single TreeCursor visits the subtree, so the binding never builds a
+    # children list. Matches are bucketed by the node they are a child of,
+    # buckets in the pre-order those nodes are entered, which keeps the
+    # siblings-before-grandchildren order this function has always returned.
+    groups = [[]]
+    path = [0]
+    cursor = node.walk()
+    walking = cursor.goto_first_child()
+    while walking:
+        child = cursor.node
+        child_type = child.type
+        if child_type in st_types:
+            if filter_by_index:
+                child_index = index.get((child.start_point, child.end_point, child_type))
+                if child_index is not None and check_list[child_index]:
+                    groups[path[-1]].append(child)
+            else:
+                groups[path[-1]].append(child)
+        if child.is_named and child_type not in stop_types and cursor.goto_first_child():
+            path.append(len(groups))
+            groups.append([])
+            continue
+        while not cursor.goto_next_sibling():
+            cursor.goto_parent()
+            path.pop()
+            if not path:
+                walking = False
+                break
+
+    for group in groups:
+        result.extend(group)
     return result
 
 
+def get_identifiers_and_literals(node, identifier_types, index, check_list):
+    """
+    Collect the identifier_types and literal descendants of node in one walk.
+    Same result as a recursively_get_children_of_types call for
+    identifier_types (filtered by check_list) followed by one for literal_types.
+    """
+    # groups[k] holds the (identifiers, literals) found among the children of
+    # the k-th node entered, as in recursively_get_children_of_types
+    groups = [([], [])]
+    path = [0]
+    cursor = node.walk()
+    walking = cursor.goto_first_child()
+    while walking:
+        child = cursor.node
+        child_type = child.type
+        if child_type in literal_type_set:
+            groups[path[-1]][1].append(child)
+        elif child_type in identifier_types:
+            child_index = index.get((child.start_point, child.end_point, child_type))
+            if child_index is not None and check_list[child_index]:
+                groups[path[-1]][0].append(child)
+        if child.is_named and cursor.goto_first_child():
+            path.append(len(groups))
+            groups.append(([], []))
+            continue
+        while not cursor.goto_next_sibling():
+            cursor.goto_parent()
+            path.pop()
+            if not path:
+                walking = False
+                break
+
+    identifiers = []
+    literals = []
+    for group_identifiers, group_literals in groups:
+        identifiers.extend(group_identifiers)
+        literals.extend(group_literals)
+    return identifiers, literals
+
+
 class Identifier:
     """Represents a variable at a specific line with scope information"""
 
+    # one instance per use/def, so skip the per-instance __dict__
+    __slots__ = ("name", "line", "declaration", "satisfied", "variable_scope",
+                 "_scope", "scope_key", "real_line_no")
+
     def __init__(self, parser, node, line=None, declaration=False, full_ref=None):
-        self.core = st(node)
-        self.unresolved_name = st(full_ref) if full_ref else st(node)
         self.name = self._resolve_name(node, full_ref, parser)
         self.line = line
         self.declaration = declaration
         self.satisfied = False
 
         variable_index = get_index(node, parser.index)
-        if variable_index and variable_index in parser.symbol_table["scope_map"]:
+        if variable_index and parser.scope_bitmap[variable_index]:
             self.variable_scope = parser.symbol_table["scope_map"][variable_index]
             if variable_index in parser.declaration_map:
                 decl_index = parser.declaration_map[variable_index]
@@ -168,35 +258,50 @@ class Identifier:
             self.scope = [0]
 
         if line is not None:
-            self.real_line_no = read_index(parser.index, line)[0][0]
+            self.real_line_no = parser.line_of_index[line]
 
     def _resolve_name(self, node, full_ref, parser):
         """Resolve identifier name for C"""
         if full_ref is None:
-            return st(node)
+            return st(node, parser)
+
+        # read once: the binding builds a new str on every .type access
+        ref_type = full_ref.type
 
-        if full_ref.type == "field_expression":
+        if ref_type == "field_expression":
             obj = full_ref.child_by_field_name("argument")
             field = full_ref.child_by_field_name("field")
-            return st(obj) + "." + st(field)
+            return st(obj, parser) + "." + st(field, parser)
 
-        if full_ref.type == "pointer_expression":
+        if ref_type == "pointer_expression":
             arg = full_ref.child_by_field_name("argument")
-            return "*" + st(arg)
+            return "*" + st(arg, parser)
 
-        if full_ref.type == "subscript_expression":
+        if ref_type == "subscript_expression":
             arg = full_ref.child_by_field_name("argument")
-            return st(arg)
+            return st(arg, parser)
 
-        return st(node)
+        return st(node, parser)
+
+    @property
+    def scope(self):
+        return self._scope
+
+    @scope.setter
+    def scope(self, scope):
+        # Sorted once here so hashing and equality don't re-sort on every call
+        self._scope = scope
+        self.scope_key = tuple(sorted(scope))
 
     def __eq__(self, other):
+        if type(other) is not Identifier:
+            return False
         return (self.name == other.name and
                 self.line == other.line and
-                sorted(self.scope) == sorted(other.scope))
+                self.scope_key == other.scope_key)
 
     def __hash__(self):
-        return hash((self.name, self.line, str(self.scope)))
+        return hash((self.name, self.line, self.scope_key))
 
     def __str__(self):
         result = [self.name]
@@ -211,20 +316,25 @@ class Identifier:
 class Literal:
     """Represents a literal constant (number, string, etc.) as a data flow source"""
 
+    __slots__ = ("name", "value", "line", "declaration", "satisfied", "scope",
+                 "scope_key", "variable_scope", "real_line_no")
+
     def __init__(self, parser, node, line=None):
-        self.core = st(node)
-        self.name = f"LITERAL_{st(node)}"  # Prefix to distinguish from variables
-        self.value = st(node)
+        self.value = st(node, parser)
+        self.name = f"LITERAL_{self.value}"  # Prefix to distinguish from variables
         self.line = line
         self.declaration = True  # Literals are always "definitions"
         self.satisfied = False
         self.scope = [0]
+        self.scope_key = (0,)
         self.variable_scope = [0]
 
         if line is not None:
-            self.real_line_no = read_index(parser.index, line)[0][0]
+            self.real_line_no = parser.line_of_index[line]
 
     def __eq__(self, other):
+        if type(other) is not Literal:
+            return False
         return (self.name == other.name and
                 self.line == other.line)
 
@@ -240,25 +350,31 @@ class Literal:
         return f"{{{','.join(result)}}}"
 
 
+# declarator wrapper type -> child types that lead towards the declared
+# identifier; None means the identifier is under the first child
+declarator_child_types = {
+    "pointer_declarator": frozenset({"identifier", "pointer_declarator", "array_declarator"}),
+    "array_declarator": None,
+    "function_declarator": frozenset({"identifier", "pointer_declarator", "parenthesized_declarator"}),
+    "parenthesized_declarator": frozenset({"identifier", "pointer_declarator", "array_declarator"}),
+}
+param_declarator_types = frozenset({"pointer_declarator", "array_declarator", "function_declarator"})
+
+
 def extract_identifier_from_declarator(declarator_node):
     """Extract identifier from declarator (may be wrapped in pointer/array)"""
-    if declarator_node.type == "identifier":
-        return declarator_node
-    elif declarator_node.type == "pointer_declarator":
-        for child in declarator_node.children:
-            if child.type in ["identifier", "pointer_declarator", "array_declarator"]:
-                return extract_identifier_from_declarator(child)
-    elif declarator_node.type == "array_declarator":
-        if declarator_node.children:
-            return extract_identifier_from_declarator(declarator_node.children[0])
-    elif declarator_node.type == "function_declarator":
-        for child in declarator_node.children:
-            if child.type in ["identifier", "pointer_declarator", "parenthesized_declarator"]:
-                return extract_identifier_from_declarator(child)
-    elif declarator_node.type == "parenthesized_declarator":
-        for child in declarator_node.children:
-            if child.type in ["identifier", "pointer_declarator", "array_declarator"]:
-                return extract_identifier_from_declarator(child)
+    node = declarator_node
+    while node is not None:
+        if node.type == "identifier":
+            return node
+        if node.type not in declarator_child_types:
+            return None
+        child_types = declarator_child_types[node.type]
+        children = node.children
+        if child_types is None:
+            node = children[0] if children else None
+        else:
+            node = next((child for child in children if child.type in child_types), None)
     return None
 
 
@@ -267,24 +383,101 @@ def extract_param_identifier(param_node):
     for child in param_node.children:
         if child.type == "identifier":
             return child
-        elif child.type in ["pointer_declarator", "array_declarator", "function_declarator"]:
+        elif child.type in param_declarator_types:
             return extract_identifier_from_declarator(child)
     return None
 
 
 def extract_operator_text(assign_node, left_node, right_node):
     """Extract operator from assignment (=, +=, -=, etc.)"""
-    left_text = left_node.text
-    right_text = right_node.text
-    operator_bytes = (
-        assign_node.text.split(left_text, 1)[-1]
-        .rsplit(right_text, 1)[0]
-        .strip()
+    start = left_node.end_byte - assign_node.start_byte
+    end = right_node.start_byte - assign_node.start_byte
+    return assign_node.text[start:end].strip().decode()
+
+
+def add_identifier(rda_table, added_identifiers, statement_id, kind, parser, node, line=None, **options):
+    """
+    set_add Identifier(parser, node, line, **options) to the statement's
+    kind ("def"/"use") entries. An Identifier is determined by these
+    arguments, so a repeat would only be dropped by set_add; it is
+    recognised from added_identifiers and never built.
+    """
+    key = (statement_id, kind, node_key(node), line) + tuple(
+        (name, node_key(value) if name == "full_ref" else value)
+        for name, value in sorted(options.items())
     )
-    return operator_bytes.decode()
+    if key in added_identifiers:
+        return
+    added_identifiers.add(key)
+    set_add(rda_table[statement_id][kind], Identifier(parser, node, line, **options))
+
+
+def node_key(node):
+    """Stable key for a tree-sitter node (wrappers are rebuilt on every access)"""
+    if node is None:
+        return None
+    return (node.start_byte, node.end_byte, node.type)
+
+
+def first_statement_of(node, statement_cache):
+    """
+    return_first_parent_of_types(node, statement_list_types), memoized in
+    statement_cache by node_key for node and every ancestor walked past,
+    so siblings under one statement share a single walk up the tree.
+    """
+    path = []
+    statement = None
+    while node is not None:
+        key = node_key(node)
+        if key in statement_cache:
+            statement = statement_cache[key]
+            break
+        path.append(key)
+        if node.type in statement_list_types:
+            statement = node
+            break
+        node = node.parent
+    for key in path:
+        statement_cache[key] = statement
+    return statement
+
+
+def statement_id_of(node, index, cfg_nodes, statement_cache):
+    """Index of the CFG statement enclosing node, or None if it has none"""
+    statement = first_statement_of(node, statement_cache)
+    statement_id = get_index(statement, index)
+    if statement_id is None or statement_id not in cfg_nodes:
+        return None
+    return statement_id
+
 
+def in_do_while_condition(node, condition_cache):
+    """
+    Whether node sits inside the parenthesized condition of a do_statement.
+    The answer for each ancestor walked past is memoized in condition_cache
+    by node_key, so the other identifiers in that subtree stop early.
+    """
+    path = []
+    inside = False
+    current = node.parent
+    while current is not None:
+        key = node_key(current)
+        if key in condition_cache:
+            inside = condition_cache[key]
+            break
+        path.append(key)
+        parent = current.parent
+        if (current.type == "parenthesized_expression" and
+                parent is not None and parent.type == "do_statement"):
+            inside = True
+            break
+        current = parent
+    for key in path:
+        condition_cache[key] = inside
+    return inside
 
-def add_entry(parser, rda_table, statement_id, used=None, defined=None,
+
+def add_entry(parser, rda_table, added_identifiers, statement_id, used=None, defined=None,
               declaration=False, core=None):
     """
     Add variable USE or DEF to RDA table.
@@ -292,6 +485,7 @@ def add_entry(parser, rda_table, statement_id, used=None, defined=None,
     Args:
         parser: C parser
         rda_table: RDA table
+        added_identifiers: add_identifier keys already recorded in rda_table
         statement_id: Statement where this occurs
         used: Variable being used (read)
         defined: Variable being defined (written)
@@ -299,7 +493,7 @@ def add_entry(parser, rda_table, statement_id, used=None, defined=None,
         core: Full reference node
     """
     if statement_id not in rda_table:
-        rda_table[statement_id] = defaultdict(list)
+        rda_table[statement_id] = {"def": {}, "use": {}}
 
     if not used and not defined:
         return
@@ -308,7 +502,7 @@ def add_entry(parser, rda_table, statement_id, used=None, defined=None,
     if core is None:
         core = current_node
 
-    if current_node.type in literal_types:
+    if current_node.type in literal_type_set:
         if used:
             set_add(rda_table[statement_id]["use"],
                    Literal(parser, current_node, statement_id))
@@ -316,14 +510,12 @@ def add_entry(parser, rda_table, statement_id, used=None, defined=None,
 
     if current_node.type == "field_expression":
         if defined is not None:
-            set_add(rda_table[statement_id]["def"],
-                   Identifier(parser, current_node.child_by_field_name("argument"),
-                            statement_id, full_ref=None,
-                            declaration=declaration))
+            add_identifier(rda_table, added_identifiers, statement_id, "def", parser,
+                           current_node.child_by_field_name("argument"), statement_id,
+                           full_ref=None, declaration=declaration)
         else:
-            set_add(rda_table[statement_id]["use"],
-                   Identifier(parser, current_node.child_by_field_name("argument"),
-                            full_ref=None))
+            add_identifier(rda_table, added_identifiers, statement_id, "use", parser,
+                           current_node.child_by_field_name("argument"), full_ref=None)
         return
 
     if used and used.type == "unary_expression":
@@ -336,14 +528,14 @@ def add_entry(parser, rda_table, statement_id, used=None, defined=None,
                 argument = child
 
         if operator is not None and argument is not None:
-            if argument.type in variable_type:
+            if argument.type in variable_type_set:
                 arg_index = get_index(argument, parser.index)
-                if arg_index and arg_index in parser.symbol_table["scope_map"]:
-                    set_add(rda_table[statement_id]["use"],
-                           Identifier(parser, argument, full_ref=argument))
-                elif arg_index and arg_index in parser.method_map:
-                    set_add(rda_table[statement_id]["use"],
-                           Identifier(parser, argument, full_ref=argument))
+                if arg_index and parser.scope_bitmap[arg_index]:
+                    add_identifier(rda_table, added_identifiers, statement_id, "use", parser, argument,
+                                   full_ref=argument)
+                elif arg_index and parser.method_bitmap[arg_index]:
+                    add_identifier(rda_table, added_identifiers, statement_id, "use", parser, argument,
+                                   full_ref=argument)
             return
 
     if current_node.type == "pointer_expression":
@@ -351,16 +543,13 @@ def add_entry(parser, rda_table, statement_id, used=None, defined=None,
 
         if defined is not None:
             pointer_index = get_index(pointer, parser.index)
-            if pointer_index and pointer_index in parser.symbol_table["scope_map"]:
-                set_add(rda_table[statement_id]["use"],
-                       Identifier(parser, pointer, full_ref=pointer))
+            if pointer_index and parser.scope_bitmap[pointer_index]:
+                add_identifier(rda_table, added_identifiers, statement_id, "use", parser, pointer, full_ref=pointer)
 
-            set_add(rda_table[statement_id]["def"],
-                   Identifier(parser, pointer, statement_id,
-                            full_ref=core, declaration=declaration))
+            add_identifier(rda_table, added_identifiers, statement_id, "def", parser, pointer, statement_id,
+                           full_ref=core, declaration=declaration)
         else:
-            set_add(rda_table[statement_id]["use"],
-                   Identifier(parser, pointer, full_ref=core))
+            add_identifier(rda_table, added_identifiers, statement_id, "use", parser, pointer, full_ref=core)
         return
 
     if current_node.type == "subscript_expression":
@@ -368,53 +557,102 @@ def add_entry(parser, rda_table, statement_id, used=None, defined=None,
         index_expr = current_node.child_by_field_name("index")
 
         if defined is not None:
-            set_add(rda_table[statement_id]["def"],
-                   Identifier(parser, array, statement_id,
-                            full_ref=core, declaration=declaration))
-        set_add(rda_table[statement_id]["use"],
-               Identifier(parser, array, full_ref=core))
+            add_identifier(rda_table, added_identifiers, statement_id, "def", parser, array, statement_id,
+                           full_ref=core, declaration=declaration)
+        add_identifier(rda_table, added_identifiers, statement_id, "use", parser, array, full_ref=core)
 
         if index_expr:
-            if index_expr.type in variable_type:
+            if index_expr.type in variable_type_set:
                 index_id = get_index(index_expr, parser.index)
-                if index_id and index_id in parser.symbol_table["scope_map"]:
-                    set_add(rda_table[statement_id]["use"],
-                           Identifier(parser, index_expr, full_ref=index_expr))
-            elif index_expr.type in literal_types:
+                if index_id and parser.scope_bitmap[index_id]:
+                    add_identifier(rda_table, added_identifiers, statement_id, "use", parser, index_expr,
+                                   full_ref=index_expr)
+            elif index_expr.type in literal_type_set:
                 set_add(rda_table[statement_id]["use"],
                        Literal(parser, index_expr, statement_id))
             else:
-                identifiers_in_index = recursively_get_children_of_types(
-                    index_expr, variable_type + ["field_expression"],
-                    index=parser.index,
-                    check_list=parser.symbol_table["scope_map"]
+                identifiers_in_index, literals_in_index = get_identifiers_and_literals(
+                    index_expr, variable_or_field_types, parser.index, parser.scope_bitmap
                 )
                 for identifier in identifiers_in_index:
-                    set_add(rda_table[statement_id]["use"],
-                           Identifier(parser, identifier, full_ref=identifier))
-                literals_in_index = recursively_get_children_of_types(
-                    index_expr, literal_types,
-                    index=parser.index
-                )
+                    add_identifier(rda_table, added_identifiers, statement_id, "use", parser, identifier,
+                                   full_ref=identifier)
                 for literal in literals_in_index:
                     set_add(rda_table[statement_id]["use"],
                            Literal(parser, literal, statement_id))
         return
 
     node_index = get_index(current_node, parser.index)
-    if node_index is None or node_index not in parser.symbol_table["scope_map"]:
+    if node_index is None or not parser.scope_bitmap[node_index]:
         return  # Not in symbol table
 
     if defined is not None:
-        set_add(rda_table[statement_id]["def"],
-               Identifier(parser, defined, statement_id,
-                        full_ref=core, declaration=declaration))
+        add_identifier(rda_table, added_identifiers, statement_id, "def", parser, defined, statement_id, full_ref=core,
+                       declaration=declaration)
     else:
-        set_add(rda_table[statement_id]["use"],
-               Identifier(parser, used, full_ref=core, declaration=declaration))
+        add_identifier(rda_table, added_identifiers, statement_id, "use", parser, used, full_ref=core,
+                       declaration=declaration)
 
 
-def is_return_value_used(call_expr_statement):
+
+def add_call_argument_entries(parser, rda_table, added_identifiers, parent_id, argument_list, modifies_params):
+    """
+    DEF/USE entries for the arguments of a call.
+
+    modifies_params is None for input functions (scanf and friends), whose
+    pointer arguments are written without being read; otherwise it holds the
+    indices of the pointer parameters the callee modifies, which are both
+    read and written.
+    """
+    is_input_function = modifies_params is None
+    for arg_idx, arg in enumerate(argument_list.named_children):
+        arg_type = arg.type
+        if arg_type == "pointer_expression" and (is_input_function or arg_idx in modifies_params):
+            inner_arg = arg.child_by_field_name("argument")
+            if inner_arg:
+                inner_type = inner_arg.type
+                if inner_type in variable_type_set or inner_type in ["field_expression", "subscript_expression"]:
+                    if not is_input_function:
+                        add_entry(parser, rda_table, added_identifiers, parent_id, used=inner_arg)
+                    add_entry(parser, rda_table, added_identifiers, parent_id,
+                             defined=inner_arg, declaration=False)
+                    if inner_type == "subscript_expression":
+                        index_expr = inner_arg.child_by_field_name("index")
+                        if index_expr:
+                            vars_in_index = recursively_get_children_of_types(
+                                index_expr, variable_or_field_types,
+                                index=parser.index,
+                                check_list=parser.scope_bitmap
+                            )
+                            for var in vars_in_index:
+                                add_entry(parser, rda_table, added_identifiers, parent_id, used=var)
+        elif arg_type in variable_or_field_types:
+            add_entry(parser, rda_table, added_identifiers, parent_id, used=arg)
+        elif arg_type in literal_type_set:
+            add_entry(parser, rda_table, added_identifiers, parent_id, used=arg)
+        else:
+            identifiers_used, literals_used = get_identifiers_and_literals(
+                arg, variable_or_field_types, parser.index, parser.scope_bitmap
+            )
+            for identifier in identifiers_used:
+                add_entry(parser, rda_table, added_identifiers, parent_id, used=identifier)
+            for literal in literals_used:
+                add_entry(parser, rda_table, added_identifiers, parent_id, used=literal)
+
+def is_return_value_used(call_expr_statement, return_used_cache):
+    """Cached wrapper around check_return_value_used; a call site is asked
+    once per return edge that reaches it. return_used_cache maps a call
+    site's (start_byte, end_byte, type) to the answer for the current run"""
+    key = (call_expr_statement.start_byte, call_expr_statement.end_byte,
+           call_expr_statement.type)
+    used = return_used_cache.get(key)
+    if used is None:
+        used = check_return_value_used(call_expr_statement)
+        return_used_cache[key] = used
+    return used
+
+
+def check_return_value_used(call_expr_statement):
     """
     Check if a function call's return value is actually used.
 
@@ -435,17 +673,7 @@ def is_return_value_used(call_expr_statement):
     while parent:
         parent_type = parent.type
 
-        if parent_type in ["init_declarator", "assignment_expression"]:
-            return True
-
-        if parent_type == "return_statement":
-            return True
-
-        if parent_type == "argument_list":
-            return True
-
-        if parent_type in ["if_statement", "while_statement", "for_statement",
-                          "do_while_statement", "switch_statement"]:
+        if parent_type in value_use_parent_types:
             return True
 
         if parent_type == "expression_statement":
@@ -468,22 +696,35 @@ def collect_function_metadata(parser):
     Returns:
         Dict mapping function_name -> {
             "params": [(param_name, is_pointer, param_index), ...],
-            "node": function_definition AST node
+            "node": function_definition AST node,
+            "write_sites": assignment/update expressions inside the function
         }
     """
     metadata = {}
 
-    for node in traverse_tree(parser.tree.root_node):
+    # (end_byte, write_sites) for each function_definition enclosing the current node
+    enclosing_functions = []
+
+    for node in parser.nodes_of_types(function_metadata_types):
+        while enclosing_functions and node.start_byte >= enclosing_functions[-1][0]:
+            enclosing_functions.pop()
+
+        if node.type in write_expression_types:
+            for _, sites in enclosing_functions:
+                sites.append(node)
+
         if node.type == "function_definition":
             func_name = None
             params = []
+            write_sites = []
+            enclosing_functions.append((node.end_byte, write_sites))
 
             for child in node.named_children:
                 if child.type == "function_declarator":
                     declarator = child.child_by_field_name("declarator")
                     if declarator:
                         if declarator.type == "identifier":
-                            func_name = st(declarator)
+                            func_name = st(declarator, parser)
                         elif declarator.type == "pointer_declarator":
                             inner = declarator
                             while inner and inner.type == "pointer_declarator":
@@ -493,7 +734,7 @@ def collect_function_metadata(parser):
                                 else:
                                     break
                             if inner and inner.type == "identifier":
-                                func_name = st(inner)
+                                func_name = st(inner, parser)
 
                     param_list = child.child_by_field_name('parameters')
                     if param_list:
@@ -509,7 +750,7 @@ def collect_function_metadata(parser):
                                         inner = p_child
                                         while inner:
                                             if inner.type == "identifier":
-                                                param_name = st(inner)
+                                                param_name = st(inner, parser)
                                                 break
                                             elif inner.type == "pointer_declarator":
                                                 inner_decl = inner.child_by_field_name("declarator")
@@ -521,10 +762,10 @@ def collect_function_metadata(parser):
                                                 break
                                     elif p_child.type == "array_declarator":
                                         is_pointer = True
-                                        param_name = st(extract_identifier_from_declarator(p_child))
+                                        param_name = st(extract_identifier_from_declarator(p_child), parser)
                                     elif p_child.type == "identifier":
                                         if param_name is None:  # Only if not already found in pointer_declarator
-                                            param_name = st(p_child)
+                                            param_name = st(p_child, parser)
 
                                 if param_name:
                                     params.append((param_name, is_pointer, param_idx))
@@ -534,7 +775,8 @@ def collect_function_metadata(parser):
             if func_name:
                 metadata[func_name] = {
                     "params": params,
-                    "node": node
+                    "node": node,
+                    "write_sites": write_sites
                 }
 
     return metadata
@@ -560,7 +802,6 @@ def analyze_pointer_modifications(parser, function_metadata):
 
     for func_name, meta in function_metadata.items():
         modified_params = set()
-        func_node = meta["node"]
 
         param_name_to_idx = {}
         for param_name, is_pointer, param_idx in meta["params"]:
@@ -571,28 +812,28 @@ def analyze_pointer_modifications(parser, function_metadata):
             modifications[func_name] = modified_params
             continue
 
-        for node in traverse_tree(func_node):
+        for node in meta["write_sites"]:
             if node.type == "assignment_expression":
                 left = node.child_by_field_name("left")
                 if left:
                     if left.type == "pointer_expression":
                         arg = left.child_by_field_name("argument")
                         if arg and arg.type == "identifier":
-                            var_name = st(arg)
+                            var_name = st(arg, parser)
                             if var_name in param_name_to_idx:
                                 modified_params.add(param_name_to_idx[var_name])
 
                     elif left.type == "subscript_expression":
                         array_arg = left.child_by_field_name("argument")
                         if array_arg and array_arg.type == "identifier":
-                            var_name = st(array_arg)
+                            var_name = st(array_arg, parser)
                             if var_name in param_name_to_idx:
                                 modified_params.add(param_name_to_idx[var_name])
 
                     elif left.type == "field_expression":
                         obj = left.child_by_field_name("argument")
                         if obj and obj.type == "identifier":
-                            var_name = st(obj)
+                            var_name = st(obj, parser)
                             if var_name in param_name_to_idx:
                                 modified_params.add(param_name_to_idx[var_name])
 
@@ -607,19 +848,19 @@ def analyze_pointer_modifications(parser, function_metadata):
                     if arg.type == "pointer_expression":
                         inner_arg = arg.child_by_field_name("argument")
                         if inner_arg and inner_arg.type == "identifier":
-                            var_name = st(inner_arg)
+                            var_name = st(inner_arg, parser)
                             if var_name in param_name_to_idx:
                                 modified_params.add(param_name_to_idx[var_name])
                     elif arg.type == "subscript_expression":
                         array_arg = arg.child_by_field_name("argument")
                         if array_arg and array_arg.type == "identifier":
-                            var_name = st(array_arg)
+                            var_name = st(array_arg, parser)
                             if var_name in param_name_to_idx:
                                 modified_params.add(param_name_to_idx[var_name])
                     elif arg.type == "field_expression":
                         obj = arg.child_by_field_name("argument")
                         if obj and obj.type == "identifier":
-                            var_name = st(obj)
+                            var_name = st(obj, parser)
                             if var_name in param_name_to_idx:
                                 modified_params.add(param_name_to_idx[var_name])
 
@@ -628,6 +869,8 @@ def analyze_pointer_modifications(parser, function_metadata):
     return modifications
 
 
+# Tables are cached on disk when rda_cache_dir is set: any change to what
+# goes into the table must bump DFG_utils.rda_cache_version
 def build_rda_table(parser, CFG_results, function_metadata=None, pointer_modifications=None):
     """
     Build RDA table by traversing AST and tracking DEF/USE.
@@ -639,61 +882,58 @@ def build_rda_table(parser, CFG_results, function_metadata=None, pointer_modific
         rda_table: Dict mapping statement_id to {"def": set, "use": set}
     """
     rda_table = {}
+    # add_identifier keys already recorded in rda_table
+    added_identifiers = set()
     index = parser.index
     tree = parser.tree
-
-    inner_types = ["parenthesized_expression", "binary_expression", "unary_expression"]
-    handled_cases = ["compound_statement", "translation_unit"]
+    scope_bitmap = parser.scope_bitmap
+    cfg_nodes = CFG_results.graph.nodes
+    statement_cache = {}
+    condition_cache = {}
+    # pointer_modifications entries for known functions, merged once so a
+    # call site needs a single lookup
+    modified_params_by_function = {
+        name: params for name, params in (pointer_modifications or {}).items()
+        if function_metadata and name in function_metadata
+    }
 
     for root_node in traverse_tree(tree, variable_type):
         if not root_node.is_named:
             continue
+        # the binding builds a new str on every .type access
+        node_type = root_node.type
+        if node_type not in rda_node_types:
+            continue
 
-        if root_node.type == "return_statement":
+        if node_type == "return_statement":
             parent_id = get_index(root_node, index)
-            if parent_id is None or parent_id not in CFG_results.graph.nodes:
+            if parent_id is None or parent_id not in cfg_nodes:
                 continue
 
             return_expr = root_node.named_children[0] if root_node.named_children else None
-            if return_expr and return_expr.type in variable_type + ["field_expression",
-                                                                      "pointer_expression",
-                                                                      "subscript_expression"] + literal_types:
-                add_entry(parser, rda_table, parent_id, used=return_expr)
+            if return_expr and return_expr.type in returned_value_types:
+                add_entry(parser, rda_table, added_identifiers, parent_id, used=return_expr)
+                literals_used = recursively_get_children_of_types(
+                    root_node, literal_type_set,
+                    index=index
+                )
             else:
-                vars_used = recursively_get_children_of_types(
-                    root_node, variable_type + ["field_expression", "pointer_expression", "subscript_expression"],
-                    index=parser.index,
-                    check_list=parser.symbol_table["scope_map"]
+                vars_used, literals_used = get_identifiers_and_literals(
+                    root_node, variable_access_types, index, scope_bitmap
                 )
                 for var in vars_used:
-                    add_entry(parser, rda_table, parent_id, used=var)
+                    add_entry(parser, rda_table, added_identifiers, parent_id, used=var)
 
-            literals_used = recursively_get_children_of_types(
-                root_node, literal_types,
-                index=parser.index
-            )
             for literal in literals_used:
-                add_entry(parser, rda_table, parent_id, used=literal)
+                add_entry(parser, rda_table, added_identifiers, parent_id, used=literal)
 
-        elif root_node.type in def_statement:
-            parent_statement = return_first_parent_of_types(
-                root_node, statement_types["node_list_type"]
+        elif node_type in def_statement:
+            parent_id = statement_id_of(
+                root_node, index, cfg_nodes, statement_cache
             )
-            if parent_statement is None:
+            if parent_id is None:
                 continue
 
-            parent_id = get_index(parent_statement, index)
-            if parent_id is None or parent_id not in CFG_results.graph.nodes:
-                if parent_statement and parent_statement.type in inner_types:
-                    parent_statement = return_first_parent_of_types(
-                        parent_statement, statement_types["node_list_type"]
-                    )
-                    parent_id = get_index(parent_statement, index)
-                elif parent_statement.type in handled_cases:
-                    continue
-                else:
-                    continue  # Skip if not in CFG
-
             declarator = root_node.child_by_field_name("declarator")
             if declarator is None and len(root_node.children) > 0:
                 declarator = root_node.children[0]
@@ -701,31 +941,25 @@ def build_rda_table(parser, CFG_results, function_metadata=None, pointer_modific
             var_identifier = extract_identifier_from_declarator(declarator)
 
             if var_identifier:
-                add_entry(parser, rda_table, parent_id,
+                add_entry(parser, rda_table, added_identifiers, parent_id,
                          defined=var_identifier, declaration=True)
 
             initializer = root_node.child_by_field_name("value")
             if initializer:
-                if initializer.type in variable_type + ["field_expression", "pointer_expression", "subscript_expression", "unary_expression"] + literal_types:
-                    add_entry(parser, rda_table, parent_id, used=initializer)
+                if initializer.type in used_value_types:
+                    add_entry(parser, rda_table, added_identifiers, parent_id, used=initializer)
                 else:
-                    vars_used = recursively_get_children_of_types(
-                        initializer, variable_type + ["field_expression"],
-                        index=parser.index,
-                        check_list=parser.symbol_table["scope_map"]
+                    vars_used, literals_used = get_identifiers_and_literals(
+                        initializer, variable_or_field_types, index, scope_bitmap
                     )
                     for var in vars_used:
-                        add_entry(parser, rda_table, parent_id, used=var)
-                    literals_used = recursively_get_children_of_types(
-                        initializer, literal_types,
-                        index=parser.index
-                    )
+                        add_entry(parser, rda_table, added_identifiers, parent_id, used=var)
                     for literal in literals_used:
-                        add_entry(parser, rda_table, parent_id, used=literal)
+                        add_entry(parser, rda_table, added_identifiers, parent_id, used=literal)
 
-        elif root_node.type in declaration_statement:
+        elif node_type in declaration_statement:
             parent_id = get_index(root_node, index)
-            if parent_id is None or parent_id not in CFG_results.graph.nodes:
+            if parent_id is None or parent_id not in cfg_nodes:
                 continue
 
             has_init_declarator = any(
@@ -738,9 +972,8 @@ def build_rda_table(parser, CFG_results, function_metadata=None, pointer_modific
                 if child.type == "identifier":
                     child_id = get_index(child, index)
                     if child_id:
-                        from collections import defaultdict
                         if parent_id not in rda_table:
-                            rda_table[parent_id] = defaultdict(list)
+                            rda_table[parent_id] = {"def": {}, "use": {}}
                         ident = Identifier(parser, child, parent_id, declaration=True)
                         ident.scope = [0]
                         ident.variable_scope = [0]
@@ -751,28 +984,16 @@ def build_rda_table(parser, CFG_results, function_metadata=None, pointer_modific
                     if var_identifier:
                         var_id = get_index(var_identifier, index)
                         if var_id:
-                            add_entry(parser, rda_table, parent_id,
+                            add_entry(parser, rda_table, added_identifiers, parent_id,
                                      defined=var_identifier, declaration=True)
 
-        elif root_node.type in assignment:
-            parent_statement = return_first_parent_of_types(
-                root_node, statement_types["node_list_type"]
+        elif node_type in assignment:
+            parent_id = statement_id_of(
+                root_node, index, cfg_nodes, statement_cache
             )
-            if parent_statement is None:
+            if parent_id is None:
                 continue
 
-            parent_id = get_index(parent_statement, index)
-            if parent_id is None or parent_id not in CFG_results.graph.nodes:
-                if parent_statement and parent_statement.type in inner_types:
-                    parent_statement = return_first_parent_of_types(
-                        parent_statement, statement_types["node_list_type"]
-                    )
-                    parent_id = get_index(parent_statement, index)
-                elif parent_statement.type in handled_cases:
-                    continue
-                else:
-                    continue  # Skip if not in CFG
-
             left_node = root_node.child_by_field_name("left")
             right_node = root_node.child_by_field_name("right")
 
@@ -782,13 +1003,13 @@ def build_rda_table(parser, CFG_results, function_metadata=None, pointer_modific
             operator_text = extract_operator_text(root_node, left_node, right_node)
 
             if operator_text != "=":
-                add_entry(parser, rda_table, parent_id, used=left_node)
+                add_entry(parser, rda_table, added_identifiers, parent_id, used=left_node)
             else:
                 if left_node.type == "field_expression":
-                    add_entry(parser, rda_table, parent_id, used=left_node)
-                elif left_node.type in variable_type:
+                    add_entry(parser, rda_table, added_identifiers, parent_id, used=left_node)
+                elif left_node.type in variable_type_set:
                     left_node_index = get_index(left_node, index)
-                    if left_node_index and left_node_index in parser.symbol_table["scope_map"]:
+                    if left_node_index and scope_bitmap[left_node_index]:
                         is_init_declarator = False
                         check_parent = root_node.parent
                         while check_parent:
@@ -800,193 +1021,75 @@ def build_rda_table(parser, CFG_results, function_metadata=None, pointer_modific
                             check_parent = check_parent.parent
 
                         if not is_init_declarator:
-                            add_entry(parser, rda_table, parent_id, used=left_node)
+                            add_entry(parser, rda_table, added_identifiers, parent_id, used=left_node)
 
-            add_entry(parser, rda_table, parent_id, defined=left_node)
+            add_entry(parser, rda_table, added_identifiers, parent_id, defined=left_node)
 
-            if right_node.type in variable_type + ["field_expression", "pointer_expression", "subscript_expression", "unary_expression"] + literal_types:
-                add_entry(parser, rda_table, parent_id, used=right_node)
+            if right_node.type in used_value_types:
+                add_entry(parser, rda_table, added_identifiers, parent_id, used=right_node)
             else:
-                vars_used = recursively_get_children_of_types(
-                    right_node, variable_type + ["field_expression"],
-                    index=parser.index,
-                    check_list=parser.symbol_table["scope_map"]
+                vars_used, literals_used = get_identifiers_and_literals(
+                    right_node, variable_or_field_types, index, scope_bitmap
                 )
                 for var in vars_used:
-                    add_entry(parser, rda_table, parent_id, used=var)
-                literals_used = recursively_get_children_of_types(
-                    right_node, literal_types,
-                    index=parser.index
-                )
+                    add_entry(parser, rda_table, added_identifiers, parent_id, used=var)
                 for literal in literals_used:
-                    add_entry(parser, rda_table, parent_id, used=literal)
+                    add_entry(parser, rda_table, added_identifiers, parent_id, used=literal)
 
-        elif root_node.type in increment_statement:
-            parent_statement = return_first_parent_of_types(
-                root_node, statement_types["node_list_type"]
+        elif node_type in increment_statement:
+            parent_id = statement_id_of(
+                root_node, index, cfg_nodes, statement_cache
             )
-            if parent_statement is None:
+            if parent_id is None:
                 continue
 
-            parent_id = get_index(parent_statement, index)
-            if parent_id is None or parent_id not in CFG_results.graph.nodes:
-                if parent_statement and parent_statement.type in inner_types:
-                    parent_statement = return_first_parent_of_types(
-                        parent_statement, statement_types["node_list_type"]
-                    )
-                    parent_id = get_index(parent_statement, index)
-                elif parent_statement.type in handled_cases:
-                    continue
-                else:
-                    continue  # Skip if not in CFG
-
-            if root_node.type in variable_type + ["field_expression"]:
-                add_entry(parser, rda_table, parent_id, used=root_node)
-                add_entry(parser, rda_table, parent_id, defined=root_node)
+            if node_type in variable_or_field_types:
+                add_entry(parser, rda_table, added_identifiers, parent_id, used=root_node)
+                add_entry(parser, rda_table, added_identifiers, parent_id, defined=root_node)
             else:
                 identifiers = recursively_get_children_of_types(
-                    root_node, variable_type + ["field_expression"],
-                    index=parser.index,
-                    check_list=parser.symbol_table["scope_map"]
+                    root_node, variable_or_field_types,
+                    index=index,
+                    check_list=scope_bitmap
                 )
                 for identifier in identifiers:
-                    add_entry(parser, rda_table, parent_id, used=identifier)
-                    add_entry(parser, rda_table, parent_id, defined=identifier)
+                    add_entry(parser, rda_table, added_identifiers, parent_id, used=identifier)
+                    add_entry(parser, rda_table, added_identifiers, parent_id, defined=identifier)
 
-        elif root_node.type in function_calls:
-            parent_statement = return_first_parent_of_types(
-                root_node, statement_types["node_list_type"]
+        elif node_type in function_calls:
+            parent_id = statement_id_of(
+                root_node, index, cfg_nodes, statement_cache
             )
-            if parent_statement is None:
+            if parent_id is None:
                 continue
 
-            parent_id = get_index(parent_statement, index)
-            if parent_id is None or parent_id not in CFG_results.graph.nodes:
-                if parent_statement and parent_statement.type in inner_types:
-                    parent_statement = return_first_parent_of_types(
-                        parent_statement, statement_types["node_list_type"]
-                    )
-                    parent_id = get_index(parent_statement, index)
-                elif parent_statement.type in handled_cases:
-                    continue
-                else:
-                    continue  # Skip if not in CFG
-
             function_name = None
             if root_node.children and root_node.children[0].type == "identifier":
-                function_name = st(root_node.children[0])
+                function_name = st(root_node.children[0], parser)
 
-            is_input_function = function_name in input_functions
+            if function_name in input_functions:
+                modifies_params = None
+            else:
+                modifies_params = modified_params_by_function.get(function_name, no_modified_params)
 
             for child in root_node.children[1:]:
-                if is_input_function and child.type == "argument_list":
-                    for arg in child.named_children:
-                        if arg.type == "pointer_expression":
-                            inner_arg = arg.child_by_field_name("argument")
-                            if inner_arg:
-                                if inner_arg.type in variable_type:
-                                    add_entry(parser, rda_table, parent_id,
-                                             defined=inner_arg, declaration=False)
-                                elif inner_arg.type in ["field_expression", "subscript_expression"]:
-                                    add_entry(parser, rda_table, parent_id,
-                                             defined=inner_arg, declaration=False)
-                                    if inner_arg.type == "subscript_expression":
-                                        index_expr = inner_arg.child_by_field_name("index")
-                                        if index_expr:
-                                            vars_in_index = recursively_get_children_of_types(
-                                                index_expr, variable_type + ["field_expression"],
-                                                index=parser.index,
-                                                check_list=parser.symbol_table["scope_map"]
-                                            )
-                                            for var in vars_in_index:
-                                                add_entry(parser, rda_table, parent_id, used=var)
-                        elif arg.type in variable_type + ["field_expression"]:
-                            add_entry(parser, rda_table, parent_id, used=arg)
-                        elif arg.type in literal_types:
-                            add_entry(parser, rda_table, parent_id, used=arg)
-                        else:
-                            identifiers_used = recursively_get_children_of_types(
-                                arg, variable_type + ["field_expression"],
-                                index=parser.index,
-                                check_list=parser.symbol_table["scope_map"]
-                            )
-                            for identifier in identifiers_used:
-                                add_entry(parser, rda_table, parent_id, used=identifier)
-                            literals_used = recursively_get_children_of_types(
-                                arg, literal_types,
-                                index=parser.index
-                            )
-                            for literal in literals_used:
-                                add_entry(parser, rda_table, parent_id, used=literal)
-                elif not is_input_function and child.type == "argument_list":
-                    modifies_params = set()
-                    if function_name and function_metadata and function_name in function_metadata:
-                        if pointer_modifications and function_name in pointer_modifications:
-                            modifies_params = pointer_modifications[function_name]
-
-                    for arg_idx, arg in enumerate(child.named_children):
-                        is_modified_param = arg_idx in modifies_params
-
-                        if is_modified_param and arg.type == "pointer_expression":
-                            inner_arg = arg.child_by_field_name("argument")
-                            if inner_arg:
-                                if inner_arg.type in variable_type:
-                                    add_entry(parser, rda_table, parent_id, used=inner_arg)
-                                    add_entry(parser, rda_table, parent_id,
-                                             defined=inner_arg, declaration=False)
-                                elif inner_arg.type in ["field_expression", "subscript_expression"]:
-                                    add_entry(parser, rda_table, parent_id, used=inner_arg)
-                                    add_entry(parser, rda_table, parent_id,
-                                             defined=inner_arg, declaration=False)
-                                    if inner_arg.type == "subscript_expression":
-                                        index_expr = inner_arg.child_by_field_name("index")
-                                        if index_expr:
-                                            vars_in_index = recursively_get_children_of_types(
-                                                index_expr, variable_type + ["field_expression"],
-                                                index=parser.index,
-                                                check_list=parser.symbol_table["scope_map"]
-                                            )
-                                            for var in vars_in_index:
-                                                add_entry(parser, rda_table, parent_id, used=var)
-                        elif arg.type in variable_type + ["field_expression"]:
-                            add_entry(parser, rda_table, parent_id, used=arg)
-                        elif arg.type in literal_types:
-                            add_entry(parser, rda_table, parent_id, used=arg)
-                        else:
-                            identifiers_used = recursively_get_children_of_types(
-                                arg, variable_type + ["field_expression"],
-                                index=parser.index,
-                                check_list=parser.symbol_table["scope_map"]
-                            )
-                            for identifier in identifiers_used:
-                                add_entry(parser, rda_table, parent_id, used=identifier)
-                            literals_used = recursively_get_children_of_types(
-                                arg, literal_types,
-                                index=parser.index
-                            )
-                            for literal in literals_used:
-                                add_entry(parser, rda_table, parent_id, used=literal)
-
-                elif child.type in variable_type + ["field_expression"]:
-                    add_entry(parser, rda_table, parent_id, used=child)
-                elif child.type in literal_types:
-                    add_entry(parser, rda_table, parent_id, used=child)
+                child_type = child.type
+                if child_type == "argument_list":
+                    add_call_argument_entries(parser, rda_table, added_identifiers, parent_id, child, modifies_params)
+                elif child_type in variable_or_field_types:
+                    add_entry(parser, rda_table, added_identifiers, parent_id, used=child)
+                elif child_type in literal_type_set:
+                    add_entry(parser, rda_table, added_identifiers, parent_id, used=child)
                 else:
-                    identifiers_used = recursively_get_children_of_types(
-                        child, variable_type + ["field_expression"],
-                        index=parser.index,
-                        check_list=parser.symbol_table["scope_map"]
+                    identifiers_used, literals_used = get_identifiers_and_literals(
+                        child, variable_or_field_types, index, scope_bitmap
                     )
                     for identifier in identifiers_used:
-                        add_entry(parser, rda_table, parent_id, used=identifier)
-                    literals_used = recursively_get_children_of_types(
-                        child, literal_types,
-                        index=parser.index
-                    )
+                        add_entry(parser, rda_table, added_identifiers, parent_id, used=identifier)
                     for literal in literals_used:
-                        add_entry(parser, rda_table, parent_id, used=literal)
+                        add_entry(parser, rda_table, added_identifiers, parent_id, used=literal)
 
-        elif root_node.type == "function_definition":
+        elif node_type == "function_definition":
             parent_id = get_index(root_node, index)
             if parent_id is None:
                 continue
@@ -994,10 +1097,10 @@ def build_rda_table(parser, CFG_results, function_metadata=None, pointer_modific
             for child in root_node.named_children:
                 if child.type == "function_declarator":
                     func_name_node = child.child_by_field_name("declarator")
-                    if func_name_node and func_name_node.type in variable_type:
+                    if func_name_node and func_name_node.type in variable_type_set:
                         func_name_idx = get_index(func_name_node, index)
-                        if func_name_idx and func_name_idx in parser.symbol_table["scope_map"]:
-                            add_entry(parser, rda_table, parent_id,
+                        if func_name_idx and scope_bitmap[func_name_idx]:
+                            add_entry(parser, rda_table, added_identifiers, parent_id,
                                      defined=func_name_node, declaration=True)
 
                     param_list = child.child_by_field_name('parameters')
@@ -1006,193 +1109,157 @@ def build_rda_table(parser, CFG_results, function_metadata=None, pointer_modific
                             if param.type == "parameter_declaration":
                                 param_id = extract_param_identifier(param)
                                 if param_id:
-                                    add_entry(parser, rda_table, parent_id,
+                                    add_entry(parser, rda_table, added_identifiers, parent_id,
                                             defined=param_id, declaration=True)
                     break
 
-        elif root_node.type == "switch_statement":
+        elif node_type == "switch_statement":
             parent_id = get_index(root_node, index)
-            if parent_id is None or parent_id not in CFG_results.graph.nodes:
+            if parent_id is None or parent_id not in cfg_nodes:
                 continue
 
             condition = root_node.child_by_field_name("condition")
             if condition:
                 identifiers_used = recursively_get_children_of_types(
-                    condition, variable_type + ["field_expression"],
-                    index=parser.index,
-                    check_list=parser.symbol_table["scope_map"]
+                    condition, variable_or_field_types,
+                    index=index,
+                    check_list=scope_bitmap
                 )
                 for identifier in identifiers_used:
-                    add_entry(parser, rda_table, parent_id, used=identifier)
+                    add_entry(parser, rda_table, added_identifiers, parent_id, used=identifier)
 
-        elif root_node.type == "for_statement":
+        elif node_type == "for_statement":
             parent_id = get_index(root_node, index)
-            if parent_id is None or parent_id not in CFG_results.graph.nodes:
+            if parent_id is None or parent_id not in cfg_nodes:
                 continue
 
             condition = root_node.child_by_field_name("condition")
             if condition:
                 identifiers_used = recursively_get_children_of_types(
-                    condition, variable_type + ["field_expression"],
-                    index=parser.index,
-                    check_list=parser.symbol_table["scope_map"]
+                    condition, variable_or_field_types,
+                    index=index,
+                    check_list=scope_bitmap
                 )
                 for identifier in identifiers_used:
-                    add_entry(parser, rda_table, parent_id, used=identifier)
+                    add_entry(parser, rda_table, added_identifiers, parent_id, used=identifier)
 
-        elif root_node.type == "while_statement":
+        elif node_type == "while_statement":
             parent_id = get_index(root_node, index)
-            if parent_id is None or parent_id not in CFG_results.graph.nodes:
+            if parent_id is None or parent_id not in cfg_nodes:
                 continue
 
             condition = root_node.child_by_field_name("condition")
             if condition:
                 identifiers_used = recursively_get_children_of_types(
-                    condition, variable_type + ["field_expression"],
-                    index=parser.index,
-                    check_list=parser.symbol_table["scope_map"]
+                    condition, variable_or_field_types,
+                    index=index,
+                    check_list=scope_bitmap
                 )
                 for identifier in identifiers_used:
-                    add_entry(parser, rda_table, parent_id, used=identifier)
+                    add_entry(parser, rda_table, added_identifiers, parent_id, used=identifier)
 
-        elif (root_node.type == "parenthesized_expression" and
+        elif (node_type == "parenthesized_expression" and
               root_node.parent is not None and
               root_node.parent.type == "do_statement"):
             parent_id = get_index(root_node, index)
-            if parent_id is None or parent_id not in CFG_results.graph.nodes:
+            if parent_id is None or parent_id not in cfg_nodes:
                 continue
 
             identifiers_used = recursively_get_children_of_types(
-                root_node, variable_type + ["field_expression"],
-                index=parser.index,
-                check_list=parser.symbol_table["scope_map"]
+                root_node, variable_or_field_types,
+                index=index,
+                check_list=scope_bitmap
             )
             for identifier in identifiers_used:
-                add_entry(parser, rda_table, parent_id, used=identifier)
+                add_entry(parser, rda_table, added_identifiers, parent_id, used=identifier)
 
-        elif root_node.type == "do_statement":
+        elif node_type == "do_statement":
             pass
 
-        elif root_node.type == "if_statement":
+        elif node_type == "if_statement":
             parent_id = get_index(root_node, index)
-            if parent_id is None or parent_id not in CFG_results.graph.nodes:
+            if parent_id is None or parent_id not in cfg_nodes:
                 continue
 
             condition = root_node.child_by_field_name("condition")
             if condition:
                 identifiers_used = recursively_get_children_of_types(
-                    condition, variable_type + ["field_expression"],
-                    index=parser.index,
-                    check_list=parser.symbol_table["scope_map"]
+                    condition, variable_or_field_types,
+                    index=index,
+                    check_list=scope_bitmap
                 )
                 for identifier in identifiers_used:
-                    add_entry(parser, rda_table, parent_id, used=identifier)
+                    add_entry(parser, rda_table, added_identifiers, parent_id, used=identifier)
 
-        elif root_node.type == "conditional_expression":
-            parent_statement = return_first_parent_of_types(
-                root_node, statement_types["node_list_type"]
+        elif node_type == "conditional_expression":
+            parent_id = statement_id_of(
+                root_node, index, cfg_nodes, statement_cache
             )
-            if parent_statement is None:
-                continue
-
-            parent_id = get_index(parent_statement, index)
-            if parent_id is None or parent_id not in CFG_results.graph.nodes:
+            if parent_id is None:
                 continue
 
             condition = root_node.child_by_field_name("condition")
             if condition:
-                if condition.type in variable_type + ["field_expression"]:
-                    add_entry(parser, rda_table, parent_id, used=condition)
+                if condition.type in variable_or_field_types:
+                    add_entry(parser, rda_table, added_identifiers, parent_id, used=condition)
                 else:
-                    identifiers_used = recursively_get_children_of_types(
-                        condition, variable_type + ["field_expression"],
-                        index=parser.index,
-                        check_list=parser.symbol_table["scope_map"]
+                    identifiers_used, literals_used = get_identifiers_and_literals(
+                        condition, variable_or_field_types, index, scope_bitmap
                     )
                     for identifier in identifiers_used:
-                        add_entry(parser, rda_table, parent_id, used=identifier)
-                    literals_used = recursively_get_children_of_types(
-                        condition, literal_types,
-                        index=parser.index
-                    )
+                        add_entry(parser, rda_table, added_identifiers, parent_id, used=identifier)
                     for literal in literals_used:
-                        add_entry(parser, rda_table, parent_id, used=literal)
+                        add_entry(parser, rda_table, added_identifiers, parent_id, used=literal)
 
             consequence = root_node.child_by_field_name("consequence")
             if consequence:
-                if consequence.type in variable_type + ["field_expression"]:
-                    add_entry(parser, rda_table, parent_id, used=consequence)
+                if consequence.type in variable_or_field_types:
+                    add_entry(parser, rda_table, added_identifiers, parent_id, used=consequence)
                 else:
-                    identifiers_used = recursively_get_children_of_types(
-                        consequence, variable_type + ["field_expression"],
-                        index=parser.index,
-                        check_list=parser.symbol_table["scope_map"]
+                    identifiers_used, literals_used = get_identifiers_and_literals(
+                        consequence, variable_or_field_types, index, scope_bitmap
                     )
                     for identifier in identifiers_used:
-                        add_entry(parser, rda_table, parent_id, used=identifier)
-                    literals_used = recursively_get_children_of_types(
-                        consequence, literal_types,
-                        index=parser.index
-                    )
+                        add_entry(parser, rda_table, added_identifiers, parent_id, used=identifier)
                     for literal in literals_used:
-                        add_entry(parser, rda_table, parent_id, used=literal)
+                        add_entry(parser, rda_table, added_identifiers, parent_id, used=literal)
 
             alternative = root_node.child_by_field_name("alternative")
             if alternative:
-                if alternative.type in variable_type + ["field_expression"]:
-                    add_entry(parser, rda_table, parent_id, used=alternative)
+                if alternative.type in variable_or_field_types:
+                    add_entry(parser, rda_table, added_identifiers, parent_id, used=alternative)
                 else:
-                    identifiers_used = recursively_get_children_of_types(
-                        alternative, variable_type + ["field_expression"],
-                        index=parser.index,
-                        check_list=parser.symbol_table["scope_map"]
+                    identifiers_used, literals_used = get_identifiers_and_literals(
+                        alternative, variable_or_field_types, index, scope_bitmap
                     )
                     for identifier in identifiers_used:
-                        add_entry(parser, rda_table, parent_id, used=identifier)
-                    literals_used = recursively_get_children_of_types(
-                        alternative, literal_types,
-                        index=parser.index
-                    )
+                        add_entry(parser, rda_table, added_identifiers, parent_id, used=identifier)
                     for literal in literals_used:
-                        add_entry(parser, rda_table, parent_id, used=literal)
+                        add_entry(parser, rda_table, added_identifiers, parent_id, used=literal)
 
         else:
-            if root_node.type not in variable_type:
+            if node_type not in variable_type_set:
                 continue
 
-            in_do_while_condition = False
-            temp_parent = root_node.parent
-            while temp_parent is not None:
-                if (temp_parent.type == "parenthesized_expression" and
-                    temp_parent.parent is not None and
-                    temp_parent.parent.type == "do_statement"):
-                    in_do_while_condition = True
-                    break
-                temp_parent = temp_parent.parent
-
-            if in_do_while_condition:
+            if in_do_while_condition(root_node, condition_cache):
                 continue
 
-            handled_types = (def_statement + assignment + increment_statement +
-                           function_calls + ["return_statement"])
             parent_statement = return_first_parent_of_types(
-                root_node,
-                statement_types["non_control_statement"] + statement_types["control_statement"],
-                stop_types=statement_types.get("statement_holders", []) + handled_types
+                root_node, parent_statement_types, stop_types=parent_stop_types
             )
 
             if parent_statement is None:
                 continue
 
             parent_id = get_index(parent_statement, index)
-            if parent_id is None or parent_id not in CFG_results.graph.nodes:
+            if parent_id is None or parent_id not in cfg_nodes:
                 continue
 
             immediate_parent = root_node.parent
             if immediate_parent and immediate_parent.type == "pointer_expression":
                 continue
 
-            add_entry(parser, rda_table, parent_id, used=root_node)
+            add_entry(parser, rda_table, added_identifiers, parent_id, used=root_node)
 
     return rda_table
 
@@ -1201,88 +1268,151 @@ def start_rda(index, rda_table, cfg_graph, pre_solve=False):
     """
     Perform Reaching Definitions Analysis.
 
-    Fixed-point iteration algorithm:
-        Initialize all IN/OUT to empty
-        Repeat until convergence:
-            For each statement s:
+    Worklist algorithm:
+        Initialize all IN/OUT to empty, queue every statement
+        While the queue is not empty:
+            Take statement s:
                 IN[s] = union of OUT[p] for predecessors p
                 OUT[s] = (IN[s] - KILL[s]) ∪ DEF[s]
+                If OUT[s] changed, queue the successors of s
     """
-    graph = copy.deepcopy(cfg_graph)
-    if pre_solve:
-        remove_edges = []
-        for edge in graph.edges:
-            edge_data = graph.edges[edge]
-            if "label" in edge_data and edge_data["label"] in \
-               ["function_call", "function_return"]:
-                remove_edges.append(edge)
-        graph.remove_edges_from(remove_edges)
+    # Only the predecessor lists are needed, so read them straight off
+    # cfg_graph (leaving out the call/return edges when pre_solve is set)
+    # instead of deep-copying the graph and removing those edges
+    ignored_labels = frozenset(["function_call", "function_return"]) if pre_solve else frozenset()
+
+    nodes = list(cfg_graph.nodes)
+    position = {node: i for i, node in enumerate(nodes)}
+    # Per-statement inputs of the transfer function, kept in flat lists
+    # aligned with nodes and built once
+    predecessors = [[position[s] for (s, t, label) in cfg_graph.in_edges(node, data="label")
+                     if label not in ignored_labels]
+                    for node in nodes]
+    successors = [[] for _ in nodes]
+    for i, node_predecessors in enumerate(predecessors):
+        for pred in node_predecessors:
+            successors[pred].append(i)
+    defs = [rda_table[node]["def"] if node in rda_table else {} for node in nodes]
+
+    # Every definition gets one bit, so IN/OUT are plain ints and the
+    # transfer function is a few big-int operations carried out in C:
+    #   OUT = (IN & ~KILL) | GEN
+    # KILL[s] holds every definition of a name s defines, GEN[s] its own.
+    all_defs = []
+    bit_of = {}
+    name_masks = {}
+    gen_masks = []
+    for def_info in defs:
+        gen = 0
+        for definition in def_info:
+            bit = bit_of.get(definition)
+            if bit is None:
+                bit = bit_of[definition] = 1 << len(all_defs)
+                all_defs.append(definition)
+                name_masks[definition.name] = name_masks.get(definition.name, 0) | bit
+            gen |= bit
+        gen_masks.append(gen)
+    keep_masks = []
+    for def_info in defs:
+        kill = 0
+        for name in {definition.name for definition in def_info}:
+            kill |= name_masks[name]
+        keep_masks.append(~kill)
+
+    in_masks = [0] * len(nodes)
+    out_masks = [0] * len(nodes)
+
+    # Worklist: every statement is evaluated once, after which a statement is
+    # only revisited when the OUT set of one of its predecessors changed
+    worklist = deque(range(len(nodes)))
+    queued = [True] * len(nodes)
+    updates = 0
+
+    while worklist:
+        i = worklist.popleft()
+        queued[i] = False
+        updates += 1
+
+        in_mask = 0
+        for pred in predecessors[i]:
+            in_mask |= out_masks[pred]
+        in_masks[i] = in_mask
+
+        out_mask = (in_mask & keep_masks[i]) | gen_masks[i]
+        if out_mask != out_masks[i]:
+            out_masks[i] = out_mask
+            for succ in successors[i]:
+                if not queued[succ]:
+                    queued[succ] = True
+                    worklist.append(succ)
 
-    cfg = graph
-    nodes = graph.nodes
+    if debug:
+        logger.info("RDA: Converged after {} statement updates", updates)
+
+    def definitions_in(mask):
+        result = set()
+        while mask:
+            low = mask & -mask
+            result.add(all_defs[low.bit_length() - 1])
+            mask ^= low
+        return result
 
-    old_result = {}
-    for node in nodes:
-        old_result[node] = {"IN": set(), "OUT": set()}
+    return {node: {"IN": definitions_in(in_masks[i]), "OUT": definitions_in(out_masks[i])}
+            for i, node in enumerate(nodes)}
 
-    new_result = copy.deepcopy(old_result)
-    iteration = 0
 
-    while True:
-        iteration += 1
+def has_matching_edge(final_graph, source, target, attrib):
+    """Whether a source -> target edge with the same used_def, edge_type and dataflow_type exists"""
+    used_def = attrib.get('used_def', None)
+    edge_type = attrib.get('edge_type', None)
+    dataflow_type = attrib.get('dataflow_type', None)
 
-        for node in nodes:
-            predecessors = [s for (s, t) in cfg.in_edges(node)]
+    # only the parallel source -> target edges can be duplicates
+    parallel_edges = final_graph.get_edge_data(source, target) or {}
+    for data in parallel_edges.values():
+        if (data.get('used_def') == used_def and
+            data.get('edge_type') == edge_type and
+            data.get('dataflow_type') == dataflow_type):
+            return True
+    return False
 
-            in_set = set()
-            for pred in predecessors:
-                in_set = in_set.union(old_result[pred]["OUT"])
 
-            new_result[node]["IN"] = in_set
+def add_edge(final_graph, source, target, attrib=None):
+    """Add edge to graph with attributes, preventing duplicates"""
+    if attrib is not None and has_matching_edge(final_graph, source, target, attrib):
+        return
 
-            def_info = rda_table[node]["def"] if node in rda_table else set()
-            names_defined = [d.name for d in def_info]
+    edge_key = final_graph.add_edge(source, target)
+    if attrib is not None:
+        final_graph[source][target][edge_key].update(attrib)
 
-            surviving_defs = set()
-            for incoming_def in in_set:
-                if incoming_def.name not in names_defined:
-                    surviving_defs.add(incoming_def)
 
-            new_result[node]["OUT"] = surviving_defs.union(def_info)
+def queue_edge(pending_edges, source, target, attrib):
+    """
+    add_edge for a graph whose edges are all added at the end: an edge is
+    recorded under add_edge's duplicate key, and the first one queued wins.
+    """
+    key = (source, target, attrib.get('used_def'), attrib.get('edge_type'),
+           attrib.get('dataflow_type'))
+    if key not in pending_edges:
+        pending_edges[key] = (source, target, attrib)
 
-        ddiff = DeepDiff(old_result, new_result, ignore_order=True)
-        if ddiff == {}:
-            if debug:
-                logger.info("RDA: Converged in {} iterations", iteration)
-            break
 
-        old_result = copy.deepcopy(new_result)
+def add_queued_edges(final_graph, pending_edges):
+    """
+    Add queued edges to a graph that may already have edges, in one call,
+    leaving out the ones add_edge would have skipped as duplicates.
+    """
+    final_graph.add_edges_from([
+        (source, target, attrib) for source, target, attrib in pending_edges.values()
+        if not has_matching_edge(final_graph, source, target, attrib)
+    ])
 
-    return new_result
 
-
-def add_edge(final_graph, source, target, attrib=None):
-    """Add edge to graph with attributes, preventing duplicates"""
-    if attrib is not None:
-        used_def = attrib.get('used_def', None)
-        edge_type = attrib.get('edge_type', None)
-        dataflow_type = attrib.get('dataflow_type', None)
-
-        for u, v, k, data in final_graph.edges(keys=True, data=True):
-            if (u == source and v == target and
-                data.get('used_def') == used_def and
-                data.get('edge_type') == edge_type and
-                data.get('dataflow_type') == dataflow_type):
-                return
-
-    final_graph.add_edge(source, target)
-    if attrib is not None:
-        edge_keys = [k for u, v, k in final_graph.edges(keys=True) if u == source and v == target]
-        if edge_keys:
-            edge_key = max(edge_keys)
-        else:
-            edge_key = 0
-        nx.set_edge_attributes(final_graph, {(source, target, edge_key): attrib})
+@lru_cache(maxsize=4096)
+def name_root(name):
+    """Object part of a field access name ("s.a.b" -> "s"), cached per name"""
+    return name.split(".", 1)[0]
 
 
 def name_match_with_fields(name1, name2):
@@ -1290,13 +1420,15 @@ def name_match_with_fields(name1, name2):
     if name1 == name2:
         return True
 
-    if name1.startswith(name2 + ".") or name2.startswith(name1 + "."):
-        return True
+    # a field prefix match needs both names to access the same object,
+    # which rules out most pairs without building name + "."
+    if name_root(name1) != name_root(name2):
+        return False
 
-    return False
+    return name1.startswith(name2 + ".") or name2.startswith(name1 + ".")
 
 
-def get_required_edges_from_def_to_use(index, cfg, rda_solution, rda_table,
+def get_required_edges_from_def_to_use(reverse_index, cfg, rda_solution, rda_table,
                                        graph_nodes, processed_edges, properties):
     """
     Generate DFG edges from RDA solution.
@@ -1307,8 +1439,22 @@ def get_required_edges_from_def_to_use(index, cfg, rda_solution, rda_table,
                 If d.name == u.name and scope_check(d.scope, u.scope):
                     Add edge: d.line → s
     """
-    final_graph = copy.deepcopy(cfg)
-    final_graph.remove_edges_from(list(final_graph.edges()))
+    # same kind of graph with the CFG's nodes but none of its edges; the
+    # node attribute dicts are copied, their values are plain strings
+    final_graph = cfg.__class__()
+    final_graph.graph.update(cfg.graph)
+    final_graph.add_nodes_from((node, dict(data)) for node, data in cfg.nodes(data=True))
+    # edges are deduplicated as they are found and added in one call at the end
+    pending_edges = {}
+
+    # (def_node, definition) pairs in graph_nodes order, grouped by name, so
+    # the fallback for unsatisfied uses looks up a name instead of scanning
+    # every statement's definitions
+    defs_by_name = {}
+    for def_node in graph_nodes:
+        if def_node in rda_table:
+            for definition in rda_table[def_node]["def"]:
+                defs_by_name.setdefault(definition.name, []).append((def_node, definition))
 
     for node in graph_nodes:
         if node not in rda_table:
@@ -1324,7 +1470,7 @@ def get_required_edges_from_def_to_use(index, cfg, rda_solution, rda_table,
             for available_def in rda_solution[node]["IN"]:
                 if available_def.name == used.name:
                     if scope_check(available_def.scope, used.scope):
-                        add_edge(final_graph, available_def.line, node,
+                        queue_edge(pending_edges, available_def.line, node,
                                {'dataflow_type': 'comesFrom',
                                 'edge_type': 'DFG_edge',
                                 'color': '#00A3FF',
@@ -1334,7 +1480,7 @@ def get_required_edges_from_def_to_use(index, cfg, rda_solution, rda_table,
                 elif "." in used.name or "." in available_def.name:
                     if name_match_with_fields(used.name, available_def.name):
                         if scope_check(available_def.scope, used.scope):
-                            add_edge(final_graph, available_def.line, node,
+                            queue_edge(pending_edges, available_def.line, node,
                                    {'dataflow_type': 'comesFrom',
                                     'edge_type': 'DFG_edge',
                                     'color': '#00A3FF',
@@ -1342,60 +1488,58 @@ def get_required_edges_from_def_to_use(index, cfg, rda_solution, rda_table,
                             used.satisfied = True
 
             if not used.satisfied:
-                for def_node in graph_nodes:
-                    if def_node not in rda_table:
-                        continue
-                    for definition in rda_table[def_node]["def"]:
-                        if definition.name == used.name:
-                            node_type = read_index(index, def_node)[-1] if def_node in index.values() else None
-                            if node_type == "function_definition":
-                                add_edge(final_graph, def_node, node,
-                                       {'dataflow_type': 'comesFrom',
-                                        'edge_type': 'DFG_edge',
-                                        'color': '#00A3FF',
-                                        'used_def': used.name})
-                                used.satisfied = True
-                                break
+                for def_node, definition in defs_by_name.get(used.name, ()):
+                    node_type = read_index(reverse_index, def_node)[-1] if def_node in reverse_index else None
+                    if node_type == "function_definition":
+                        queue_edge(pending_edges, def_node, node,
+                               {'dataflow_type': 'comesFrom',
+                                'edge_type': 'DFG_edge',
+                                'color': '#00A3FF',
+                                'used_def': used.name})
+                        used.satisfied = True
 
-        if properties.get("last_def", False):
+        # the statement's own type decides the whole loop, so test it first
+        if (properties.get("last_def", False) and
+                read_index(reverse_index, node)[-1] not in last_def_ignore_types):
             killed_defs = rda_solution[node]["IN"] - rda_solution[node]["OUT"]
             for killed_def in killed_defs:
-                node_type = read_index(index, node)[-1]
-                def_node_type = read_index(index, killed_def.line)[-1]
-                ignore_types = ['for_statement', 'while_statement',
-                               'if_statement', 'switch_statement']
-                if node_type not in ignore_types and \
-                   def_node_type not in ignore_types:
-                    add_edge(final_graph, killed_def.line, node,
+                def_node_type = read_index(reverse_index, killed_def.line)[-1]
+                if def_node_type not in last_def_ignore_types:
+                    queue_edge(pending_edges, killed_def.line, node,
                            {'color': 'orange', 'dataflow_type': 'lastDef'})
 
     for edge in processed_edges:
-        add_edge(final_graph, edge[0], edge[1],
+        queue_edge(pending_edges, edge[0], edge[1],
                {'dataflow_type': 'parameter', 'edge_type': 'DFG_edge'})
 
+    final_graph.add_edges_from(pending_edges.values())
     return final_graph
 
 
 def rda_cfg_map(rda_solution, CFG_results):
     """Create debug graph showing RDA info on CFG edges"""
-    graph = copy.deepcopy(CFG_results.graph)
+    # Graph.copy() gives every edge its own attribute dict, which is all
+    # the rda_info annotation below needs
+    graph = CFG_results.graph.copy()
 
-    for edge in list(graph.edges):
+    unused_edges = []
+    for edge in graph.edges:
         out_set = rda_solution[edge[0]]["OUT"]
         in_set = rda_solution[edge[1]]["IN"]
 
-        intersection = [d for d in out_set if d in in_set]
-
-        if intersection:
-            edge_data = graph.get_edge_data(*edge)
-            edge_data['rda_info'] = ",".join([str(d) for d in intersection])
+        # isdisjoint settles most edges in C; the shared definitions are
+        # still listed in out_set order so rda_info reads the same
+        if out_set.isdisjoint(in_set):
+            unused_edges.append(edge)
         else:
-            graph.remove_edge(*edge)
+            edge_data = graph.get_edge_data(*edge)
+            edge_data['rda_info'] = ",".join([str(d) for d in out_set if d in in_set])
 
+    graph.remove_edges_from(unused_edges)
     return graph
 
 
-def collect_call_site_information(parser, function_metadata, cfg_graph):
+def collect_call_site_information(parser, function_metadata, cfg_graph, statement_cache):
     """
     Collect information about function call sites for interprocedural analysis.
 
@@ -1415,81 +1559,82 @@ def collect_call_site_information(parser, function_metadata, cfg_graph):
     """
     call_sites = []
     index = parser.index
+    # only calls to these can pass anything by reference
+    by_ref_functions = {name for name, meta in function_metadata.items()
+                        if any(is_pointer for _, is_pointer, _ in meta["params"])}
 
-    for node in traverse_tree(parser.tree.root_node):
-        if node.type == "call_expression":
-            function_name = None
-            if node.children and node.children[0].type == "identifier":
-                function_name = st(node.children[0])
+    for node in parser.nodes_of_types(("call_expression",)):
+        function_name = None
+        if node.children and node.children[0].type == "identifier":
+            function_name = st(node.children[0], parser)
 
-            if not function_name or function_name not in function_metadata:
-                continue
+        if not function_name or function_name not in by_ref_functions:
+            continue
 
-            parent_statement = return_first_parent_of_types(
-                node, statement_types["node_list_type"]
-            )
-            if not parent_statement:
-                continue
+        parent_statement = first_statement_of(node, statement_cache)
+        if not parent_statement:
+            continue
 
-            call_site_id = get_index(parent_statement, index)
-            if call_site_id is None or call_site_id not in cfg_graph.nodes:
-                continue
+        call_site_id = get_index(parent_statement, index)
+        if call_site_id is None or call_site_id not in cfg_graph.nodes:
+            continue
+
+        pass_by_ref_args = []
+        for child in node.children[1:]:
+            if child.type == "argument_list":
+                func_params = function_metadata[function_name]["params"]
 
-            pass_by_ref_args = []
-            for child in node.children[1:]:
-                if child.type == "argument_list":
-                    func_params = function_metadata[function_name]["params"]
-
-                    for arg_idx, arg in enumerate(child.named_children):
-                        if arg_idx < len(func_params):
-                            param_name, is_pointer, param_idx = func_params[arg_idx]
-
-                            if is_pointer:
-                                if arg.type == "pointer_expression":
-                                    has_ampersand = False
-                                    arg_node = None
-                                    for arg_child in arg.children:
-                                        if arg_child.type == "&":
-                                            has_ampersand = True
-                                        elif arg_child.is_named:
-                                            arg_node = arg_child
-
-                                    if has_ampersand and arg_node:
-                                        if arg_node.type == "identifier":
-                                            var_name = st(arg_node)
-                                            pass_by_ref_args.append((arg_idx, var_name, arg_node))
-                                elif arg.type == "identifier":
-                                    var_name = st(arg)
-                                    arg_index = get_index(arg, index)
-                                    if arg_index and arg_index in parser.symbol_table["scope_map"]:
-                                        pass_by_ref_args.append((arg_idx, var_name, arg))
-
-            if pass_by_ref_args:
-                call_sites.append({
-                    "call_site_node": node,
-                    "call_site_id": call_site_id,
-                    "function_name": function_name,
-                    "pass_by_ref_args": pass_by_ref_args
-                })
+                for arg_idx, (arg, (param_name, is_pointer, param_idx)) in enumerate(
+                        zip(child.named_children, func_params)):
+                    if not is_pointer:
+                        continue
+
+                    if arg.type == "pointer_expression":
+                        has_ampersand = False
+                        arg_node = None
+                        for arg_child in arg.children:
+                            if arg_child.type == "&":
+                                has_ampersand = True
+                            elif arg_child.is_named:
+                                arg_node = arg_child
+
+                        if has_ampersand and arg_node:
+                            if arg_node.type == "identifier":
+                                var_name = st(arg_node, parser)
+                                pass_by_ref_args.append((arg_idx, var_name, arg_node))
+                    elif arg.type == "identifier":
+                        var_name = st(arg, parser)
+                        arg_index = get_index(arg, index)
+                        if arg_index and parser.scope_bitmap[arg_index]:
+                            pass_by_ref_args.append((arg_idx, var_name, arg))
+                break
+
+        if pass_by_ref_args:
+            call_sites.append({
+                "call_site_node": node,
+                "call_site_id": call_site_id,
+                "function_name": function_name,
+                "pass_by_ref_args": pass_by_ref_args
+            })
 
     return call_sites
 
 
-def find_modification_sites(parser, function_metadata, pointer_modifications):
+def find_modification_sites(parser, function_metadata, pointer_modifications,
+                            statement_cache):
     """
     Find all modification sites for pointer parameters inside functions.
 
     For each function, find all statements where a pointer parameter is modified.
 
     Returns:
-        Dict mapping function_name -> list of (param_idx, modification_node, statement_id)
+        Dict mapping function_name -> {param_idx: [(modification_node, statement_id), ...]}
     """
     modification_sites = {}
     index = parser.index
 
     for func_name, meta in function_metadata.items():
-        modifications = []
-        func_node = meta["node"]
+        modifications = {}
         modified_params = pointer_modifications.get(func_name, set())
 
         param_name_to_idx = {}
@@ -1501,7 +1646,10 @@ def find_modification_sites(parser, function_metadata, pointer_modifications):
             modification_sites[func_name] = modifications
             continue
 
-        for node in traverse_tree(func_node):
+        # keyed by the raw bytes so node.text is compared without decoding it
+        param_idx_by_text = {name.encode(): idx for name, idx in param_name_to_idx.items()}
+
+        for node in meta["write_sites"]:
             modification_param_idx = None
             mod_node = None
 
@@ -1511,17 +1659,17 @@ def find_modification_sites(parser, function_metadata, pointer_modifications):
                     if left.type == "pointer_expression":
                         arg = left.child_by_field_name("argument")
                         if arg and arg.type == "identifier":
-                            var_name = st(arg)
-                            if var_name in param_name_to_idx:
-                                modification_param_idx = param_name_to_idx[var_name]
+                            text_idx = param_idx_by_text.get(arg.text)
+                            if text_idx is not None:
+                                modification_param_idx = text_idx
                                 mod_node = node
 
                     elif left.type == "subscript_expression":
                         array_arg = left.child_by_field_name("argument")
                         if array_arg and array_arg.type == "identifier":
-                            var_name = st(array_arg)
-                            if var_name in param_name_to_idx:
-                                modification_param_idx = param_name_to_idx[var_name]
+                            text_idx = param_idx_by_text.get(array_arg.text)
+                            if text_idx is not None:
+                                modification_param_idx = text_idx
                                 mod_node = node
 
             elif node.type == "update_expression":
@@ -1535,32 +1683,76 @@ def find_modification_sites(parser, function_metadata, pointer_modifications):
                     if arg.type == "pointer_expression":
                         inner_arg = arg.child_by_field_name("argument")
                         if inner_arg and inner_arg.type == "identifier":
-                            var_name = st(inner_arg)
-                            if var_name in param_name_to_idx:
-                                modification_param_idx = param_name_to_idx[var_name]
+                            text_idx = param_idx_by_text.get(inner_arg.text)
+                            if text_idx is not None:
+                                modification_param_idx = text_idx
                                 mod_node = node
                     elif arg.type == "subscript_expression":
                         array_arg = arg.child_by_field_name("argument")
                         if array_arg and array_arg.type == "identifier":
-                            var_name = st(array_arg)
-                            if var_name in param_name_to_idx:
-                                modification_param_idx = param_name_to_idx[var_name]
+                            text_idx = param_idx_by_text.get(array_arg.text)
+                            if text_idx is not None:
+                                modification_param_idx = text_idx
                                 mod_node = node
 
             if modification_param_idx is not None and mod_node is not None:
-                parent_statement = return_first_parent_of_types(
-                    mod_node, statement_types["node_list_type"]
-                )
+                parent_statement = first_statement_of(mod_node, statement_cache)
                 if parent_statement:
                     statement_id = get_index(parent_statement, index)
                     if statement_id is not None:
-                        modifications.append((modification_param_idx, mod_node, statement_id))
+                        modifications.setdefault(modification_param_idx, []).append(
+                            (mod_node, statement_id)
+                        )
 
         modification_sites[func_name] = modifications
 
     return modification_sites
 
 
+def uses_reached_from(call_site_id, var_name, cfg_graph, rda_table, names_cache,
+                      successors_cache):
+    """
+    Statements after call_site_id that use var_name, found by walking the CFG
+    until a statement uses var_name without redefining it.
+    names_cache maps a statement id to the (use names, def names) of its RDA entry,
+    successors_cache maps it to a tuple of its CFG successors.
+    """
+    successors = []
+    visited = set()
+    queue = deque([call_site_id])
+
+    while queue:
+        current = queue.popleft()
+        if current in visited:
+            continue
+        visited.add(current)
+
+        uses_var = False
+        defines_var = False
+        if current != call_site_id and current in rda_table:
+            names = names_cache.get(current)
+            if names is None:
+                entry = rda_table[current]
+                names = ({used.name for used in entry["use"]},
+                         {defined.name for defined in entry["def"]})
+                names_cache[current] = names
+            if var_name in names[0]:
+                uses_var = True
+                successors.append(current)
+            defines_var = var_name in names[1]
+
+        if current == call_site_id or not uses_var or defines_var:
+            successors_of_current = successors_cache.get(current)
+            if successors_of_current is None:
+                successors_of_current = tuple(cfg_graph.successors(current))
+                successors_cache[current] = successors_of_current
+            for successor in successors_of_current:
+                if successor not in visited:
+                    queue.append(successor)
+
+    return successors
+
+
 def add_interprocedural_edges(final_graph, parser, call_sites, modification_sites,
                                function_metadata, cfg_graph, rda_table):
     """
@@ -1580,69 +1772,48 @@ def add_interprocedural_edges(final_graph, parser, call_sites, modification_site
         rda_table: RDA table with def/use information
     """
     index = parser.index
+    # the uses reached from a call site depend only on the call site and the variable
+    reached_uses = {}
+    names_cache = {}
+    successors_cache = {}
+    # edges are deduplicated as they are found and added in one call at the end
+    pending_edges = {}
+    # definition ids of the functions that have modification sites
+    func_def_ids = {}
+    for function_name, func_meta in function_metadata.items():
+        if function_name in modification_sites:
+            func_def_id = get_index(func_meta["node"], index)
+            if func_def_id is not None:
+                func_def_ids[function_name] = func_def_id
 
     for call_site_info in call_sites:
         call_site_id = call_site_info["call_site_id"]
         function_name = call_site_info["function_name"]
         pass_by_ref_args = call_site_info["pass_by_ref_args"]
 
-        if function_name not in function_metadata or function_name not in modification_sites:
-            continue
-
-        func_meta = function_metadata[function_name]
-        func_node = func_meta["node"]
-        func_def_id = get_index(func_node, index)
-
+        func_def_id = func_def_ids.get(function_name)
         if func_def_id is None:
             continue
 
         for arg_idx, var_name, var_node in pass_by_ref_args:
-            add_edge(final_graph, call_site_id, func_def_id,
-                   {'dataflow_type': 'comesFrom',
-                    'edge_type': 'DFG_edge',
-                    'color': '#00A3FF',
-                    'used_def': var_name,
-                    'interprocedural': 'call_to_function'})
-
-            mods = modification_sites.get(function_name, [])
-            for mod_param_idx, mod_node, mod_statement_id in mods:
-                if mod_param_idx == arg_idx:
-                    successors = []
-                    visited = set()
-                    queue = [call_site_id]
-
-                    while queue:
-                        current = queue.pop(0)
-                        if current in visited:
-                            continue
-                        visited.add(current)
-
-                        uses_var = False
-                        defines_var = False
-                        if current != call_site_id and current in rda_table:
-                            for used in rda_table[current]["use"]:
-                                if used.name == var_name:
-                                    uses_var = True
-                                    successors.append(current)
-                                    break  # Found a use at this node
-
-                            for defined in rda_table[current]["def"]:
-                                if defined.name == var_name:
-                                    defines_var = True
-                                    break
+            queue_edge(pending_edges, call_site_id, func_def_id,
+                       dict(interprocedural_edge_attrib, used_def=var_name,
+                            interprocedural='call_to_function'))
 
-                        if current == call_site_id or not uses_var or (uses_var and defines_var):
-                            for edge in cfg_graph.out_edges(current):
-                                if edge[1] not in visited:
-                                    queue.append(edge[1])
+            for mod_node, mod_statement_id in modification_sites[function_name].get(arg_idx, ()):
+                reach_key = (call_site_id, var_name)
+                successors = reached_uses.get(reach_key)
+                if successors is None:
+                    successors = uses_reached_from(call_site_id, var_name, cfg_graph,
+                                                   rda_table, names_cache, successors_cache)
+                    reached_uses[reach_key] = successors
 
-                    for use_site in successors:
-                        add_edge(final_graph, mod_statement_id, use_site,
-                               {'dataflow_type': 'comesFrom',
-                                'edge_type': 'DFG_edge',
-                                'color': '#00A3FF',
-                                'used_def': var_name,
-                                'interprocedural': 'modification_to_use'})
+                for use_site in successors:
+                    queue_edge(pending_edges, mod_statement_id, use_site,
+                               dict(interprocedural_edge_attrib, used_def=var_name,
+                                    interprocedural='modification_to_use'))
+
+    add_queued_edges(final_graph, pending_edges)
 
 
 def dfg_c(properties, CFG_results):
@@ -1657,31 +1828,49 @@ def dfg_c(properties, CFG_results):
         (final_graph, debug_graph, rda_table, rda_solution)
     """
     parser = CFG_results.parser
+    # byte-per-index membership tables for the scope and method lookups
+    parser.scope_bitmap = parser.index_bitmap(parser.symbol_table["scope_map"])
+    parser.method_bitmap = parser.index_bitmap(parser.method_map)
     index = parser.index
+    reverse_index = parser.reverse_index
     tree = parser.tree
 
-    cfg_graph = copy.deepcopy(CFG_results.graph)
+    # only read from here on, so the driver's graph is used without a copy
+    cfg_graph = CFG_results.graph
     node_list = CFG_results.node_list
 
+    # call site (start_byte, end_byte, type) -> is_return_value_used result
+    return_used_cache = {}
     processed_edges = []
     for edge in list(cfg_graph.edges()):
         edge_data = cfg_graph.get_edge_data(*edge)
         if edge_data and len(edge_data) > 0:
             edge_data = edge_data[0]
             if edge_data.get("label") == "function_return":
-                return_statement = node_list.get(read_index(index, edge[0]))
-                call_site_node = node_list.get(read_index(index, edge[1]))
+                return_statement = node_list.get(read_index(reverse_index, edge[0]))
+                call_site_node = node_list.get(read_index(reverse_index, edge[1]))
 
                 if return_statement and return_statement.type == "return_statement":
                     if return_statement.named_children:
-                        if call_site_node and is_return_value_used(call_site_node):
+                        if call_site_node and is_return_value_used(call_site_node, return_used_cache):
                             processed_edges.append(edge)
 
     function_metadata = collect_function_metadata(parser)
     pointer_modifications = analyze_pointer_modifications(parser, function_metadata)
 
     start_rda_init_time = time.time()
-    rda_table = build_rda_table(parser, CFG_results, function_metadata, pointer_modifications)
+    # The table is a pure function of the source and the CFG; with
+    # rda_cache_dir set it is reused across runs from a content-hashed pickle
+    rda_table = None
+    rda_cache_dir = properties.get("rda_cache_dir")
+    if rda_cache_dir:
+        rda_cache_file = rda_cache_path(rda_cache_dir, parser.src_language,
+                                        parser.src_code, CFG_results.graph)
+        rda_table = load_rda_table(rda_cache_file)
+    if rda_table is None:
+        rda_table = build_rda_table(parser, CFG_results, function_metadata, pointer_modifications)
+        if rda_cache_dir:
+            store_rda_table(rda_cache_file, rda_table)
     end_rda_init_time = time.time()
 
     start_rda_time = time.time()
@@ -1689,12 +1878,16 @@ def dfg_c(properties, CFG_results):
     end_rda_time = time.time()
 
     final_graph = get_required_edges_from_def_to_use(
-        index, cfg_graph, rda_solution, rda_table,
+        reverse_index, cfg_graph, rda_solution, rda_table,
         cfg_graph.nodes, processed_edges, properties
     )
 
-    call_sites = collect_call_site_information(parser, function_metadata, cfg_graph)
-    modification_sites = find_modification_sites(parser, function_metadata, pointer_modifications)
+    # enclosing statements, shared by the two interprocedural passes
+    statement_cache = {}
+    call_sites = collect_call_site_information(parser, function_metadata, cfg_graph,
+                                               statement_cache)
+    modification_sites = find_modification_sites(parser, function_metadata, pointer_modifications,
+                                                  statement_cache)
     add_interprocedural_edges(final_graph, parser, call_sites, modification_sites,
                                function_metadata, cfg_graph, rda_table)
 
@@ -1,12 +1,12 @@
-import copy
 import time
-from collections import defaultdict
+from collections import deque
+from functools import lru_cache
+from itertools import chain
 
-import networkx as nx
-from deepdiff import DeepDiff
 from loguru import logger
 
 from ...utils.cpp_nodes import statement_types
+from ...utils.DFG_utils import load_rda_table, rda_cache_path, store_rda_table
 from ...utils.src_parser import traverse_tree
 
 assignment = ["assignment_expression"]
@@ -20,36 +20,87 @@ literal_types = ["number_literal", "string_literal", "char_literal", "raw_string
                  "true", "false", "nullptr", "null"]
 
 
-input_functions = ["scanf", "gets", "fgets", "getline", "fscanf", "sscanf",
-                   "fread", "read", "recv", "recvfrom", "getchar", "fgetc",
-                   "cin", "std::cin"]  
-inner_types = ["declaration", "expression_statement"]
-handled_types = (assignment + def_statement + increment_statement +
-                function_calls + ["function_definition", "return_statement",
-                                 "for_statement", "for_range_loop", "switch_statement"])
+input_functions = frozenset({"scanf", "gets", "fgets", "getline", "fscanf", "sscanf",
+                             "fread", "read", "recv", "recvfrom", "getchar", "fgetc",
+                             "cin", "std::cin"})
+variadic_macros = frozenset({"va_start", "va_arg", "va_end"})
+# expressions that can write through a pointer or reference parameter
+write_expression_types = frozenset({"assignment_expression", "update_expression"})
+# attributes shared by every interprocedural data flow edge
+interprocedural_edge_attrib = {'dataflow_type': 'comesFrom',
+                               'edge_type': 'DFG_edge',
+                               'color': '#00A3FF'}
+# nodes collect_function_metadata looks at
+function_metadata_types = write_expression_types | {"function_definition"}
+# statements whose identifiers build_rda_table already records itself
+handled_types = frozenset(def_statement + assignment + increment_statement +
+                          function_calls + declaration_statement +
+                          ["return_statement", "catch_clause", "throw_statement",
+                           "conditional_expression"])
+parent_statement_types = frozenset(statement_types["non_control_statement"] +
+                                   statement_types["control_statement"])
+parent_stop_types = frozenset(statement_types.get("statement_holders", [])) | handled_types
+
+# membership sets built once instead of concatenating lists per check
+literal_type_set = frozenset(literal_types)
+variable_type_set = frozenset(variable_type)
+statement_list_types = frozenset(statement_types["node_list_type"])
+no_modified_params = frozenset()
+# statements that never get lastDef edges, as source or target
+last_def_ignore_types = frozenset(['for_statement', 'for_range_loop', 'while_statement',
+                                   'if_statement', 'switch_statement'])
+variable_or_field_types = variable_type_set | {"field_expression"}
+variable_access_types = variable_or_field_types | {"pointer_expression", "subscript_expression"}
+returned_value_types = variable_access_types | literal_type_set
+used_value_types = returned_value_types | {"unary_expression"}
+# node types build_rda_table has a branch for; every other node is skipped
+# with one lookup instead of falling through the whole if/elif chain
+rda_node_types = handled_types | variable_type_set | frozenset(declaration_statement + [
+    "function_definition", "switch_statement", "for_statement", "while_statement",
+    "parenthesized_expression", "if_statement", "conditional_expression",
+    "for_range_loop", "lambda_expression", "catch_clause", "throw_statement"])
+# ancestors under which a call's return value counts as used
+value_use_parent_types = frozenset({"init_declarator", "assignment_expression",
+                                    "return_statement", "argument_list",
+                                    "if_statement", "while_statement", "for_statement",
+                                    "do_statement", "switch_statement"})
 
 debug = False
 
 
-def st(child):
-    """Get text from AST node"""
+class PseudoNode:
+    """
+    Stand-in for the name of a function defined inside a namespace, carrying
+    its qualified name and the real declarator node
+    """
+    def __init__(self, name, real_node):
+        self.type = "qualified_function"
+        self.text = name.encode('utf-8')
+        self.qualified_name = name
+        self.parent = real_node.parent if real_node else None
+        self.real_node = real_node
+
+
+def st(child, parser):
+    """Get text from AST node, decoded once per tree through the parser"""
     if child is None:
         return ""
-    else:
-        return child.text.decode()
+    if type(child) is PseudoNode:
+        # has no source range of its own
+        return child.qualified_name
+    return parser.node_text(child)
 
 
 def get_index(node, index):
     """Get unique index for AST node"""
-    try:
-        return index[(node.start_point, node.end_point, node.type)]
-    except:
+    if node is None:
         return None
+    return index.get((node.start_point, node.end_point, node.type))
 
 
-def read_index(index, idx):
-    """Get AST node key from index value"""
-    return list(index.keys())[list(index.values()).index(idx)]
+def read_index(reverse_index, idx):
+    """Get AST node key from index value, given the parser's reverse_index"""
+    return reverse_index[idx]
 
 
 def scope_check(parent_scope, child_scope):
@@ -64,30 +115,28 @@ def scope_check(parent_scope, child_scope):
     - [0, 1] (parent scope)
     - [0, 1, 3] (sibling scope)
     """
-    for p in parent_scope:
-        if p not in child_scope:
-            return False
-    return True
+    # scopes are scope_stack snapshots, so containment is a prefix match
+    return parent_scope == child_scope[:len(parent_scope)]
 
 
-def set_add(lst, item):
-    """Add item to list if not already present (set-like behavior)"""
-    for entry in lst:
-        if item == entry:
-            return
-    lst.append(item)
+def set_add(entries, item):
+    """
+    Add item to an insertion-ordered dict of entries if not already present.
+    RDA table DEF/USE collections are dicts used as ordered sets
+    (item -> None), so membership is a hash lookup and the first equal
+    entry added is the one that is kept.
+    """
+    entries.setdefault(item, None)
 
 
-def set_union(first_list, second_list):
-    """Union of two lists (set-like)"""
-    resulting_list = list(first_list)
-    resulting_list.extend(x for x in second_list if x not in resulting_list)
-    return resulting_list
+def set_union(first_entries, second_entries):
+    """Union of two ordered sets (set-like)"""
+    return dict.fromkeys(chain(first_entries, second_entries))
 
 
-def set_difference(first_list, second_list):
-    """Difference of two lists (set-like)"""
-    return [item for item in first_list if item not in second_list]
+def set_difference(first_entries, second_entries):
+    """Difference of two ordered sets (set-like)"""
+    return dict.fromkeys(item for item in first_entries if item not in second_entries)
 
 
 def return_first_parent_of_types(node, parent_types, stop_types=None):
@@ -264,49 +313,120 @@ def is_class_or_struct_type(parser, type_string):
 
 def recursively_get_children_of_types(node, st_types, check_list=None,
                                      index=None, result=None, stop_types=None):
-    """Recursively find child nodes of given types"""
+    """
+    Find child nodes of given types, in pre-order.
+    Walks the named descendants iteratively, so deep expressions cannot
+    exhaust the interpreter's recursion limit.
+    check_list, when given, is an index bitmap (see CustomParser.index_bitmap).
+    """
     if isinstance(st_types, str):
         st_types = [st_types]
-    if stop_types is None:
-        stop_types = []
+    st_types = frozenset(st_types)
+    stop_types = frozenset(stop_types) if stop_types else frozenset()
     if result is None:
         result = []
 
     if node.type in stop_types:
         return result
 
-    if check_list and index:
-        result.extend([
-            child for child in node.children
-            if child.type in st_types and
-               get_index(child, index) in check_list
-        ])
-    else:
-        result.extend([
-            child for child in node.children
-            if child.type in st_types
-        ])
+    filter_by_index = check_list is not None and bool(index)
+    skip_qualified = 'qualified_identifier' in st_types
+
+    # A single TreeCursor visits the subtree, so the binding never builds a
+    # children list. Matches are bucketed by the node they are a child of,
+    # buckets in the pre-order those nodes are entered, which keeps the
+    # siblings-before-grandchildren order this function has always returned.
+    groups = [[]]
+    path = [0]
+    cursor = node.walk()
+    walking = cursor.goto_first_child()
+    while walking:
+        child = cursor.node
+        child_type = child.type
+        if child_type in st_types:
+            if filter_by_index:
+                child_index = index.get((child.start_point, child.end_point, child_type))
+                if child_index is not None and check_list[child_index]:
+                    groups[path[-1]].append(child)
+            else:
+                groups[path[-1]].append(child)
+        if (child.is_named and child_type not in stop_types
+                and not (skip_qualified and child_type == 'qualified_identifier')
+                and cursor.goto_first_child()):
+            path.append(len(groups))
+            groups.append([])
+            continue
+        while not cursor.goto_next_sibling():
+            cursor.goto_parent()
+            path.pop()
+            if not path:
+                walking = False
+                break
 
+    for group in groups:
+        result.extend(group)
+    return result
 
-    for child in node.named_children:
-        if child.type not in stop_types:
-            if 'qualified_identifier' in st_types and child.type == 'qualified_identifier':
-                continue
-            result = recursively_get_children_of_types(
-                child, st_types, result=result, stop_types=stop_types,
-                index=index, check_list=check_list
-            )
 
-    return result
+def get_identifiers_and_literals(node, identifier_types, index, check_list):
+    """
+    Collect the identifier_types and literal descendants of node in one walk.
+    Same result as a recursively_get_children_of_types call for
+    identifier_types (filtered by check_list) followed by one for literal_types;
+    identifiers are not collected from inside a qualified_identifier when that
+    is one of identifier_types, but literals still are.
+    """
+    skip_qualified = 'qualified_identifier' in identifier_types
+    # groups[k] holds the (identifiers, literals) found among the children of
+    # the k-th node entered, as in recursively_get_children_of_types; path
+    # pairs each entered node's group with whether it is inside a
+    # qualified_identifier
+    groups = [([], [])]
+    path = [(0, False)]
+    cursor = node.walk()
+    walking = cursor.goto_first_child()
+    while walking:
+        child = cursor.node
+        child_type = child.type
+        group, in_qualified = path[-1]
+        if child_type in literal_type_set:
+            groups[group][1].append(child)
+        elif not in_qualified and child_type in identifier_types:
+            child_index = index.get((child.start_point, child.end_point, child_type))
+            if child_index is not None and check_list[child_index]:
+                groups[group][0].append(child)
+        if child.is_named and cursor.goto_first_child():
+            path.append((len(groups), in_qualified or
+                         (skip_qualified and child_type == 'qualified_identifier')))
+            groups.append(([], []))
+            continue
+        while not cursor.goto_next_sibling():
+            cursor.goto_parent()
+            path.pop()
+            if not path:
+                walking = False
+                break
+
+    identifiers = []
+    literals = []
+    for group_identifiers, group_literals in groups:
+        identifiers.extend(group_identifiers)
+        literals.extend(group_literals)
+    return identifiers, literals
 
 
 class Identifier:
     """Represents a variable at a specific line with scope information"""
 
+    # one instance per use/def, so skip the per-instance __dict__
+    __slots__ = ("core", "base_name", "name", "line", "declaration", "has_initializer",
+                 "method_call", "is_pointer_modification_at_call_site", "satisfied",
+                 "parent_class", "is_member_access", "variable_scope", "_scope",
+                 "scope_key", "real_line_no")
+
     def __init__(self, parser, node, line=None, declaration=False, full_ref=None, method_call=False, has_initializer=False,
                  is_pointer_modification_at_call_site=False):
-        self.core = st(node)
-        self.unresolved_name = st(full_ref) if full_ref else st(node)
+        self.core = st(node, parser)
         self.base_name = self._resolve_name(node, full_ref, parser)
         self.name = self.base_name
         self.line = line
@@ -330,7 +450,7 @@ class Identifier:
                     class_name_node = child
                     break
             if class_name_node:
-                self.parent_class = st(class_name_node)
+                self.parent_class = st(class_name_node, parser)
 
                 parent = node.parent
                 while parent and parent != class_node:
@@ -340,18 +460,18 @@ class Identifier:
                         break
                     parent = parent.parent
 
-        variable_index = get_index(node, parser.index)
-
-        if hasattr(node, 'qualified_name'):
-            if hasattr(node, 'real_node'):
-                variable_index = get_index(node.real_node, parser.index)
+        if hasattr(node, 'real_node'):
+            # a PseudoNode is never in the index; its declarator is
+            variable_index = get_index(node.real_node, parser.index)
+        else:
+            variable_index = get_index(node, parser.index)
 
         if variable_index is None and node.type == "qualified_identifier":
             innermost = extract_identifier_from_declarator(node)
             if innermost:
                 variable_index = get_index(innermost, parser.index)
 
-        if variable_index and variable_index in parser.symbol_table["scope_map"]:
+        if variable_index and parser.scope_bitmap[variable_index]:
             self.variable_scope = parser.symbol_table["scope_map"][variable_index]
             if variable_index in parser.declaration_map:
                 decl_index = parser.declaration_map[variable_index]
@@ -373,7 +493,7 @@ class Identifier:
                 self.scope = [0]
 
         if line is not None:
-            self.real_line_no = read_index(parser.index, line)[0][0]
+            self.real_line_no = parser.line_of_index[line]
 
         if self.is_member_access and self.parent_class:
             self.name = f"{self.parent_class}::{self.base_name}"
@@ -381,51 +501,66 @@ class Identifier:
     def _resolve_name(self, node, full_ref, parser):
         """Resolve identifier name for C++"""
         if full_ref is None:
-            return st(node)
+            return st(node, parser)
 
-        if full_ref.type == "field_expression":
+        # read once: the binding builds a new str on every .type access
+        ref_type = full_ref.type
+
+        if ref_type == "field_expression":
             argument = full_ref.child_by_field_name("argument")
             field = full_ref.child_by_field_name("field")
 
             if argument:
-                arg_text = st(argument)
-                field_text = st(field) if field else ""
+                arg_text = st(argument, parser)
+                field_text = st(field, parser) if field else ""
                 return arg_text + "." + field_text
-            return st(full_ref)
+            return st(full_ref, parser)
 
-        if full_ref.type == "pointer_expression":
+        if ref_type == "pointer_expression":
             arg = full_ref.child_by_field_name("argument")
-            return "*" + st(arg) if arg else st(full_ref)
+            return "*" + st(arg, parser) if arg else st(full_ref, parser)
 
-        if full_ref.type == "subscript_expression":
+        if ref_type == "subscript_expression":
             arg = full_ref.child_by_field_name("argument")
-            return st(arg) if arg else st(full_ref)
+            return st(arg, parser) if arg else st(full_ref, parser)
 
-        if full_ref.type == "unary_expression":
+        if ref_type == "unary_expression":
             for child in full_ref.children:
                 if child.type == "&":
                     arg = full_ref.child_by_field_name("argument")
-                    return st(arg) if arg else st(full_ref)
+                    return st(arg, parser) if arg else st(full_ref, parser)
 
-        if full_ref.type == "qualified_identifier":
-            qualified_text = st(full_ref)
+        if ref_type == "qualified_identifier":
+            qualified_text = st(full_ref, parser)
             if "::" in qualified_text:
                 return qualified_text.split("::")[-1]
             return qualified_text
 
-        if st(node) == "this":
+        if st(node, parser) == "this":
             return "this"
 
-        return st(node)
+        return st(node, parser)
+
+    @property
+    def scope(self):
+        return self._scope
+
+    @scope.setter
+    def scope(self, scope):
+        # Sorted once here so hashing and equality don't re-sort on every call
+        self._scope = scope
+        self.scope_key = tuple(sorted(scope))
 
     def __eq__(self, other):
+        if type(other) is not Identifier:
+            return False
         return (self.name == other.name and
                 self.line == other.line and
-                sorted(self.scope) == sorted(other.scope) and
+                self.scope_key == other.scope_key and
                 self.method_call == other.method_call)
 
     def __hash__(self):
-        return hash((self.name, self.line, str(self.scope), self.method_call))
+        return hash((self.name, self.line, self.scope_key, self.method_call))
 
     def __str__(self):
         result = [self.name]
@@ -442,21 +577,26 @@ class Identifier:
 class Literal:
     """Represents a literal constant (number, string, etc.) as a data flow source"""
 
+    __slots__ = ("core", "name", "value", "line", "declaration", "satisfied", "scope",
+                 "scope_key", "variable_scope", "method_call", "real_line_no")
+
     def __init__(self, parser, node, line=None):
-        self.core = st(node)
-        self.name = f"LITERAL_{st(node)}"
-        self.value = st(node)
+        self.core = self.value = st(node, parser)
+        self.name = f"LITERAL_{self.value}"
         self.line = line
         self.declaration = True
         self.satisfied = False
         self.scope = [0]
+        self.scope_key = (0,)
         self.variable_scope = [0]
         self.method_call = False
 
         if line is not None:
-            self.real_line_no = read_index(parser.index, line)[0][0]
+            self.real_line_no = parser.line_of_index[line]
 
     def __eq__(self, other):
+        if type(other) is not Literal:
+            return False
         return (self.name == other.name and
                 self.line == other.line)
 
@@ -483,40 +623,48 @@ def get_namespace_for_node(node, parser):
         if parent.type == "namespace_definition":
             for child in parent.children:
                 if child.type == "namespace_identifier":
-                    return st(child)
+                    return st(child, parser)
         parent = parent.parent
     return None
 
+
+# declarator wrapper type -> child types that lead towards the declared
+# identifier; None means the identifier is under the first child
+wrapped_declarator_types = frozenset({"identifier", "pointer_declarator", "array_declarator",
+                                      "reference_declarator", "qualified_identifier"})
+declarator_child_types = {
+    "qualified_identifier": frozenset({"identifier", "qualified_identifier"}),
+    "pointer_declarator": wrapped_declarator_types,
+    "reference_declarator": wrapped_declarator_types,
+    "array_declarator": None,
+    "function_declarator": frozenset({"identifier", "pointer_declarator", "parenthesized_declarator",
+                                      "qualified_identifier"}),
+    "parenthesized_declarator": wrapped_declarator_types,
+}
+param_declarator_types = frozenset({"pointer_declarator", "array_declarator",
+                                    "function_declarator", "reference_declarator"})
+
+
 def extract_identifier_from_declarator(declarator_node):
     """Extract identifier from declarator (may be wrapped in pointer/array/reference/qualified)"""
-    if declarator_node.type == "identifier":
-        return declarator_node
-    elif declarator_node.type == "qualified_identifier":
-        for child in declarator_node.children:
-            if child.type in ["identifier", "qualified_identifier"]:
-                result = extract_identifier_from_declarator(child)
-                if result:
-                    return result
-        return None
-    elif declarator_node.type == "pointer_declarator":
-        for child in declarator_node.children:
-            if child.type in ["identifier", "pointer_declarator", "array_declarator", "reference_declarator", "qualified_identifier"]:
-                return extract_identifier_from_declarator(child)
-    elif declarator_node.type == "reference_declarator":
-        for child in declarator_node.children:
-            if child.type in ["identifier", "pointer_declarator", "array_declarator", "reference_declarator", "qualified_identifier"]:
-                return extract_identifier_from_declarator(child)
-    elif declarator_node.type == "array_declarator":
-        if declarator_node.children:
-            return extract_identifier_from_declarator(declarator_node.children[0])
-    elif declarator_node.type == "function_declarator":
-        for child in declarator_node.children:
-            if child.type in ["identifier", "pointer_declarator", "parenthesized_declarator", "qualified_identifier"]:
-                return extract_identifier_from_declarator(child)
-    elif declarator_node.type == "parenthesized_declarator":
-        for child in declarator_node.children:
-            if child.type in ["identifier", "pointer_declarator", "array_declarator", "reference_declarator", "qualified_identifier"]:
-                return extract_identifier_from_declarator(child)
+    # Wrappers commit to their first matching child, but qualified_identifier
+    # tries each match in turn, so pending candidates are kept on a stack.
+    stack = [declarator_node]
+    while stack:
+        node = stack.pop()
+        if node.type == "identifier":
+            return node
+        if node.type not in declarator_child_types:
+            continue
+        child_types = declarator_child_types[node.type]
+        children = node.children
+        if child_types is None:
+            candidates = children[:1]
+        else:
+            candidates = [child for child in children if child.type in child_types]
+            if node.type != "qualified_identifier":
+                candidates = candidates[:1]
+        stack.extend(reversed(candidates))
     return None
 
 
@@ -525,8 +673,7 @@ def extract_param_identifier(param_node):
     for child in param_node.children:
         if child.type == "identifier":
             return child
-        elif child.type in ["pointer_declarator", "array_declarator",
-                           "function_declarator", "reference_declarator"]:
+        elif child.type in param_declarator_types:
             return extract_identifier_from_declarator(child)
     return None
 
@@ -573,21 +720,98 @@ def is_reference_variable(parser, node):
 
 
 def extract_operator_text(assign_node, left_node, right_node):
-    left_text = left_node.text
-    right_text = right_node.text
-    operator_bytes = (
-        assign_node.text.split(left_text, 1)[-1]
-        .rsplit(right_text, 1)[0]
-        .strip()
+    start = left_node.end_byte - assign_node.start_byte
+    end = right_node.start_byte - assign_node.start_byte
+    return assign_node.text[start:end].strip().decode()
+
+
+def add_identifier(rda_table, added_identifiers, statement_id, kind, parser, node, line=None, **options):
+    """
+    set_add Identifier(parser, node, line, **options) to the statement's
+    kind ("def"/"use") entries. An Identifier is determined by these
+    arguments, so a repeat would only be dropped by set_add; it is
+    recognised from added_identifiers and never built.
+    """
+    key = (statement_id, kind, node_key(node), line) + tuple(
+        (name, node_key(value) if name == "full_ref" else value)
+        for name, value in sorted(options.items())
     )
-    return operator_bytes.decode()
+    if key in added_identifiers:
+        return
+    added_identifiers.add(key)
+    set_add(rda_table[statement_id][kind], Identifier(parser, node, line, **options))
+
+
+def node_key(node):
+    """Stable key for a tree-sitter node (wrappers are rebuilt on every access)"""
+    if node is None:
+        return None
+    return (node.start_byte, node.end_byte, node.type)
+
+
+def first_statement_of(node, statement_cache):
+    """
+    return_first_parent_of_types(node, statement_list_types), memoized in
+    statement_cache by node_key for node and every ancestor walked past,
+    so siblings under one statement share a single walk up the tree.
+    """
+    path = []
+    statement = None
+    while node is not None:
+        key = node_key(node)
+        if key in statement_cache:
+            statement = statement_cache[key]
+            break
+        path.append(key)
+        if node.type in statement_list_types:
+            statement = node
+            break
+        node = node.parent
+    for key in path:
+        statement_cache[key] = statement
+    return statement
 
 
-def add_entry(parser, rda_table, statement_id, used=None, defined=None,
+def statement_id_of(node, index, cfg_nodes, statement_cache):
+    """Index of the CFG statement enclosing node, or None if it has none"""
+    statement = first_statement_of(node, statement_cache)
+    statement_id = get_index(statement, index)
+    if statement_id is None or statement_id not in cfg_nodes:
+        return None
+    return statement_id
+
+
+def in_do_while_condition(node, condition_cache):
+    """
+    Whether node sits inside the parenthesized condition of a do_statement.
+    The answer for each ancestor walked past is memoized in condition_cache
+    by node_key, so the other identifiers in that subtree stop early.
+    """
+    path = []
+    inside = False
+    current = node.parent
+    while current is not None:
+        key = node_key(current)
+        if key in condition_cache:
+            inside = condition_cache[key]
+            break
+        path.append(key)
+        parent = current.parent
+        if (current.type == "parenthesized_expression" and
+                parent is not None and parent.type == "do_statement"):
+            inside = True
+            break
+        current = parent
+    for key in path:
+        condition_cache[key] = inside
+    return inside
+
+
+def add_entry(parser, rda_table, added_identifiers, statement_id, used=None, defined=None,
               declaration=False, core=None, method_call=False, has_initializer=False,
               is_pointer_modification_at_call_site=False):
     if statement_id not in rda_table:
-        rda_table[statement_id] = defaultdict(list)
+        rda_table[statement_id] = {"def": {}, "use": {}}
 
     if not used and not defined:
         return
@@ -596,7 +820,7 @@ def add_entry(parser, rda_table, statement_id, used=None, defined=None,
     if core is None:
         core = current_node
 
-    if current_node.type in literal_types:
+    if current_node.type in literal_type_set:
         if used:
             set_add(rda_table[statement_id]["use"],
                    Literal(parser, current_node, statement_id))
@@ -619,27 +843,24 @@ def add_entry(parser, rda_table, statement_id, used=None, defined=None,
 
         if is_method_call:
             if defined is not None:
-                set_add(rda_table[statement_id]["def"],
-                       Identifier(parser, argument, statement_id,
-                                full_ref=current_node, declaration=declaration,
-                                method_call=True, has_initializer=has_initializer))
+                add_identifier(rda_table, added_identifiers, statement_id, "def", parser, argument, statement_id,
+                               full_ref=current_node, declaration=declaration,
+                               method_call=True, has_initializer=has_initializer)
             else:
-                set_add(rda_table[statement_id]["use"],
-                       Identifier(parser, argument, full_ref=current_node,
-                                method_call=True))
+                add_identifier(rda_table, added_identifiers, statement_id, "use", parser, argument,
+                               full_ref=current_node, method_call=True)
             return
 
         if defined is not None:
             if argument:
-                set_add(rda_table[statement_id]["def"],
-                       Identifier(parser, argument, statement_id,
-                                full_ref=None, declaration=declaration,
-                                method_call=method_call, has_initializer=has_initializer))
+                add_identifier(rda_table, added_identifiers, statement_id, "def", parser, argument, statement_id,
+                               full_ref=None, declaration=declaration,
+                               method_call=method_call,
+                               has_initializer=has_initializer)
         else:
             if argument:
-                set_add(rda_table[statement_id]["use"],
-                       Identifier(parser, argument, full_ref=None,
-                                method_call=method_call))
+                add_identifier(rda_table, added_identifiers, statement_id, "use", parser, argument, full_ref=None,
+                               method_call=method_call)
         return
 
     if used and used.type == "unary_expression":
@@ -652,14 +873,14 @@ def add_entry(parser, rda_table, statement_id, used=None, defined=None,
                 argument = child
 
         if operator is not None and argument is not None:
-            if argument.type in variable_type:
+            if argument.type in variable_type_set:
                 arg_index = get_index(argument, parser.index)
-                if arg_index and arg_index in parser.symbol_table["scope_map"]:
-                    set_add(rda_table[statement_id]["use"],
-                           Identifier(parser, argument, full_ref=argument))
-                elif arg_index and arg_index in parser.method_map:
-                    set_add(rda_table[statement_id]["use"],
-                           Identifier(parser, argument, full_ref=argument))
+                if arg_index and parser.scope_bitmap[arg_index]:
+                    add_identifier(rda_table, added_identifiers, statement_id, "use", parser, argument,
+                                   full_ref=argument)
+                elif arg_index and parser.method_bitmap[arg_index]:
+                    add_identifier(rda_table, added_identifiers, statement_id, "use", parser, argument,
+                                   full_ref=argument)
             return
 
     if current_node.type == "pointer_expression":
@@ -676,26 +897,25 @@ def add_entry(parser, rda_table, statement_id, used=None, defined=None,
         pointer = current_node.child_by_field_name("argument")
 
         if is_address_of:
-            if pointer and pointer.type in variable_type:
+            if pointer and pointer.type in variable_type_set:
                 pointer_index = get_index(pointer, parser.index)
-                if pointer_index and pointer_index in parser.symbol_table["scope_map"]:
-                    set_add(rda_table[statement_id]["use"],
-                           Identifier(parser, pointer, full_ref=pointer))
+                if pointer_index and parser.scope_bitmap[pointer_index]:
+                    add_identifier(rda_table, added_identifiers, statement_id, "use", parser, pointer,
+                                   full_ref=pointer)
             return
 
         elif is_dereference:
             if defined is not None:
                 pointer_index = get_index(pointer, parser.index)
-                if pointer_index and pointer_index in parser.symbol_table["scope_map"]:
-                    set_add(rda_table[statement_id]["use"],
-                           Identifier(parser, pointer, full_ref=pointer))
+                if pointer_index and parser.scope_bitmap[pointer_index]:
+                    add_identifier(rda_table, added_identifiers, statement_id, "use", parser, pointer,
+                                   full_ref=pointer)
 
-                set_add(rda_table[statement_id]["def"],
-                       Identifier(parser, pointer, statement_id,
-                                full_ref=core, declaration=declaration, has_initializer=has_initializer))
+                add_identifier(rda_table, added_identifiers, statement_id, "def", parser, pointer, statement_id,
+                               full_ref=core, declaration=declaration,
+                               has_initializer=has_initializer)
             else:
-                set_add(rda_table[statement_id]["use"],
-                       Identifier(parser, pointer, full_ref=core))
+                add_identifier(rda_table, added_identifiers, statement_id, "use", parser, pointer, full_ref=core)
             return
 
     if current_node.type == "subscript_expression":
@@ -710,33 +930,27 @@ def add_entry(parser, rda_table, statement_id, used=None, defined=None,
                     break
 
         if defined is not None:
-            set_add(rda_table[statement_id]["def"],
-                   Identifier(parser, array, statement_id,
-                            full_ref=core, declaration=declaration, has_initializer=has_initializer))
-        set_add(rda_table[statement_id]["use"],
-               Identifier(parser, array, full_ref=core))
+            add_identifier(rda_table, added_identifiers, statement_id, "def", parser, array, statement_id,
+                           full_ref=core, declaration=declaration,
+                           has_initializer=has_initializer)
+        add_identifier(rda_table, added_identifiers, statement_id, "use", parser, array, full_ref=core)
 
         if index_expr:
-            if index_expr.type in variable_type:
+            if index_expr.type in variable_type_set:
                 index_id = get_index(index_expr, parser.index)
-                if index_id and index_id in parser.symbol_table["scope_map"]:
-                    set_add(rda_table[statement_id]["use"],
-                           Identifier(parser, index_expr, full_ref=index_expr))
-            elif index_expr.type in literal_types:
+                if index_id and parser.scope_bitmap[index_id]:
+                    add_identifier(rda_table, added_identifiers, statement_id, "use", parser, index_expr,
+                                   full_ref=index_expr)
+            elif index_expr.type in literal_type_set:
                 set_add(rda_table[statement_id]["use"],
                        Literal(parser, index_expr, statement_id))
             else:
-                identifiers_in_index = recursively_get_children_of_types(
-                    index_expr, variable_type + ["field_expression"],
-                    index=parser.index,
-                    check_list=parser.symbol_table["scope_map"]
+                identifiers_in_index, literals_in_index = get_identifiers_and_literals(
+                    index_expr, variable_or_field_types, parser.index, parser.scope_bitmap
                 )
                 for identifier in identifiers_in_index:
-                    set_add(rda_table[statement_id]["use"],
-                           Identifier(parser, identifier, full_ref=identifier))
-                literals_in_index = recursively_get_children_of_types(
-                    index_expr, literal_types, index=parser.index
-                )
+                    add_identifier(rda_table, added_identifiers, statement_id, "use", parser, identifier,
+                                   full_ref=identifier)
                 for literal in literals_in_index:
                     set_add(rda_table[statement_id]["use"],
                            Literal(parser, literal, statement_id))
@@ -747,72 +961,64 @@ def add_entry(parser, rda_table, statement_id, used=None, defined=None,
 
         if method_call:
             if defined is not None:
-                set_add(rda_table[statement_id]["def"],
-                       Identifier(parser, current_node, statement_id,
-                                full_ref=current_node, declaration=declaration,
-                                method_call=method_call, has_initializer=has_initializer))
+                add_identifier(rda_table, added_identifiers, statement_id, "def", parser, current_node, statement_id,
+                               full_ref=current_node, declaration=declaration,
+                               method_call=method_call,
+                               has_initializer=has_initializer)
             else:
-                set_add(rda_table[statement_id]["use"],
-                       Identifier(parser, current_node, statement_id, full_ref=current_node,
-                                method_call=method_call))
+                add_identifier(rda_table, added_identifiers, statement_id, "use", parser, current_node, statement_id,
+                               full_ref=current_node, method_call=method_call)
             return
 
         if innermost_id is None:
             return
 
         node_index = get_index(innermost_id, parser.index)
-        if node_index is None or node_index not in parser.symbol_table["scope_map"]:
+        if node_index is None or not parser.scope_bitmap[node_index]:
             if defined is not None:
-                set_add(rda_table[statement_id]["def"],
-                       Identifier(parser, current_node, statement_id,
-                                full_ref=current_node, declaration=declaration,
-                                method_call=method_call, has_initializer=has_initializer))
+                add_identifier(rda_table, added_identifiers, statement_id, "def", parser, current_node, statement_id,
+                               full_ref=current_node, declaration=declaration,
+                               method_call=method_call,
+                               has_initializer=has_initializer)
             else:
-                set_add(rda_table[statement_id]["use"],
-                       Identifier(parser, current_node, statement_id, full_ref=current_node,
-                                method_call=method_call))
+                add_identifier(rda_table, added_identifiers, statement_id, "use", parser, current_node, statement_id,
+                               full_ref=current_node, method_call=method_call)
             return
 
         if defined is not None:
-            set_add(rda_table[statement_id]["def"],
-                   Identifier(parser, innermost_id, statement_id,
-                            full_ref=current_node, declaration=declaration,
-                            method_call=method_call, has_initializer=has_initializer))
+            add_identifier(rda_table, added_identifiers, statement_id, "def", parser, innermost_id, statement_id,
+                           full_ref=current_node, declaration=declaration,
+                           method_call=method_call, has_initializer=has_initializer)
         else:
-            set_add(rda_table[statement_id]["use"],
-                   Identifier(parser, innermost_id, full_ref=current_node,
-                            method_call=method_call))
+            add_identifier(rda_table, added_identifiers, statement_id, "use", parser, innermost_id,
+                           full_ref=current_node, method_call=method_call)
         return
 
     if current_node.type == "this":
         if used:
-            set_add(rda_table[statement_id]["use"],
-                   Identifier(parser, current_node, full_ref=current_node))
+            add_identifier(rda_table, added_identifiers, statement_id, "use", parser, current_node,
+                           full_ref=current_node)
         return
 
     node_index = get_index(current_node, parser.index)
-    if node_index is None or node_index not in parser.symbol_table["scope_map"]:
+    if node_index is None or not parser.scope_bitmap[node_index]:
         if defined is not None:
-            set_add(rda_table[statement_id]["def"],
-                   Identifier(parser, defined, statement_id,
-                            full_ref=core, declaration=declaration,
-                            method_call=method_call, has_initializer=has_initializer))
+            add_identifier(rda_table, added_identifiers, statement_id, "def", parser, defined, statement_id,
+                           full_ref=core, declaration=declaration,
+                           method_call=method_call, has_initializer=has_initializer)
         else:
-            set_add(rda_table[statement_id]["use"],
-                   Identifier(parser, used, statement_id, full_ref=core,
-                            method_call=method_call))
+            add_identifier(rda_table, added_identifiers, statement_id, "use", parser, used, statement_id, full_ref=core,
+                           method_call=method_call)
         return
 
     if defined is not None:
-        set_add(rda_table[statement_id]["def"],
-               Identifier(parser, defined, statement_id,
-                        full_ref=core, declaration=declaration,
-                        method_call=method_call, has_initializer=has_initializer,
-                        is_pointer_modification_at_call_site=is_pointer_modification_at_call_site))
+        add_identifier(rda_table, added_identifiers, statement_id, "def", parser, defined, statement_id, full_ref=core,
+                       declaration=declaration, method_call=method_call,
+                       has_initializer=has_initializer,
+                       is_pointer_modification_at_call_site=is_pointer_modification_at_call_site)
     else:
-        set_add(rda_table[statement_id]["use"],
-               Identifier(parser, used, statement_id, full_ref=core,
-                        method_call=method_call))
+        add_identifier(rda_table, added_identifiers, statement_id, "use", parser, used, statement_id, full_ref=core,
+                       method_call=method_call)
 
 
 def discover_lambdas(parser, CFG_results):
@@ -832,7 +1038,7 @@ def discover_lambdas(parser, CFG_results):
         if parent and parent.type == "init_declarator":
             declarator = parent.child_by_field_name("declarator")
             if declarator and declarator.type == "identifier":
-                variable_name = st(declarator)
+                variable_name = st(declarator, parser)
 
                 statement = parent.parent
                 if statement:
@@ -854,8 +1060,8 @@ def discover_lambdas(parser, CFG_results):
         for child in node.children:
             if child.type == "lambda_capture_specifier":
                 for capture in child.named_children:
-                    if capture.type in variable_type:
-                        captures.append(st(capture))
+                    if capture.type in variable_type_set:
+                        captures.append(st(capture, parser))
                 break
 
         lambda_node_id = get_index(node, index)
@@ -874,7 +1080,20 @@ def discover_lambdas(parser, CFG_results):
     return lambda_map
 
 
-def is_return_value_used(call_expr_statement):
+def is_return_value_used(call_expr_statement, return_used_cache):
+    """Cached wrapper around check_return_value_used; a call site is asked
+    once per return edge that reaches it. return_used_cache maps a call
+    site's (start_byte, end_byte, type) to the answer for the current run"""
+    key = (call_expr_statement.start_byte, call_expr_statement.end_byte,
+           call_expr_statement.type)
+    used = return_used_cache.get(key)
+    if used is None:
+        used = check_return_value_used(call_expr_statement)
+        return_used_cache[key] = used
+    return used
+
+
+def check_return_value_used(call_expr_statement):
     if call_expr_statement.type == "declaration":
         for child in call_expr_statement.children:
             if child.type == "init_declarator":
@@ -891,17 +1110,7 @@ def is_return_value_used(call_expr_statement):
     while parent:
         parent_type = parent.type
 
-        if parent_type in ["init_declarator", "assignment_expression"]:
-            return True
-
-        if parent_type == "return_statement":
-            return True
-
-        if parent_type == "argument_list":
-            return True
-
-        if parent_type in ["if_statement", "while_statement", "for_statement",
-                          "do_statement", "switch_statement"]:
+        if parent_type in value_use_parent_types:
             return True
 
         if parent_type == "expression_statement":
@@ -924,6 +1133,8 @@ def collect_function_metadata(parser):
     - "params": list of (param_name, is_pointer, is_reference, param_idx)
     - "node": the function_definition AST node
     - "func_name": the simple function name
+    - "write_sites": assignment/update expressions inside the function, gathered
+      in the same walk so later passes need not re-traverse the function body
 
     Note: metadata_by_name is kept for backward compatibility but may lose information
     when multiple functions have the same name. Use metadata_by_id for precise lookup.
@@ -932,17 +1143,29 @@ def collect_function_metadata(parser):
     metadata_by_id = {}
     index = parser.index
 
-    for node in traverse_tree(parser.tree.root_node):
+    # (end_byte, write_sites) for each function_definition enclosing the current node
+    enclosing_functions = []
+
+    for node in parser.nodes_of_types(function_metadata_types):
+        while enclosing_functions and node.start_byte >= enclosing_functions[-1][0]:
+            enclosing_functions.pop()
+
+        if node.type in write_expression_types:
+            for _, sites in enclosing_functions:
+                sites.append(node)
+
         if node.type == "function_definition":
             func_name = None
             params = []
+            write_sites = []
+            enclosing_functions.append((node.end_byte, write_sites))
 
             for child in node.named_children:
                 if child.type == "function_declarator":
                     declarator = child.child_by_field_name("declarator")
                     if declarator:
                         if declarator.type in ["identifier", "field_identifier"]:
-                            func_name = st(declarator)
+                            func_name = st(declarator, parser)
                         elif declarator.type in ["pointer_declarator", "reference_declarator"]:
                             inner = declarator
                             while inner and inner.type in ["pointer_declarator", "reference_declarator"]:
@@ -952,11 +1175,11 @@ def collect_function_metadata(parser):
                                 else:
                                     break
                             if inner and inner.type == "identifier":
-                                func_name = st(inner)
+                                func_name = st(inner, parser)
                         elif declarator.type == "qualified_identifier":
                             name_node = declarator.child_by_field_name("name")
                             if name_node:
-                                func_name = st(name_node)
+                                func_name = st(name_node, parser)
 
                     param_list = child.child_by_field_name('parameters')
                     if param_list:
@@ -976,7 +1199,7 @@ def collect_function_metadata(parser):
                                         inner = p_child
                                         while inner:
                                             if inner.type == "identifier":
-                                                param_name = st(inner)
+                                                param_name = st(inner, parser)
                                                 break
                                             elif inner.type in ["pointer_declarator", "reference_declarator"]:
                                                 inner_decl = inner.child_by_field_name("declarator")
@@ -986,14 +1209,14 @@ def collect_function_metadata(parser):
                                                     if inner.named_children:
                                                         for child in inner.named_children:
                                                             if child.type == "identifier":
-                                                                param_name = st(child)
+                                                                param_name = st(child, parser)
                                                                 break
                                                     break
                                             else:
                                                 break
                                     elif p_child.type == "identifier":
                                         if param_name is None:
-                                            param_name = st(p_child)
+                                            param_name = st(p_child, parser)
 
                                 if param_name:
                                     params.append((param_name, is_pointer, is_reference, param_idx))
@@ -1005,7 +1228,8 @@ def collect_function_metadata(parser):
                 meta = {
                     "params": params,
                     "node": node,
-                    "func_name": func_name
+                    "func_name": func_name,
+                    "write_sites": write_sites
                 }
                 metadata_by_name[func_name] = meta
                 if func_def_id is not None:
@@ -1019,7 +1243,6 @@ def analyze_pointer_modifications(parser, function_metadata):
 
     for func_name, meta in function_metadata.items():
         modified_params = set()
-        func_node = meta["node"]
 
         param_name_to_idx = {}
         for param_name, is_pointer, is_reference, param_idx in meta["params"]:
@@ -1030,33 +1253,33 @@ def analyze_pointer_modifications(parser, function_metadata):
             modifications[func_name] = modified_params
             continue
 
-        for node in traverse_tree(func_node):
+        for node in meta["write_sites"]:
             if node.type == "assignment_expression":
                 left = node.child_by_field_name("left")
                 if left:
                     if left.type == "pointer_expression":
                         arg = left.child_by_field_name("argument")
                         if arg and arg.type == "identifier":
-                            var_name = st(arg)
+                            var_name = st(arg, parser)
                             if var_name in param_name_to_idx:
                                 modified_params.add(param_name_to_idx[var_name])
 
                     elif left.type == "subscript_expression":
                         array_arg = left.child_by_field_name("argument")
                         if array_arg and array_arg.type == "identifier":
-                            var_name = st(array_arg)
+                            var_name = st(array_arg, parser)
                             if var_name in param_name_to_idx:
                                 modified_params.add(param_name_to_idx[var_name])
 
                     elif left.type == "field_expression":
                         obj = left.child_by_field_name("argument")
                         if obj and obj.type == "identifier":
-                            var_name = st(obj)
+                            var_name = st(obj, parser)
                             if var_name in param_name_to_idx:
                                 modified_params.add(param_name_to_idx[var_name])
 
                     elif left.type == "identifier":
-                        var_name = st(left)
+                        var_name = st(left, parser)
                         if var_name in param_name_to_idx:
                             modified_params.add(param_name_to_idx[var_name])
 
@@ -1066,23 +1289,23 @@ def analyze_pointer_modifications(parser, function_metadata):
                     if arg.type == "pointer_expression":
                         inner_arg = arg.child_by_field_name("argument")
                         if inner_arg and inner_arg.type == "identifier":
-                            var_name = st(inner_arg)
+                            var_name = st(inner_arg, parser)
                             if var_name in param_name_to_idx:
                                 modified_params.add(param_name_to_idx[var_name])
                     elif arg.type == "subscript_expression":
                         array_arg = arg.child_by_field_name("argument")
                         if array_arg and array_arg.type == "identifier":
-                            var_name = st(array_arg)
+                            var_name = st(array_arg, parser)
                             if var_name in param_name_to_idx:
                                 modified_params.add(param_name_to_idx[var_name])
                     elif arg.type == "field_expression":
                         obj = arg.child_by_field_name("argument")
                         if obj and obj.type == "identifier":
-                            var_name = st(obj)
+                            var_name = st(obj, parser)
                             if var_name in param_name_to_idx:
                                 modified_params.add(param_name_to_idx[var_name])
                     elif arg.type == "identifier":
-                        var_name = st(arg)
+                        var_name = st(arg, parser)
                         if var_name in param_name_to_idx:
                             modified_params.add(param_name_to_idx[var_name])
 
@@ -1091,67 +1314,65 @@ def analyze_pointer_modifications(parser, function_metadata):
     return modifications
 
 
+# Tables are cached on disk when rda_cache_dir is set: any change to what
+# goes into the table must bump DFG_utils.rda_cache_version
 def build_rda_table(parser, CFG_results, lambda_map=None, function_metadata=None, pointer_modifications=None):
     if lambda_map is None:
         lambda_map = {}
 
     rda_table = {}
+    # add_identifier keys already recorded in rda_table
+    added_identifiers = set()
     index = parser.index
     tree = parser.tree
-
-    inner_types_local = ["parenthesized_expression", "binary_expression", "unary_expression"]
-    handled_cases = ["compound_statement", "translation_unit", "class_specifier",
-                     "struct_specifier", "namespace_definition"]
+    scope_bitmap = parser.scope_bitmap
+    cfg_nodes = CFG_results.graph.nodes
+    statement_cache = {}
+    condition_cache = {}
+    # pointer_modifications entries for known functions, merged once so a
+    # call site needs a single lookup
+    modified_params_by_function = {
+        name: params for name, params in (pointer_modifications or {}).items()
+        if function_metadata and name in function_metadata
+    }
 
     for root_node in traverse_tree(tree, []):
         if not root_node.is_named:
             continue
+        # the binding builds a new str on every .type access
+        node_type = root_node.type
+        if node_type not in rda_node_types:
+            continue
 
-        if root_node.type == "return_statement":
+        if node_type == "return_statement":
             parent_id = get_index(root_node, index)
-            if parent_id is None or parent_id not in CFG_results.graph.nodes:
+            if parent_id is None or parent_id not in cfg_nodes:
                 continue
 
             return_expr = root_node.named_children[0] if root_node.named_children else None
-            if return_expr and return_expr.type in variable_type + ["field_expression",
-                                                                      "pointer_expression",
-                                                                      "subscript_expression"] + literal_types:
-                add_entry(parser, rda_table, parent_id, used=return_expr)
+            if return_expr and return_expr.type in returned_value_types:
+                add_entry(parser, rda_table, added_identifiers, parent_id, used=return_expr)
+                literals_used = recursively_get_children_of_types(
+                    root_node, literal_type_set,
+                    index=index
+                )
             else:
-                vars_used = recursively_get_children_of_types(
-                    root_node, variable_type + ["field_expression", "pointer_expression", "subscript_expression"],
-                    index=parser.index,
-                    check_list=parser.symbol_table["scope_map"]
+                vars_used, literals_used = get_identifiers_and_literals(
+                    root_node, variable_access_types, index, scope_bitmap
                 )
                 for var in vars_used:
-                    add_entry(parser, rda_table, parent_id, used=var)
+                    add_entry(parser, rda_table, added_identifiers, parent_id, used=var)
 
-            literals_used = recursively_get_children_of_types(
-                root_node, literal_types,
-                index=parser.index
-            )
             for literal in literals_used:
-                add_entry(parser, rda_table, parent_id, used=literal)
+                add_entry(parser, rda_table, added_identifiers, parent_id, used=literal)
 
-        elif root_node.type in def_statement:
-            parent_statement = return_first_parent_of_types(
-                root_node, statement_types["node_list_type"]
+        elif node_type in def_statement:
+            parent_id = statement_id_of(
+                root_node, index, cfg_nodes, statement_cache
             )
-            if parent_statement is None:
+            if parent_id is None:
                 continue
 
-            parent_id = get_index(parent_statement, index)
-            if parent_id is None or parent_id not in CFG_results.graph.nodes:
-                if parent_statement and parent_statement.type in inner_types_local:
-                    parent_statement = return_first_parent_of_types(
-                        parent_statement, statement_types["node_list_type"]
-                    )
-                    parent_id = get_index(parent_statement, index)
-                elif parent_statement.type in handled_cases:
-                    continue
-                else:
-                    continue
-
             declarator = root_node.child_by_field_name("declarator")
             if declarator is None and len(root_node.children) > 0:
                 declarator = root_node.children[0]
@@ -1162,7 +1383,7 @@ def build_rda_table(parser, CFG_results, lambda_map=None, function_metadata=None
             has_initializer = initializer is not None
 
             if var_identifier:
-                add_entry(parser, rda_table, parent_id,
+                add_entry(parser, rda_table, added_identifiers, parent_id,
                          defined=var_identifier, declaration=True,
                          has_initializer=has_initializer)
 
@@ -1171,28 +1392,22 @@ def build_rda_table(parser, CFG_results, lambda_map=None, function_metadata=None
                     for child in initializer.children:
                         if child.type == "lambda_capture_specifier":
                             for capture in child.named_children:
-                                if capture.type in variable_type:
-                                    add_entry(parser, rda_table, parent_id, used=capture)
-                elif initializer.type in variable_type + ["field_expression", "pointer_expression",
-                                                       "subscript_expression", "unary_expression"] + literal_types:
-                    add_entry(parser, rda_table, parent_id, used=initializer)
+                                if capture.type in variable_type_set:
+                                    add_entry(parser, rda_table, added_identifiers, parent_id, used=capture)
+                elif initializer.type in used_value_types:
+                    add_entry(parser, rda_table, added_identifiers, parent_id, used=initializer)
                 else:
-                    vars_used = recursively_get_children_of_types(
-                        initializer, variable_type + ["field_expression"],
-                        index=parser.index,
-                        check_list=parser.symbol_table["scope_map"]
+                    vars_used, literals_used = get_identifiers_and_literals(
+                        initializer, variable_or_field_types, index, scope_bitmap
                     )
                     for var in vars_used:
-                        add_entry(parser, rda_table, parent_id, used=var)
-                    literals_used = recursively_get_children_of_types(
-                        initializer, literal_types, index=parser.index
-                    )
+                        add_entry(parser, rda_table, added_identifiers, parent_id, used=var)
                     for literal in literals_used:
-                        add_entry(parser, rda_table, parent_id, used=literal)
+                        add_entry(parser, rda_table, added_identifiers, parent_id, used=literal)
 
-        elif root_node.type in declaration_statement:
+        elif node_type in declaration_statement:
             parent_id = get_index(root_node, index)
-            if parent_id is None or parent_id not in CFG_results.graph.nodes:
+            if parent_id is None or parent_id not in cfg_nodes:
                 continue
 
             has_init_declarator = any(
@@ -1204,36 +1419,24 @@ def build_rda_table(parser, CFG_results, lambda_map=None, function_metadata=None
             for child in root_node.named_children:
                 if child.type == "identifier":
                     child_id = get_index(child, index)
-                    if child_id and child_id in parser.symbol_table["scope_map"]:
-                        add_entry(parser, rda_table, parent_id,
+                    if child_id and scope_bitmap[child_id]:
+                        add_entry(parser, rda_table, added_identifiers, parent_id,
                                  defined=child, declaration=True)
                 elif child.type in ["pointer_declarator", "array_declarator", "reference_declarator"]:
                     var_identifier = extract_identifier_from_declarator(child)
                     if var_identifier:
                         var_id = get_index(var_identifier, index)
-                        if var_id and var_id in parser.symbol_table["scope_map"]:
-                            add_entry(parser, rda_table, parent_id,
+                        if var_id and scope_bitmap[var_id]:
+                            add_entry(parser, rda_table, added_identifiers, parent_id,
                                      defined=var_identifier, declaration=True)
 
-        elif root_node.type in assignment:
-            parent_statement = return_first_parent_of_types(
-                root_node, statement_types["node_list_type"]
+        elif node_type in assignment:
+            parent_id = statement_id_of(
+                root_node, index, cfg_nodes, statement_cache
             )
-            if parent_statement is None:
+            if parent_id is None:
                 continue
 
-            parent_id = get_index(parent_statement, index)
-            if parent_id is None or parent_id not in CFG_results.graph.nodes:
-                if parent_statement and parent_statement.type in inner_types_local:
-                    parent_statement = return_first_parent_of_types(
-                        parent_statement, statement_types["node_list_type"]
-                    )
-                    parent_id = get_index(parent_statement, index)
-                elif parent_statement.type in handled_cases:
-                    continue
-                else:
-                    continue
-
             left_node = root_node.child_by_field_name("left")
             right_node = root_node.child_by_field_name("right")
 
@@ -1243,18 +1446,18 @@ def build_rda_table(parser, CFG_results, lambda_map=None, function_metadata=None
             operator_text = extract_operator_text(root_node, left_node, right_node)
 
             if operator_text != "=":
-                add_entry(parser, rda_table, parent_id, used=left_node)
+                add_entry(parser, rda_table, added_identifiers, parent_id, used=left_node)
             else:
                 if left_node.type == "field_expression":
-                    add_entry(parser, rda_table, parent_id, used=left_node)
-                elif left_node.type in variable_type:
+                    add_entry(parser, rda_table, added_identifiers, parent_id, used=left_node)
+                elif left_node.type in variable_type_set:
                     var_type = get_variable_type(parser, left_node)
 
                     if is_class_or_struct_type(parser, var_type) or is_reference_variable(parser, left_node):
-                        add_entry(parser, rda_table, parent_id, used=left_node)
+                        add_entry(parser, rda_table, added_identifiers, parent_id, used=left_node)
                     else:
                         left_node_index = get_index(left_node, index)
-                        if left_node_index and left_node_index in parser.symbol_table["scope_map"]:
+                        if left_node_index and scope_bitmap[left_node_index]:
                             is_init_declarator = False
                             check_parent = root_node.parent
                             while check_parent:
@@ -1266,101 +1469,75 @@ def build_rda_table(parser, CFG_results, lambda_map=None, function_metadata=None
                                 check_parent = check_parent.parent
 
                             if not is_init_declarator:
-                                add_entry(parser, rda_table, parent_id, used=left_node)
+                                add_entry(parser, rda_table, added_identifiers, parent_id, used=left_node)
 
-            add_entry(parser, rda_table, parent_id, defined=left_node)
+            add_entry(parser, rda_table, added_identifiers, parent_id, defined=left_node)
 
-            if right_node.type in variable_type + ["field_expression", "pointer_expression",
-                                                   "subscript_expression", "unary_expression"] + literal_types:
-                add_entry(parser, rda_table, parent_id, used=right_node)
+            if right_node.type in used_value_types:
+                add_entry(parser, rda_table, added_identifiers, parent_id, used=right_node)
             else:
-                vars_used = recursively_get_children_of_types(
-                    right_node, variable_type + ["field_expression"],
-                    index=parser.index,
-                    check_list=parser.symbol_table["scope_map"]
+                vars_used, literals_used = get_identifiers_and_literals(
+                    right_node, variable_or_field_types, index, scope_bitmap
                 )
                 for var in vars_used:
-                    add_entry(parser, rda_table, parent_id, used=var)
-                literals_used = recursively_get_children_of_types(
-                    right_node, literal_types, index=parser.index
-                )
+                    add_entry(parser, rda_table, added_identifiers, parent_id, used=var)
                 for literal in literals_used:
-                    add_entry(parser, rda_table, parent_id, used=literal)
+                    add_entry(parser, rda_table, added_identifiers, parent_id, used=literal)
 
-        elif root_node.type in increment_statement:
-            parent_statement = return_first_parent_of_types(
-                root_node, statement_types["node_list_type"]
+        elif node_type in increment_statement:
+            parent_id = statement_id_of(
+                root_node, index, cfg_nodes, statement_cache
             )
-            if parent_statement is None:
+            if parent_id is None:
                 continue
 
-            parent_id = get_index(parent_statement, index)
-            if parent_id is None or parent_id not in CFG_results.graph.nodes:
-                if parent_statement and parent_statement.type in inner_types_local:
-                    parent_statement = return_first_parent_of_types(
-                        parent_statement, statement_types["node_list_type"]
-                    )
-                    parent_id = get_index(parent_statement, index)
-                elif parent_statement.type in handled_cases:
-                    continue
-                else:
-                    continue
-
-            if root_node.type in variable_type + ["field_expression"]:
-                add_entry(parser, rda_table, parent_id, used=root_node)
-                add_entry(parser, rda_table, parent_id, defined=root_node)
+            if node_type in variable_or_field_types:
+                add_entry(parser, rda_table, added_identifiers, parent_id, used=root_node)
+                add_entry(parser, rda_table, added_identifiers, parent_id, defined=root_node)
             else:
                 identifiers = recursively_get_children_of_types(
-                    root_node, variable_type + ["field_expression"],
-                    index=parser.index,
-                    check_list=parser.symbol_table["scope_map"]
+                    root_node, variable_or_field_types,
+                    index=index,
+                    check_list=scope_bitmap
                 )
                 for identifier in identifiers:
-                    add_entry(parser, rda_table, parent_id, used=identifier)
-                    add_entry(parser, rda_table, parent_id, defined=identifier)
+                    add_entry(parser, rda_table, added_identifiers, parent_id, used=identifier)
+                    add_entry(parser, rda_table, added_identifiers, parent_id, defined=identifier)
 
-        elif root_node.type in function_calls:
-            parent_statement = return_first_parent_of_types(
-                root_node, statement_types["node_list_type"]
+        elif node_type in function_calls:
+            parent_id = statement_id_of(
+                root_node, index, cfg_nodes, statement_cache
             )
-            if parent_statement is None:
+            if parent_id is None:
                 continue
 
-            parent_id = get_index(parent_statement, index)
-            if parent_id is None or parent_id not in CFG_results.graph.nodes:
-                if parent_statement and parent_statement.type in inner_types_local:
-                    parent_statement = return_first_parent_of_types(
-                        parent_statement, statement_types["node_list_type"]
-                    )
-                    parent_id = get_index(parent_statement, index)
-                elif parent_statement.type in handled_cases:
-                    continue
-                else:
-                    continue
-
             function_node = root_node.child_by_field_name("function")
             function_name = None
             method_name_for_lookup = None
 
             if function_node:
-                function_name = st(function_node)
+                function_name = st(function_node, parser)
 
                 if function_node.type == "field_expression":
                     argument = function_node.child_by_field_name("argument")
                     if argument:
-                        add_entry(parser, rda_table, parent_id, used=argument)
+                        add_entry(parser, rda_table, added_identifiers, parent_id, used=argument)
                     field = function_node.child_by_field_name("field")
                     if field:
-                        method_name_for_lookup = st(field)
-                elif function_node.type in variable_type:
-                    add_entry(parser, rda_table, parent_id, used=function_node, method_call=True)
+                        method_name_for_lookup = st(field, parser)
+                elif function_node.type in variable_type_set:
+                    add_entry(parser, rda_table, added_identifiers, parent_id, used=function_node, method_call=True)
                 elif function_node.type == "qualified_identifier":
-                    add_entry(parser, rda_table, parent_id, used=function_node, method_call=True)
+                    add_entry(parser, rda_table, added_identifiers, parent_id, used=function_node, method_call=True)
 
             is_input_function = function_name in input_functions or \
                                (function_name and any(inp in function_name for inp in ["cin", "scanf"]))
 
-            is_variadic_macro = function_name in ["va_start", "va_arg", "va_end"]
+            is_variadic_macro = function_name in variadic_macros
+
+            # the callee's modified pointer parameters, looked up once per call
+            lookup_name = method_name_for_lookup if method_name_for_lookup else function_name
+            modifies_params = modified_params_by_function.get(lookup_name, no_modified_params)
 
             args_node = root_node.child_by_field_name("arguments")
             if args_node:
@@ -1368,31 +1545,31 @@ def build_rda_table(parser, CFG_results, lambda_map=None, function_metadata=None
                 for idx, arg in enumerate(arg_list):
                     if is_variadic_macro:
                         if function_name == "va_start" and idx == 0:
-                            if arg.type in variable_type:
-                                add_entry(parser, rda_table, parent_id, defined=arg, declaration=False, has_initializer=True)
+                            if arg.type in variable_type_set:
+                                add_entry(parser, rda_table, added_identifiers, parent_id, defined=arg, declaration=False, has_initializer=True)
                             else:
                                 identifiers_defined = recursively_get_children_of_types(
-                                    arg, variable_type,
-                                    index=parser.index,
-                                    check_list=parser.symbol_table["scope_map"]
+                                    arg, variable_type_set,
+                                    index=index,
+                                    check_list=scope_bitmap
                                 )
                                 for identifier in identifiers_defined:
-                                    add_entry(parser, rda_table, parent_id, defined=identifier, declaration=False, has_initializer=True)
+                                    add_entry(parser, rda_table, added_identifiers, parent_id, defined=identifier, declaration=False, has_initializer=True)
                             continue
 
                         elif function_name == "va_arg" and idx == 0:
-                            if arg.type in variable_type:
-                                add_entry(parser, rda_table, parent_id, used=arg)
-                                add_entry(parser, rda_table, parent_id, defined=arg, declaration=False)
+                            if arg.type in variable_type_set:
+                                add_entry(parser, rda_table, added_identifiers, parent_id, used=arg)
+                                add_entry(parser, rda_table, added_identifiers, parent_id, defined=arg, declaration=False)
                             else:
                                 identifiers_used = recursively_get_children_of_types(
-                                    arg, variable_type,
-                                    index=parser.index,
-                                    check_list=parser.symbol_table["scope_map"]
+                                    arg, variable_type_set,
+                                    index=index,
+                                    check_list=scope_bitmap
                                 )
                                 for identifier in identifiers_used:
-                                    add_entry(parser, rda_table, parent_id, used=identifier)
-                                    add_entry(parser, rda_table, parent_id, defined=identifier, declaration=False)
+                                    add_entry(parser, rda_table, added_identifiers, parent_id, used=identifier)
+                                    add_entry(parser, rda_table, added_identifiers, parent_id, defined=identifier, declaration=False)
                             continue
 
                     if is_input_function:
@@ -1401,24 +1578,18 @@ def build_rda_table(parser, CFG_results, lambda_map=None, function_metadata=None
                             if has_address_of:
                                 inner_arg = arg.child_by_field_name("argument")
                                 if inner_arg:
-                                    if inner_arg.type in variable_type:
-                                        add_entry(parser, rda_table, parent_id,
+                                    if inner_arg.type in variable_type_set:
+                                        add_entry(parser, rda_table, added_identifiers, parent_id,
                                                  defined=inner_arg, declaration=False)
                                     elif inner_arg.type in ["field_expression", "subscript_expression"]:
-                                        add_entry(parser, rda_table, parent_id,
+                                        add_entry(parser, rda_table, added_identifiers, parent_id,
                                                  defined=inner_arg, declaration=False)
                                 continue
-                        if arg.type in variable_type + ["field_expression"]:
-                            add_entry(parser, rda_table, parent_id, defined=arg, declaration=False)
+                        if arg.type in variable_or_field_types:
+                            add_entry(parser, rda_table, added_identifiers, parent_id, defined=arg, declaration=False)
                             continue
 
                     if not is_input_function and not is_variadic_macro:
-                        modifies_params = set()
-                        lookup_name = method_name_for_lookup if method_name_for_lookup else function_name
-                        if lookup_name and function_metadata and lookup_name in function_metadata:
-                            if pointer_modifications and lookup_name in pointer_modifications:
-                                modifies_params = pointer_modifications[lookup_name]
-
                         is_modified_param = idx in modifies_params
 
                         if is_modified_param:
@@ -1428,69 +1599,64 @@ def build_rda_table(parser, CFG_results, lambda_map=None, function_metadata=None
                                     inner_arg = arg.named_children[0] if arg.named_children else None
 
                                 if inner_arg:
-                                    if inner_arg.type in variable_type:
-                                        add_entry(parser, rda_table, parent_id, used=inner_arg)
-                                        add_entry(parser, rda_table, parent_id,
+                                    if inner_arg.type in variable_type_set:
+                                        add_entry(parser, rda_table, added_identifiers, parent_id, used=inner_arg)
+                                        add_entry(parser, rda_table, added_identifiers, parent_id,
                                                  defined=inner_arg, declaration=False,
                                                  is_pointer_modification_at_call_site=True)
                                     elif inner_arg.type in ["field_expression", "subscript_expression"]:
-                                        add_entry(parser, rda_table, parent_id, used=inner_arg)
-                                        add_entry(parser, rda_table, parent_id,
+                                        add_entry(parser, rda_table, added_identifiers, parent_id, used=inner_arg)
+                                        add_entry(parser, rda_table, added_identifiers, parent_id,
                                                  defined=inner_arg, declaration=False,
                                                  is_pointer_modification_at_call_site=True)
                                         if inner_arg.type == "subscript_expression":
                                             index_expr = inner_arg.child_by_field_name("index")
                                             if index_expr:
                                                 vars_in_index = recursively_get_children_of_types(
-                                                    index_expr, variable_type + ["field_expression"],
-                                                    index=parser.index,
-                                                    check_list=parser.symbol_table["scope_map"]
+                                                    index_expr, variable_or_field_types,
+                                                    index=index,
+                                                    check_list=scope_bitmap
                                                 )
                                                 for var in vars_in_index:
-                                                    add_entry(parser, rda_table, parent_id, used=var)
+                                                    add_entry(parser, rda_table, added_identifiers, parent_id, used=var)
                                 continue
                             elif arg.type == "unary_expression":
                                 has_address_of = any(child.type == "&" for child in arg.children)
                                 if has_address_of:
                                     inner_arg = arg.child_by_field_name("argument")
                                     if inner_arg:
-                                        if inner_arg.type in variable_type:
-                                            add_entry(parser, rda_table, parent_id, used=inner_arg)
-                                            add_entry(parser, rda_table, parent_id,
+                                        if inner_arg.type in variable_type_set:
+                                            add_entry(parser, rda_table, added_identifiers, parent_id, used=inner_arg)
+                                            add_entry(parser, rda_table, added_identifiers, parent_id,
                                                      defined=inner_arg, declaration=False,
                                                      is_pointer_modification_at_call_site=True)
                                         elif inner_arg.type in ["field_expression", "subscript_expression"]:
-                                            add_entry(parser, rda_table, parent_id, used=inner_arg)
-                                            add_entry(parser, rda_table, parent_id,
+                                            add_entry(parser, rda_table, added_identifiers, parent_id, used=inner_arg)
+                                            add_entry(parser, rda_table, added_identifiers, parent_id,
                                                      defined=inner_arg, declaration=False,
                                                      is_pointer_modification_at_call_site=True)
                                     continue
 
-                            elif arg.type in variable_type + ["field_expression"]:
-                                add_entry(parser, rda_table, parent_id, used=arg)
-                                add_entry(parser, rda_table, parent_id, defined=arg, declaration=False,
+                            elif arg.type in variable_or_field_types:
+                                add_entry(parser, rda_table, added_identifiers, parent_id, used=arg)
+                                add_entry(parser, rda_table, added_identifiers, parent_id, defined=arg, declaration=False,
                                          is_pointer_modification_at_call_site=True)
                                 continue
 
-                    if arg.type in variable_type + ["field_expression"]:
-                        add_entry(parser, rda_table, parent_id, used=arg)
-                    elif arg.type in literal_types:
-                        add_entry(parser, rda_table, parent_id, used=arg)
+                    if arg.type in variable_or_field_types:
+                        add_entry(parser, rda_table, added_identifiers, parent_id, used=arg)
+                    elif arg.type in literal_type_set:
+                        add_entry(parser, rda_table, added_identifiers, parent_id, used=arg)
                     else:
-                        identifiers_used = recursively_get_children_of_types(
-                            arg, variable_type + ["field_expression"],
-                            index=parser.index,
-                            check_list=parser.symbol_table["scope_map"]
+                        identifiers_used, literals_used = get_identifiers_and_literals(
+                            arg, variable_or_field_types, index, scope_bitmap
                         )
                         for identifier in identifiers_used:
-                            add_entry(parser, rda_table, parent_id, used=identifier)
-                        literals_used = recursively_get_children_of_types(
-                            arg, literal_types, index=parser.index
-                        )
+                            add_entry(parser, rda_table, added_identifiers, parent_id, used=identifier)
                         for literal in literals_used:
-                            add_entry(parser, rda_table, parent_id, used=literal)
+                            add_entry(parser, rda_table, added_identifiers, parent_id, used=literal)
 
-        elif root_node.type == "function_definition":
+        elif node_type == "function_definition":
             parent_id = get_index(root_node, index)
             if parent_id is None:
                 continue
@@ -1508,25 +1674,18 @@ def build_rda_table(parser, CFG_results, lambda_map=None, function_metadata=None
 
                 if func_declarator and func_declarator.type == "function_declarator":
                     func_name_node = func_declarator.child_by_field_name("declarator")
-                    if func_name_node and func_name_node.type in variable_type:
+                    if func_name_node and func_name_node.type in variable_type_set:
                         func_name_idx = get_index(func_name_node, index)
-                        if func_name_idx and func_name_idx in parser.symbol_table["scope_map"]:
+                        if func_name_idx and scope_bitmap[func_name_idx]:
                             namespace_name = get_namespace_for_node(root_node, parser)
 
                             if namespace_name:
-                                qualified_name = f"{namespace_name}::{st(func_name_node)}"
-                                class PseudoNode:
-                                    def __init__(self, name, real_node):
-                                        self.type = "qualified_function"
-                                        self.text = name.encode('utf-8')
-                                        self.qualified_name = name
-                                        self.parent = real_node.parent if real_node else None
-                                        self.real_node = real_node
+                                qualified_name = f"{namespace_name}::{st(func_name_node, parser)}"
                                 pseudo_node = PseudoNode(qualified_name, func_name_node)
-                                add_entry(parser, rda_table, parent_id,
+                                add_entry(parser, rda_table, added_identifiers, parent_id,
                                          defined=pseudo_node, declaration=True)
                             else:
-                                add_entry(parser, rda_table, parent_id,
+                                add_entry(parser, rda_table, added_identifiers, parent_id,
                                          defined=func_name_node, declaration=True)
 
                     param_list = func_declarator.child_by_field_name('parameters')
@@ -1535,190 +1694,162 @@ def build_rda_table(parser, CFG_results, lambda_map=None, function_metadata=None
                             if param.type in ["parameter_declaration", "optional_parameter_declaration"]:
                                 param_id = extract_param_identifier(param)
                                 if param_id:
-                                    add_entry(parser, rda_table, parent_id,
+                                    add_entry(parser, rda_table, added_identifiers, parent_id,
                                             defined=param_id, declaration=True, has_initializer=True)
 
-        elif root_node.type == "if_statement":
+        elif node_type == "if_statement":
             parent_id = get_index(root_node, index)
-            if parent_id is None or parent_id not in CFG_results.graph.nodes:
+            if parent_id is None or parent_id not in cfg_nodes:
                 continue
 
             condition = root_node.child_by_field_name("condition")
             if condition:
                 identifiers_used = recursively_get_children_of_types(
-                    condition, variable_type + ["field_expression"],
-                    index=parser.index,
-                    check_list=parser.symbol_table["scope_map"]
+                    condition, variable_or_field_types,
+                    index=index,
+                    check_list=scope_bitmap
                 )
                 for identifier in identifiers_used:
-                    add_entry(parser, rda_table, parent_id, used=identifier)
+                    add_entry(parser, rda_table, added_identifiers, parent_id, used=identifier)
 
-        elif root_node.type == "while_statement":
+        elif node_type == "while_statement":
             parent_id = get_index(root_node, index)
-            if parent_id is None or parent_id not in CFG_results.graph.nodes:
+            if parent_id is None or parent_id not in cfg_nodes:
                 continue
 
             condition = root_node.child_by_field_name("condition")
             if condition:
                 identifiers_used = recursively_get_children_of_types(
-                    condition, variable_type + ["field_expression"],
-                    index=parser.index,
-                    check_list=parser.symbol_table["scope_map"]
+                    condition, variable_or_field_types,
+                    index=index,
+                    check_list=scope_bitmap
                 )
                 for identifier in identifiers_used:
-                    add_entry(parser, rda_table, parent_id, used=identifier)
+                    add_entry(parser, rda_table, added_identifiers, parent_id, used=identifier)
 
-        elif root_node.type == "for_statement":
+        elif node_type == "for_statement":
             parent_id = get_index(root_node, index)
-            if parent_id is None or parent_id not in CFG_results.graph.nodes:
+            if parent_id is None or parent_id not in cfg_nodes:
                 continue
 
             condition = root_node.child_by_field_name("condition")
             if condition:
                 identifiers_used = recursively_get_children_of_types(
-                    condition, variable_type + ["field_expression"],
-                    index=parser.index,
-                    check_list=parser.symbol_table["scope_map"]
+                    condition, variable_or_field_types,
+                    index=index,
+                    check_list=scope_bitmap
                 )
                 for identifier in identifiers_used:
-                    add_entry(parser, rda_table, parent_id, used=identifier)
+                    add_entry(parser, rda_table, added_identifiers, parent_id, used=identifier)
 
-        elif root_node.type == "for_range_loop":
+        elif node_type == "for_range_loop":
             parent_id = get_index(root_node, index)
-            if parent_id is None or parent_id not in CFG_results.graph.nodes:
+            if parent_id is None or parent_id not in cfg_nodes:
                 continue
 
             declarator = root_node.child_by_field_name("declarator")
             if declarator:
                 var_id = extract_identifier_from_declarator(declarator)
                 if var_id:
-                    add_entry(parser, rda_table, parent_id, defined=var_id, declaration=True)
+                    add_entry(parser, rda_table, added_identifiers, parent_id, defined=var_id, declaration=True)
 
             range_expr = root_node.child_by_field_name("right")
             if range_expr:
-                if range_expr.type in variable_type + ["field_expression"]:
-                    add_entry(parser, rda_table, parent_id, used=range_expr)
+                if range_expr.type in variable_or_field_types:
+                    add_entry(parser, rda_table, added_identifiers, parent_id, used=range_expr)
                 else:
                     identifiers_used = recursively_get_children_of_types(
-                        range_expr, variable_type + ["field_expression"],
-                        index=parser.index,
-                        check_list=parser.symbol_table["scope_map"]
+                        range_expr, variable_or_field_types,
+                        index=index,
+                        check_list=scope_bitmap
                     )
                     for identifier in identifiers_used:
-                        add_entry(parser, rda_table, parent_id, used=identifier)
+                        add_entry(parser, rda_table, added_identifiers, parent_id, used=identifier)
 
-        elif root_node.type == "do_statement":
+        elif node_type == "do_statement":
             pass
 
-        elif (root_node.type == "parenthesized_expression" and
+        elif (node_type == "parenthesized_expression" and
               root_node.parent is not None and
               root_node.parent.type == "do_statement"):
             parent_id = get_index(root_node, index)
-            if parent_id is None or parent_id not in CFG_results.graph.nodes:
+            if parent_id is None or parent_id not in cfg_nodes:
                 continue
 
             identifiers_used = recursively_get_children_of_types(
-                root_node, variable_type + ["field_expression"],
-                index=parser.index,
-                check_list=parser.symbol_table["scope_map"]
+                root_node, variable_or_field_types,
+                index=index,
+                check_list=scope_bitmap
             )
             for identifier in identifiers_used:
-                add_entry(parser, rda_table, parent_id, used=identifier)
+                add_entry(parser, rda_table, added_identifiers, parent_id, used=identifier)
 
-        elif root_node.type == "switch_statement":
+        elif node_type == "switch_statement":
             parent_id = get_index(root_node, index)
-            if parent_id is None or parent_id not in CFG_results.graph.nodes:
+            if parent_id is None or parent_id not in cfg_nodes:
                 continue
 
             condition = root_node.child_by_field_name("condition")
             if condition:
                 identifiers_used = recursively_get_children_of_types(
-                    condition, variable_type + ["field_expression"],
-                    index=parser.index,
-                    check_list=parser.symbol_table["scope_map"]
+                    condition, variable_or_field_types,
+                    index=index,
+                    check_list=scope_bitmap
                 )
                 for identifier in identifiers_used:
-                    add_entry(parser, rda_table, parent_id, used=identifier)
+                    add_entry(parser, rda_table, added_identifiers, parent_id, used=identifier)
 
-        elif root_node.type == "conditional_expression":
-            parent_statement = return_first_parent_of_types(
-                root_node, statement_types["node_list_type"]
+        elif node_type == "conditional_expression":
+            parent_id = statement_id_of(
+                root_node, index, cfg_nodes, statement_cache
             )
-            if parent_statement is None:
+            if parent_id is None:
                 continue
 
-            parent_id = get_index(parent_statement, index)
-            if parent_id is None or parent_id not in CFG_results.graph.nodes:
-                if parent_statement and parent_statement.type in inner_types_local:
-                    parent_statement = return_first_parent_of_types(
-                        parent_statement, statement_types["node_list_type"]
-                    )
-                    parent_id = get_index(parent_statement, index)
-                elif parent_statement.type in handled_cases:
-                    continue
-                else:
-                    continue
-
             condition = root_node.child_by_field_name("condition")
             if condition:
-                if condition.type in variable_type + ["field_expression", "pointer_expression",
-                                                     "subscript_expression", "unary_expression"] + literal_types:
-                    add_entry(parser, rda_table, parent_id, used=condition)
+                if condition.type in used_value_types:
+                    add_entry(parser, rda_table, added_identifiers, parent_id, used=condition)
                 else:
-                    identifiers_used = recursively_get_children_of_types(
-                        condition, variable_type + ["field_expression"],
-                        index=parser.index,
-                        check_list=parser.symbol_table["scope_map"]
+                    identifiers_used, literals_used = get_identifiers_and_literals(
+                        condition, variable_or_field_types, index, scope_bitmap
                     )
                     for identifier in identifiers_used:
-                        add_entry(parser, rda_table, parent_id, used=identifier)
-                    literals_used = recursively_get_children_of_types(
-                        condition, literal_types, index=parser.index
-                    )
+                        add_entry(parser, rda_table, added_identifiers, parent_id, used=identifier)
                     for literal in literals_used:
-                        add_entry(parser, rda_table, parent_id, used=literal)
+                        add_entry(parser, rda_table, added_identifiers, parent_id, used=literal)
 
             consequence = root_node.child_by_field_name("consequence")
             if consequence:
-                if consequence.type in variable_type + ["field_expression"]:
-                    add_entry(parser, rda_table, parent_id, used=consequence)
-                elif consequence.type in literal_types:
-                    add_entry(parser, rda_table, parent_id, used=consequence)
+                if consequence.type in variable_or_field_types:
+                    add_entry(parser, rda_table, added_identifiers, parent_id, used=consequence)
+                elif consequence.type in literal_type_set:
+                    add_entry(parser, rda_table, added_identifiers, parent_id, used=consequence)
                 else:
-                    identifiers_used = recursively_get_children_of_types(
-                        consequence, variable_type + ["field_expression"],
-                        index=parser.index,
-                        check_list=parser.symbol_table["scope_map"]
+                    identifiers_used, literals_used = get_identifiers_and_literals(
+                        consequence, variable_or_field_types, index, scope_bitmap
                     )
                     for identifier in identifiers_used:
-                        add_entry(parser, rda_table, parent_id, used=identifier)
-                    literals_used = recursively_get_children_of_types(
-                        consequence, literal_types, index=parser.index
-                    )
+                        add_entry(parser, rda_table, added_identifiers, parent_id, used=identifier)
                     for literal in literals_used:
-                        add_entry(parser, rda_table, parent_id, used=literal)
+                        add_entry(parser, rda_table, added_identifiers, parent_id, used=literal)
 
             alternative = root_node.child_by_field_name("alternative")
             if alternative:
-                if alternative.type in variable_type + ["field_expression"]:
-                    add_entry(parser, rda_table, parent_id, used=alternative)
-                elif alternative.type in literal_types:
-                    add_entry(parser, rda_table, parent_id, used=alternative)
+                if alternative.type in variable_or_field_types:
+                    add_entry(parser, rda_table, added_identifiers, parent_id, used=alternative)
+                elif alternative.type in literal_type_set:
+                    add_entry(parser, rda_table, added_identifiers, parent_id, used=alternative)
                 else:
-                    identifiers_used = recursively_get_children_of_types(
-                        alternative, variable_type + ["field_expression"],
-                        index=parser.index,
-                        check_list=parser.symbol_table["scope_map"]
+                    identifiers_used, literals_used = get_identifiers_and_literals(
+                        alternative, variable_or_field_types, index, scope_bitmap
                     )
                     for identifier in identifiers_used:
-                        add_entry(parser, rda_table, parent_id, used=identifier)
-                    literals_used = recursively_get_children_of_types(
-                        alternative, literal_types, index=parser.index
-                    )
+                        add_entry(parser, rda_table, added_identifiers, parent_id, used=identifier)
                     for literal in literals_used:
-                        add_entry(parser, rda_table, parent_id, used=literal)
+                        add_entry(parser, rda_table, added_identifiers, parent_id, used=literal)
 
-        elif root_node.type == "lambda_expression":
+        elif node_type == "lambda_expression":
             parent_id = get_index(root_node, index)
             if parent_id is None:
                 continue
@@ -1726,10 +1857,10 @@ def build_rda_table(parser, CFG_results, lambda_map=None, function_metadata=None
             for child in root_node.children:
                 if child.type == "lambda_capture_specifier":
                     for capture in child.named_children:
-                        if capture.type in variable_type:
-                            add_entry(parser, rda_table, parent_id, used=capture)
+                        if capture.type in variable_type_set:
+                            add_entry(parser, rda_table, added_identifiers, parent_id, used=capture)
 
-        elif root_node.type == "catch_clause":
+        elif node_type == "catch_clause":
             parent_id = get_index(root_node, index)
             if parent_id is None:
                 continue
@@ -1740,54 +1871,38 @@ def build_rda_table(parser, CFG_results, lambda_map=None, function_metadata=None
                         if param.type == "parameter_declaration":
                             param_id = extract_param_identifier(param)
                             if param_id:
-                                add_entry(parser, rda_table, parent_id,
+                                add_entry(parser, rda_table, added_identifiers, parent_id,
                                         defined=param_id, declaration=True)
 
-        elif root_node.type == "throw_statement":
+        elif node_type == "throw_statement":
             parent_id = get_index(root_node, index)
             if parent_id is None:
                 continue
 
             identifiers_used = recursively_get_children_of_types(
-                root_node, variable_type + ["field_expression"],
-                index=parser.index,
-                check_list=parser.symbol_table["scope_map"]
+                root_node, variable_or_field_types,
+                index=index,
+                check_list=scope_bitmap
             )
             for identifier in identifiers_used:
-                add_entry(parser, rda_table, parent_id, used=identifier)
+                add_entry(parser, rda_table, added_identifiers, parent_id, used=identifier)
 
         else:
-            if root_node.type not in variable_type:
+            if node_type not in variable_type_set:
                 continue
 
-            in_do_while_condition = False
-            temp_parent = root_node.parent
-            while temp_parent is not None:
-                if (temp_parent.type == "parenthesized_expression" and
-                    temp_parent.parent is not None and
-                    temp_parent.parent.type == "do_statement"):
-                    in_do_while_condition = True
-                    break
-                temp_parent = temp_parent.parent
-
-            if in_do_while_condition:
+            if in_do_while_condition(root_node, condition_cache):
                 continue
 
-            handled_types_local = (def_statement + assignment + increment_statement +
-                                  function_calls + declaration_statement +
-                                  ["return_statement", "catch_clause", "throw_statement",
-                                   "conditional_expression"])
             parent_statement = return_first_parent_of_types(
-                root_node,
-                statement_types["non_control_statement"] + statement_types["control_statement"],
-                stop_types=statement_types.get("statement_holders", []) + handled_types_local
+                root_node, parent_statement_types, stop_types=parent_stop_types
             )
 
             if parent_statement is None:
                 continue
 
             parent_id = get_index(parent_statement, index)
-            if parent_id is None or parent_id not in CFG_results.graph.nodes:
+            if parent_id is None or parent_id not in cfg_nodes:
                 continue
 
             if parent_statement.type in declaration_statement:
@@ -1797,86 +1912,148 @@ def build_rda_table(parser, CFG_results, lambda_map=None, function_metadata=None
             if immediate_parent and immediate_parent.type == "pointer_expression":
                 continue
 
-            add_entry(parser, rda_table, parent_id, used=root_node)
+            add_entry(parser, rda_table, added_identifiers, parent_id, used=root_node)
 
     return rda_table
 
 
 def start_rda(index, rda_table, cfg_graph, pre_solve=False):
-    graph = copy.deepcopy(cfg_graph)
-    if pre_solve:
-        remove_edges = []
-        for edge in graph.edges:
-            edge_data = graph.edges[edge]
-            if "label" in edge_data and edge_data["label"] in \
-               ["method_call", "method_return", "class_return", "constructor_call"]:
-                remove_edges.append(edge)
-        graph.remove_edges_from(remove_edges)
+    # Only the predecessor lists are needed, so read them straight off
+    # cfg_graph (leaving out the call/return edges when pre_solve is set)
+    # instead of deep-copying the graph and removing those edges
+    ignored_labels = frozenset(["method_call", "method_return", "class_return", "constructor_call"]) if pre_solve else frozenset()
+
+    nodes = list(cfg_graph.nodes)
+    position = {node: i for i, node in enumerate(nodes)}
+    # Per-statement inputs of the transfer function, kept in flat lists
+    # aligned with nodes and built once
+    predecessors = [[position[s] for (s, t, label) in cfg_graph.in_edges(node, data="label")
+                     if label not in ignored_labels]
+                    for node in nodes]
+    successors = [[] for _ in nodes]
+    for i, node_predecessors in enumerate(predecessors):
+        for pred in node_predecessors:
+            successors[pred].append(i)
+    defs = [rda_table[node]["def"] if node in rda_table else {} for node in nodes]
+
+    # Every definition gets one bit, so IN/OUT are plain ints and the
+    # transfer function is a few big-int operations carried out in C:
+    #   OUT = (IN & ~KILL) | GEN
+    # KILL[s] holds every definition of a name s defines, GEN[s] its own.
+    all_defs = []
+    bit_of = {}
+    name_masks = {}
+    gen_masks = []
+    for def_info in defs:
+        gen = 0
+        for definition in def_info:
+            bit = bit_of.get(definition)
+            if bit is None:
+                bit = bit_of[definition] = 1 << len(all_defs)
+                all_defs.append(definition)
+                name_masks[definition.name] = name_masks.get(definition.name, 0) | bit
+            gen |= bit
+        gen_masks.append(gen)
+    keep_masks = []
+    for def_info in defs:
+        kill = 0
+        for name in {definition.name for definition in def_info}:
+            kill |= name_masks[name]
+        keep_masks.append(~kill)
+
+    in_masks = [0] * len(nodes)
+    out_masks = [0] * len(nodes)
+
+    # Worklist: every statement is evaluated once, after which a statement is
+    # only revisited when the OUT set of one of its predecessors changed
+    worklist = deque(range(len(nodes)))
+    queued = [True] * len(nodes)
+    updates = 0
+
+    while worklist:
+        i = worklist.popleft()
+        queued[i] = False
+        updates += 1
+
+        in_mask = 0
+        for pred in predecessors[i]:
+            in_mask |= out_masks[pred]
+        in_masks[i] = in_mask
+
+        out_mask = (in_mask & keep_masks[i]) | gen_masks[i]
+        if out_mask != out_masks[i]:
+            out_masks[i] = out_mask
+            for succ in successors[i]:
+                if not queued[succ]:
+                    queued[succ] = True
+                    worklist.append(succ)
 
-    cfg = graph
-    nodes = graph.nodes
+    if debug:
+        logger.info("RDA: Converged after {} statement updates", updates)
+
+    def definitions_in(mask):
+        result = set()
+        while mask:
+            low = mask & -mask
+            result.add(all_defs[low.bit_length() - 1])
+            mask ^= low
+        return result
 
-    old_result = {}
-    for node in nodes:
-        old_result[node] = {"IN": set(), "OUT": set()}
+    return {node: {"IN": definitions_in(in_masks[i]), "OUT": definitions_in(out_masks[i])}
+            for i, node in enumerate(nodes)}
 
-    new_result = copy.deepcopy(old_result)
-    iteration = 0
 
-    while True:
-        iteration += 1
+def has_matching_edge(final_graph, source, target, attrib):
+    """Whether a source -> target edge with the same used_def, edge_type and dataflow_type exists"""
+    used_def = attrib.get('used_def', None)
+    edge_type = attrib.get('edge_type', None)
+    dataflow_type = attrib.get('dataflow_type', None)
 
-        for node in nodes:
-            predecessors = [s for (s, t) in cfg.in_edges(node)]
+    # only the parallel source -> target edges can be duplicates
+    parallel_edges = final_graph.get_edge_data(source, target) or {}
+    for data in parallel_edges.values():
+        if (data.get('used_def') == used_def and
+            data.get('edge_type') == edge_type and
+            data.get('dataflow_type') == dataflow_type):
+            return True
+    return False
 
-            in_set = set()
-            for pred in predecessors:
-                in_set = in_set.union(old_result[pred]["OUT"])
 
-            new_result[node]["IN"] = in_set
+def add_edge(final_graph, source, target, attrib=None):
+    if attrib is not None and has_matching_edge(final_graph, source, target, attrib):
+        return
 
-            def_info = rda_table[node]["def"] if node in rda_table else set()
-            names_defined = [d.name for d in def_info]
+    edge_key = final_graph.add_edge(source, target)
+    if attrib is not None:
+        final_graph[source][target][edge_key].update(attrib)
 
-            surviving_defs = set()
-            for incoming_def in in_set:
-                if incoming_def.name not in names_defined:
-                    surviving_defs.add(incoming_def)
 
-            new_result[node]["OUT"] = surviving_defs.union(def_info)
+def queue_edge(pending_edges, source, target, attrib):
+    """
+    add_edge for a graph whose edges are all added at the end: an edge is
+    recorded under add_edge's duplicate key, and the first one queued wins.
+    """
+    key = (source, target, attrib.get('used_def'), attrib.get('edge_type'),
+           attrib.get('dataflow_type'))
+    if key not in pending_edges:
+        pending_edges[key] = (source, target, attrib)
 
-        ddiff = DeepDiff(old_result, new_result, ignore_order=True)
-        if ddiff == {}:
-            if debug:
-                logger.info("RDA: Converged in {} iterations", iteration)
-            break
 
-        old_result = copy.deepcopy(new_result)
+def add_queued_edges(final_graph, pending_edges):
+    """
+    Add queued edges to a graph that may already have edges, in one call,
+    leaving out the ones add_edge would have skipped as duplicates.
+    """
+    final_graph.add_edges_from([
+        (source, target, attrib) for source, target, attrib in pending_edges.values()
+        if not has_matching_edge(final_graph, source, target, attrib)
+    ])
 
-    return new_result
 
-
-def add_edge(final_graph, source, target, attrib=None):
-    if attrib is not None:
-        used_def = attrib.get('used_def', None)
-        edge_type = attrib.get('edge_type', None)
-        dataflow_type = attrib.get('dataflow_type', None)
-
-        for u, v, k, data in final_graph.edges(keys=True, data=True):
-            if (u == source and v == target and
-                data.get('used_def') == used_def and
-                data.get('edge_type') == edge_type and
-                data.get('dataflow_type') == dataflow_type):
-                return
-
-    final_graph.add_edge(source, target)
-    if attrib is not None:
-        edge_keys = [k for u, v, k in final_graph.edges(keys=True) if u == source and v == target]
-        if edge_keys:
-            edge_key = max(edge_keys)
-        else:
-            edge_key = 0
-        nx.set_edge_attributes(final_graph, {(source, target, edge_key): attrib})
+@lru_cache(maxsize=4096)
+def name_root(name):
+    """Object part of a field access name ("s.a.b" -> "s"), cached per name"""
+    return name.split(".", 1)[0]
 
 
 def name_match_with_fields(use_name, def_name):
@@ -1884,21 +2061,48 @@ def name_match_with_fields(use_name, def_name):
         return True
 
     if "." in use_name:
-        base_obj = use_name.split(".")[0]
-        if def_name == base_obj:
+        if def_name == name_root(use_name):
             return True
 
     return False
 
 
-def get_required_edges_from_def_to_use(index, cfg, rda_solution, rda_table,
+def get_required_edges_from_def_to_use(reverse_index, cfg, rda_solution, rda_table,
                                        graph_nodes, processed_edges, properties, lambda_map=None, node_list=None, parser=None):
     if lambda_map is None:
         lambda_map = {}
     if node_list is None:
         node_list = {}
-    final_graph = copy.deepcopy(cfg)
-    final_graph.remove_edges_from(list(final_graph.edges()))
+    # same kind of graph with the CFG's nodes but none of its edges; the
+    # node attribute dicts are copied, their values are plain strings
+    final_graph = cfg.__class__()
+    final_graph.graph.update(cfg.graph)
+    final_graph.add_nodes_from((node, dict(data)) for node, data in cfg.nodes(data=True))
+    # edges are deduplicated as they are found and added in one call at the end
+    pending_edges = {}
+
+    # The fallbacks for unsatisfied uses look definitions up by name, and
+    # the function-return fallback needs every return statement and every
+    # function definition; gather all three once instead of rescanning
+    # graph_nodes for each use.
+    defs_by_name = {}
+    return_uses = []
+    function_defs = []
+    for def_node in graph_nodes:
+        def_node_type = read_index(reverse_index, def_node)[-1] if def_node in reverse_index else None
+        if def_node_type == "return_statement" and def_node in rda_table and rda_table[def_node].get("use"):
+            for ret_use in rda_table[def_node]["use"]:
+                if ret_use.scope and ret_use.line:
+                    return_uses.append((def_node, ret_use.scope, ret_use.line))
+                break
+        if def_node not in rda_table:
+            continue
+        for definition in rda_table[def_node]["def"]:
+            defs_by_name.setdefault(definition.name, []).append((def_node, definition))
+            if def_node_type == "function_definition":
+                other_scope = definition.scope
+                other_namespace = other_scope[:-1] if len(other_scope) > 1 else other_scope
+                function_defs.append((def_node, other_namespace, definition.line))
 
     for node in graph_nodes:
         if node not in rda_table:
@@ -1933,13 +2137,13 @@ def get_required_edges_from_def_to_use(index, cfg, rda_solution, rda_table,
 
             if defines_same_var:
                 if matching_defs:
-                    node_key = read_index(index, node) if node in index.values() else None
+                    node_key = read_index(reverse_index, node) if node in reverse_index else None
                     ast_node = node_list.get(node_key) if node_list and node_key else None
 
                     has_loop_carried_def = any(d.line == node for d in matching_defs)
 
                     if has_loop_carried_def and ast_node and is_node_inside_loop(ast_node):
-                        add_edge(final_graph, node, node,
+                        queue_edge(pending_edges, node, node,
                                {'dataflow_type': 'loop_carried',
                                 'edge_type': 'DFG_edge',
                                 'color': '#FFA500',
@@ -1949,7 +2153,7 @@ def get_required_edges_from_def_to_use(index, cfg, rda_solution, rda_table,
                         if getattr(available_def, 'is_pointer_modification_at_call_site', False):
                             continue
                         if available_def.line != node:
-                            add_edge(final_graph, available_def.line, node,
+                            queue_edge(pending_edges, available_def.line, node,
                                    {'dataflow_type': 'comesFrom',
                                     'edge_type': 'DFG_edge',
                                     'color': '#00A3FF',
@@ -1960,7 +2164,7 @@ def get_required_edges_from_def_to_use(index, cfg, rda_solution, rda_table,
                     if getattr(available_def, 'is_pointer_modification_at_call_site', False):
                         continue
                     if available_def.line != node:
-                        add_edge(final_graph, available_def.line, node,
+                        queue_edge(pending_edges, available_def.line, node,
                                {'dataflow_type': 'comesFrom',
                                 'edge_type': 'DFG_edge',
                                 'color': '#00A3FF',
@@ -1969,163 +2173,103 @@ def get_required_edges_from_def_to_use(index, cfg, rda_solution, rda_table,
                 if matching_defs:
                     used.satisfied = True
             elif matching_field_defs:
+                # already filtered on name_match_with_fields and scope_check
                 for available_def in matching_field_defs:
-                    if name_match_with_fields(used.name, available_def.name):
-                        if scope_check(available_def.scope, used.variable_scope):
-                            if available_def.line != node:
-                                add_edge(final_graph, available_def.line, node,
-                                       {'dataflow_type': 'comesFrom',
-                                        'edge_type': 'DFG_edge',
-                                        'color': '#00A3FF',
-                                        'used_def': used.name})
-                            used.satisfied = True
+                    if available_def.line != node:
+                        queue_edge(pending_edges, available_def.line, node,
+                               {'dataflow_type': 'comesFrom',
+                                'edge_type': 'DFG_edge',
+                                'color': '#00A3FF',
+                                'used_def': used.name})
+                    used.satisfied = True
 
             if not used.satisfied:
-                for def_node in graph_nodes:
-                    if def_node not in rda_table:
+                finished_node = None
+                for def_node, definition in defs_by_name.get(used.name, ()):
+                    if def_node == finished_node:
                         continue
-                    for definition in rda_table[def_node]["def"]:
-                        names_match = False
-
-                        if definition.name == used.name:
-                            names_match = True
-                        else:
-                            def_base = definition.name.split("::")[-1] if "::" in definition.name else definition.name
-                            used_base = used.name.split("::")[-1] if "::" in used.name else used.name
-
-                            if def_base == used_base:
-                                if "::" in used.name:
-                                    names_match = (definition.name == used.name)
-                                else:
-                                    names_match = False
-
-                        if names_match:
-                            node_type = read_index(index, def_node)[-1] if def_node in index.values() else None
-                            if node_type == "function_definition":
-                                func_scope = definition.scope
-                                func_line = definition.line
-                                namespace_scope = func_scope[:-1] if len(func_scope) > 1 else func_scope
-
-                                return_nodes = []
-
-                                for rnode in graph_nodes:
-                                    rnode_type = read_index(index, rnode)[-1] if rnode in index.values() else None
-                                    if rnode_type == "return_statement":
-                                        has_return_value = False
-                                        return_scope = None
-                                        return_line = None
-
-                                        if rnode in rda_table and rda_table[rnode].get("use"):
-                                            for ret_use in rda_table[rnode]["use"]:
-                                                return_scope = ret_use.scope
-                                                return_line = ret_use.line
-                                                has_return_value = True
-                                                break
-
-                                        if has_return_value and return_scope and return_line:
-                                            namespace_matches = (len(return_scope) == len(namespace_scope) and
-                                                               all(return_scope[i] == namespace_scope[i]
-                                                                   for i in range(len(namespace_scope))))
-
-                                            if namespace_matches and return_line > func_line:
-                                                is_in_this_function = True
-
-                                                next_func_line = float('inf')
-                                                for other_node in graph_nodes:
-                                                    other_type = read_index(index, other_node)[-1] if other_node in index.values() else None
-                                                    if other_type == "function_definition" and other_node != def_node:
-                                                        if other_node in rda_table:
-                                                            for other_def in rda_table[other_node].get("def", []):
-                                                                other_scope = other_def.scope
-                                                                other_line = other_def.line
-                                                                other_namespace = other_scope[:-1] if len(other_scope) > 1 else other_scope
-                                                                if (other_namespace == namespace_scope and
-                                                                    other_line > func_line and
-                                                                    other_line < next_func_line):
-                                                                    next_func_line = other_line
-
-                                                if return_line < next_func_line:
-                                                    return_nodes.append(rnode)
-
-                                if return_nodes:
-                                    for ret_node in return_nodes:
-                                        if ret_node != node:
-                                            add_edge(final_graph, ret_node, node,
-                                                   {'dataflow_type': 'comesFrom',
-                                                    'edge_type': 'DFG_edge',
-                                                    'color': '#00A3FF',
-                                                    'used_def': used.name})
-                                    used.satisfied = True
-                                    break
+                    node_type = read_index(reverse_index, def_node)[-1] if def_node in reverse_index else None
+                    if node_type == "function_definition":
+                        func_scope = definition.scope
+                        func_line = definition.line
+                        namespace_scope = func_scope[:-1] if len(func_scope) > 1 else func_scope
+
+                        next_func_line = float('inf')
+                        for other_node, other_namespace, other_line in function_defs:
+                            if (other_node != def_node and
+                                other_namespace == namespace_scope and
+                                other_line > func_line and
+                                other_line < next_func_line):
+                                next_func_line = other_line
+
+                        return_nodes = []
+                        for rnode, return_scope, return_line in return_uses:
+                            namespace_matches = (len(return_scope) == len(namespace_scope) and
+                                               all(return_scope[i] == namespace_scope[i]
+                                                   for i in range(len(namespace_scope))))
+
+                            if namespace_matches and func_line < return_line < next_func_line:
+                                return_nodes.append(rnode)
+
+                        if return_nodes:
+                            for ret_node in return_nodes:
+                                if ret_node != node:
+                                    queue_edge(pending_edges, ret_node, node,
+                                           {'dataflow_type': 'comesFrom',
+                                            'edge_type': 'DFG_edge',
+                                            'color': '#00A3FF',
+                                            'used_def': used.name})
+                            used.satisfied = True
+                            finished_node = def_node
 
             if not used.satisfied:
-                for def_node in graph_nodes:
-                    if def_node not in rda_table:
-                        continue
-                    for definition in rda_table[def_node]["def"]:
-                        if definition.name == used.name:
-                            if definition.scope == [0] and scope_check(definition.scope, used.scope):
-                                if definition.line != node:
-                                    add_edge(final_graph, definition.line, node,
-                                           {'dataflow_type': 'comesFrom',
-                                        'edge_type': 'DFG_edge',
-                                        'color': '#00A3FF',
-                                        'used_def': used.name})
-                                used.satisfied = True
-                                break
-                    if used.satisfied:
+                for def_node, definition in defs_by_name.get(used.name, ()):
+                    if definition.scope == [0] and scope_check(definition.scope, used.scope):
+                        if definition.line != node:
+                            queue_edge(pending_edges, definition.line, node,
+                                   {'dataflow_type': 'comesFrom',
+                                    'edge_type': 'DFG_edge',
+                                    'color': '#00A3FF',
+                                    'used_def': used.name})
+                        used.satisfied = True
                         break
 
             if not used.satisfied and "::" in used.name:
                 qualified_parts = used.name.split("::")
                 var_name = qualified_parts[-1]
 
-                for def_node in graph_nodes:
-                    if def_node not in rda_table:
-                        continue
-                    for definition in rda_table[def_node]["def"]:
-                        if definition.name == var_name:
-                            if len(definition.scope) >= 2:
-                                if definition.line != node:
-                                    add_edge(final_graph, definition.line, node,
-                                           {'dataflow_type': 'comesFrom',
-                                            'edge_type': 'DFG_edge',
-                                            'color': '#00A3FF',
-                                            'used_def': used.name})
-                                used.satisfied = True
-                                break
-                    if used.satisfied:
+                for def_node, definition in defs_by_name.get(var_name, ()):
+                    if len(definition.scope) >= 2:
+                        if definition.line != node:
+                            queue_edge(pending_edges, definition.line, node,
+                                   {'dataflow_type': 'comesFrom',
+                                    'edge_type': 'DFG_edge',
+                                    'color': '#00A3FF',
+                                    'used_def': used.name})
+                        used.satisfied = True
                         break
 
             if not used.satisfied:
-                for def_node in graph_nodes:
-                    if def_node not in rda_table:
-                        continue
-                    for definition in rda_table[def_node]["def"]:
-                        if definition.name == used.name:
-                            if len(definition.scope) >= 2 and len(used.scope) >= 2:
-                                if definition.scope[0] == used.scope[0] and definition.scope[1] == used.scope[1]:
-                                    if definition.line != node:
-                                        add_edge(final_graph, definition.line, node,
-                                               {'dataflow_type': 'comesFrom',
-                                                'edge_type': 'DFG_edge',
-                                                'color': '#00A3FF',
-                                                'used_def': used.name})
-                                    used.satisfied = True
-                                    break
-                    if used.satisfied:
-                        break
+                for def_node, definition in defs_by_name.get(used.name, ()):
+                    if len(definition.scope) >= 2 and len(used.scope) >= 2:
+                        if definition.scope[0] == used.scope[0] and definition.scope[1] == used.scope[1]:
+                            if definition.line != node:
+                                queue_edge(pending_edges, definition.line, node,
+                                       {'dataflow_type': 'comesFrom',
+                                        'edge_type': 'DFG_edge',
+                                        'color': '#00A3FF',
+                                        'used_def': used.name})
+                            used.satisfied = True
+                            break
 
-        if properties.get("last_def", False):
+        # the statement's own type decides the whole loop, so test it first
+        if (properties.get("last_def", False) and
+                read_index(reverse_index, node)[-1] not in last_def_ignore_types):
             killed_defs = rda_solution[node]["IN"] - rda_solution[node]["OUT"]
             for killed_def in killed_defs:
-                node_type = read_index(index, node)[-1]
-                def_node_type = read_index(index, killed_def.line)[-1]
-                ignore_types = ['for_statement', 'for_range_loop', 'while_statement',
-                               'if_statement', 'switch_statement']
-                if node_type not in ignore_types and \
-                   def_node_type not in ignore_types:
-                    add_edge(final_graph, killed_def.line, node,
+                def_node_type = read_index(reverse_index, killed_def.line)[-1]
+                if def_node_type not in last_def_ignore_types:
+                    queue_edge(pending_edges, killed_def.line, node,
                            {'color': 'orange', 'dataflow_type': 'lastDef'})
 
     for edge in processed_edges:
@@ -2135,7 +2279,7 @@ def get_required_edges_from_def_to_use(index, cfg, rda_solution, rda_table,
             label = edge_data.get("label", "")
 
             if label == "constructor_call":
-                source_node = node_list.get(read_index(index, edge[0]))
+                source_node = node_list.get(read_index(reverse_index, edge[0]))
                 obj_name = "this"
                 if source_node and source_node.type == "declaration":
                     for child in source_node.named_children:
@@ -2143,39 +2287,39 @@ def get_required_edges_from_def_to_use(index, cfg, rda_solution, rda_table,
                             if child.type == "init_declarator":
                                 decl = child.child_by_field_name("declarator")
                                 if decl and decl.type == "identifier":
-                                    obj_name = st(decl)
+                                    obj_name = st(decl, parser)
                             elif child.type == "identifier":
-                                obj_name = st(child)
+                                obj_name = st(child, parser)
 
-                add_edge(final_graph, edge[0], edge[1],
+                queue_edge(pending_edges, edge[0], edge[1],
                        {'dataflow_type': 'constructor_call',
                         'edge_type': 'DFG_edge',
                         'color': '#FF6B6B',
                         'object_name': obj_name})
 
             elif label == "base_constructor_call":
-                add_edge(final_graph, edge[0], edge[1],
+                queue_edge(pending_edges, edge[0], edge[1],
                        {'dataflow_type': 'base_constructor_call',
                         'edge_type': 'DFG_edge',
                         'color': '#FF6B6B',
                         'object_name': 'this'})
 
             elif label == "scope_exit_destructor":
-                add_edge(final_graph, edge[0], edge[1],
+                queue_edge(pending_edges, edge[0], edge[1],
                        {'dataflow_type': 'destructor_call',
                         'edge_type': 'DFG_edge',
                         'color': '#C44569',
                         'object_name': 'this'})
 
             elif label == "base_destructor_call":
-                add_edge(final_graph, edge[0], edge[1],
+                queue_edge(pending_edges, edge[0], edge[1],
                        {'dataflow_type': 'base_destructor_call',
                         'edge_type': 'DFG_edge',
                         'color': '#C44569',
                         'object_name': 'this'})
 
             elif label == "virtual_call":
-                source_node = node_list.get(read_index(index, edge[0]))
+                source_node = node_list.get(read_index(reverse_index, edge[0]))
                 obj_name = "this"
 
                 if source_node and source_node.type == "expression_statement":
@@ -2185,9 +2329,9 @@ def get_required_edges_from_def_to_use(index, cfg, rda_solution, rda_table,
                         if func_node and func_node.type == "field_expression":
                             arg_node = func_node.child_by_field_name("argument")
                             if arg_node:
-                                obj_name = st(arg_node)
+                                obj_name = st(arg_node, parser)
 
-                add_edge(final_graph, edge[0], edge[1],
+                queue_edge(pending_edges, edge[0], edge[1],
                        {'dataflow_type': 'virtual_dispatch',
                         'edge_type': 'DFG_edge',
                         'color': '#4834DF',
@@ -2198,7 +2342,7 @@ def get_required_edges_from_def_to_use(index, cfg, rda_solution, rda_table,
 
             else:
                 if label in ["method_return", "function_return"]:
-                    add_edge(final_graph, edge[0], edge[1],
+                    queue_edge(pending_edges, edge[0], edge[1],
                            {'dataflow_type': 'parameter',
                             'edge_type': 'DFG_edge'})
 
@@ -2215,8 +2359,8 @@ def get_required_edges_from_def_to_use(index, cfg, rda_solution, rda_table,
                 continue
             params = rda_table[func_def_node].get("def", [])
 
-            node_type = read_index(index, func_def_node)[-1] if func_def_node in index.values() else None
-            actual_params = params[1:] if node_type == "function_definition" and params else params
+            node_type = read_index(reverse_index, func_def_node)[-1] if func_def_node in reverse_index else None
+            actual_params = list(params)[1:] if node_type == "function_definition" and params else params
 
             for used_var in uses:
                 if not isinstance(used_var, Identifier):
@@ -2244,7 +2388,7 @@ def get_required_edges_from_def_to_use(index, cfg, rda_solution, rda_table,
                 if not used_var.method_call:
                     continue
 
-                node_type = read_index(index, node)[-1] if node in index.values() else None
+                node_type = read_index(reverse_index, node)[-1] if node in reverse_index else None
 
                 reaching_defs = rda_solution[node]["IN"]
                 for def_var in reaching_defs:
@@ -2259,7 +2403,7 @@ def get_required_edges_from_def_to_use(index, cfg, rda_solution, rda_table,
                         lambda_info = lambda_map[lambda_var]
 
                         for body_node in lambda_info["body_nodes"]:
-                            add_edge(final_graph, node, body_node,
+                            queue_edge(pending_edges, node, body_node,
                                    {'dataflow_type': 'lambda_call',
                                     'edge_type': 'DFG_edge',
                                     'color': '#FF6B6B',
@@ -2268,29 +2412,34 @@ def get_required_edges_from_def_to_use(index, cfg, rda_solution, rda_table,
                                 logger.info(f"Added lambda call edge: {node} -> {body_node} "
                                           f"(calling lambda {lambda_var})")
 
+    final_graph.add_edges_from(pending_edges.values())
     return final_graph
 
 
 def rda_cfg_map(rda_solution, CFG_results):
     """Create debug graph showing RDA info on CFG edges"""
-    graph = copy.deepcopy(CFG_results.graph)
+    # Graph.copy() gives every edge its own attribute dict, which is all
+    # the rda_info annotation below needs
+    graph = CFG_results.graph.copy()
 
-    for edge in list(graph.edges):
+    unused_edges = []
+    for edge in graph.edges:
         out_set = rda_solution[edge[0]]["OUT"]
         in_set = rda_solution[edge[1]]["IN"]
 
-        intersection = [d for d in out_set if d in in_set]
-
-        if intersection:
-            edge_data = graph.get_edge_data(*edge)
-            edge_data['rda_info'] = ",".join([str(d) for d in intersection])
+        # isdisjoint settles most edges in C; the shared definitions are
+        # still listed in out_set order so rda_info reads the same
+        if out_set.isdisjoint(in_set):
+            unused_edges.append(edge)
         else:
-            graph.remove_edge(*edge)
+            edge_data = graph.get_edge_data(*edge)
+            edge_data['rda_info'] = ",".join([str(d) for d in out_set if d in in_set])
 
+    graph.remove_edges_from(unused_edges)
     return graph
 
 
-def collect_call_site_information(parser, function_metadata, cfg_graph):
+def collect_call_site_information(parser, function_metadata, cfg_graph, statement_cache):
     """
     Collect information about function call sites for interprocedural analysis.
 
@@ -2310,78 +2459,80 @@ def collect_call_site_information(parser, function_metadata, cfg_graph):
     """
     call_sites = []
     index = parser.index
+    # only calls to these can pass anything by reference
+    by_ref_functions = {name for name, meta in function_metadata.items()
+                        if any(is_pointer or is_reference
+                               for _, is_pointer, is_reference, _ in meta["params"])}
+
+    for node in parser.nodes_of_types(("call_expression",)):
+        function_name = None
+        func_node = node.child_by_field_name("function")
+        if func_node:
+            if func_node.type == "identifier":
+                function_name = st(func_node, parser)
+            elif func_node.type == "qualified_identifier":
+                function_name = st(func_node, parser)
+            elif func_node.type == "field_expression":
+                field_node = func_node.child_by_field_name("field")
+                if field_node and field_node.type == "field_identifier":
+                    function_name = st(field_node, parser)
+
+        if not function_name or function_name not in by_ref_functions:
+            continue
 
-    for node in traverse_tree(parser.tree.root_node):
-        if node.type == "call_expression":
-            function_name = None
-            func_node = node.child_by_field_name("function")
-            if func_node:
-                if func_node.type == "identifier":
-                    function_name = st(func_node)
-                elif func_node.type == "qualified_identifier":
-                    function_name = st(func_node)
-                elif func_node.type == "field_expression":
-                    field_node = func_node.child_by_field_name("field")
-                    if field_node and field_node.type == "field_identifier":
-                        function_name = st(field_node)
-
-            if not function_name or function_name not in function_metadata:
-                continue
-
-            parent_statement = return_first_parent_of_types(
-                node, statement_types["node_list_type"]
-            )
-            if not parent_statement:
-                continue
+        parent_statement = first_statement_of(node, statement_cache)
+        if not parent_statement:
+            continue
 
-            call_site_id = get_index(parent_statement, index)
-            if call_site_id is None or call_site_id not in cfg_graph.nodes:
-                continue
+        call_site_id = get_index(parent_statement, index)
+        if call_site_id is None or call_site_id not in cfg_graph.nodes:
+            continue
 
-            pass_by_ref_args = []
-            args_node = node.child_by_field_name("arguments")
-            if args_node:
-                func_params = function_metadata[function_name]["params"]
+        pass_by_ref_args = []
+        args_node = node.child_by_field_name("arguments")
+        if args_node:
+            func_params = function_metadata[function_name]["params"]
 
-                for arg_idx, arg in enumerate(args_node.named_children):
-                    if arg_idx < len(func_params):
-                        param_name, is_pointer, is_reference, param_idx = func_params[arg_idx]
+            for arg_idx, (arg, (param_name, is_pointer, is_reference, param_idx)) in enumerate(
+                    zip(args_node.named_children, func_params)):
+                if not (is_pointer or is_reference):
+                    continue
 
-                        if is_pointer or is_reference:
-                            if arg.type == "pointer_expression":
-                                has_ampersand = False
-                                arg_node = None
-                                for arg_child in arg.children:
-                                    if arg_child.type == "&":
-                                        has_ampersand = True
-                                    elif arg_child.is_named:
-                                        arg_node = arg_child
-
-                                if has_ampersand and arg_node:
-                                    if arg_node.type in ["identifier", "this"]:
-                                        var_name = st(arg_node)
-                                        pass_by_ref_args.append((arg_idx, var_name, arg_node))
-                            elif is_reference and arg.type in ["identifier", "this"]:
-                                var_name = st(arg)
-                                pass_by_ref_args.append((arg_idx, var_name, arg))
-                            elif is_pointer and arg.type in ["identifier", "this"]:
-                                var_name = st(arg)
-                                arg_index = get_index(arg, index)
-                                if arg_index and arg_index in parser.symbol_table["scope_map"]:
-                                    pass_by_ref_args.append((arg_idx, var_name, arg))
-
-            if pass_by_ref_args:
-                call_sites.append({
-                    "call_site_node": node,
-                    "call_site_id": call_site_id,
-                    "function_name": function_name,
-                    "pass_by_ref_args": pass_by_ref_args
-                })
+                if arg.type == "pointer_expression":
+                    has_ampersand = False
+                    arg_node = None
+                    for arg_child in arg.children:
+                        if arg_child.type == "&":
+                            has_ampersand = True
+                        elif arg_child.is_named:
+                            arg_node = arg_child
+
+                    if has_ampersand and arg_node:
+                        if arg_node.type in ["identifier", "this"]:
+                            var_name = st(arg_node, parser)
+                            pass_by_ref_args.append((arg_idx, var_name, arg_node))
+                elif is_reference and arg.type in ["identifier", "this"]:
+                    var_name = st(arg, parser)
+                    pass_by_ref_args.append((arg_idx, var_name, arg))
+                elif is_pointer and arg.type in ["identifier", "this"]:
+                    var_name = st(arg, parser)
+                    arg_index = get_index(arg, index)
+                    if arg_index and parser.scope_bitmap[arg_index]:
+                        pass_by_ref_args.append((arg_idx, var_name, arg))
+
+        if pass_by_ref_args:
+            call_sites.append({
+                "call_site_node": node,
+                "call_site_id": call_site_id,
+                "function_name": function_name,
+                "pass_by_ref_args": pass_by_ref_args
+            })
 
     return call_sites
 
 
-def find_modification_sites(parser, function_metadata_by_id, pointer_modifications):
+def find_modification_sites(parser, function_metadata_by_id, pointer_modifications,
+                            statement_cache):
     """
     Find all modification sites for pointer/reference parameters inside functions.
 
@@ -2391,19 +2542,19 @@ def find_modification_sites(parser, function_metadata_by_id, pointer_modificatio
         parser: C++ parser
         function_metadata_by_id: Dict mapping func_def_id -> metadata (from collect_function_metadata)
         pointer_modifications: Dict mapping func_name -> set of modified param indices
+        statement_cache: Memo for first_statement_of, shared with collect_call_site_information
 
     Returns:
         Tuple of:
-        - modification_sites_by_name: Dict mapping function_name -> list of (param_idx, modification_node, statement_id)
-        - modification_sites_by_id: Dict mapping func_def_id -> list of (param_idx, modification_node, statement_id)
+        - modification_sites_by_name: Dict mapping function_name -> {param_idx: [(modification_node, statement_id), ...]}
+        - modification_sites_by_id: Dict mapping func_def_id -> {param_idx: [(modification_node, statement_id), ...]}
     """
     modification_sites_by_name = {}
     modification_sites_by_id = {}
     index = parser.index
 
     for func_def_id, meta in function_metadata_by_id.items():
-        modifications = []
-        func_node = meta["node"]
+        modifications = {}
         func_name = meta.get("func_name", "")
         modified_params = pointer_modifications.get(func_name, set())
 
@@ -2418,7 +2569,10 @@ def find_modification_sites(parser, function_metadata_by_id, pointer_modificatio
             modification_sites_by_id[func_def_id] = modifications
             continue
 
-        for node in traverse_tree(func_node):
+        # keyed by the raw bytes so node.text is compared without decoding it
+        param_idx_by_text = {name.encode(): idx for name, idx in param_name_to_idx.items()}
+
+        for node in meta["write_sites"]:
             modification_param_idx = None
             mod_node = None
 
@@ -2428,23 +2582,23 @@ def find_modification_sites(parser, function_metadata_by_id, pointer_modificatio
                     if left.type == "pointer_expression":
                         arg = left.child_by_field_name("argument")
                         if arg and arg.type in ["identifier", "this"]:
-                            var_name = st(arg)
-                            if var_name in param_name_to_idx:
-                                modification_param_idx = param_name_to_idx[var_name]
+                            text_idx = param_idx_by_text.get(arg.text)
+                            if text_idx is not None:
+                                modification_param_idx = text_idx
                                 mod_node = node
 
                     elif left.type == "subscript_expression":
                         array_arg = left.child_by_field_name("argument")
                         if array_arg and array_arg.type in ["identifier", "this"]:
-                            var_name = st(array_arg)
-                            if var_name in param_name_to_idx:
-                                modification_param_idx = param_name_to_idx[var_name]
+                            text_idx = param_idx_by_text.get(array_arg.text)
+                            if text_idx is not None:
+                                modification_param_idx = text_idx
                                 mod_node = node
 
                     elif left.type in ["identifier", "this"]:
-                        var_name = st(left)
-                        if var_name in param_name_to_idx:
-                            modification_param_idx = param_name_to_idx[var_name]
+                        text_idx = param_idx_by_text.get(left.text)
+                        if text_idx is not None:
+                            modification_param_idx = text_idx
                             mod_node = node
 
             elif node.type == "update_expression":
@@ -2458,31 +2612,31 @@ def find_modification_sites(parser, function_metadata_by_id, pointer_modificatio
                     if arg.type == "pointer_expression":
                         inner_arg = arg.child_by_field_name("argument")
                         if inner_arg and inner_arg.type in ["identifier", "this"]:
-                            var_name = st(inner_arg)
-                            if var_name in param_name_to_idx:
-                                modification_param_idx = param_name_to_idx[var_name]
+                            text_idx = param_idx_by_text.get(inner_arg.text)
+                            if text_idx is not None:
+                                modification_param_idx = text_idx
                                 mod_node = node
                     elif arg.type == "subscript_expression":
                         array_arg = arg.child_by_field_name("argument")
                         if array_arg and array_arg.type in ["identifier", "this"]:
-                            var_name = st(array_arg)
-                            if var_name in param_name_to_idx:
-                                modification_param_idx = param_name_to_idx[var_name]
+                            text_idx = param_idx_by_text.get(array_arg.text)
+                            if text_idx is not None:
+                                modification_param_idx = text_idx
                                 mod_node = node
                     elif arg.type in ["identifier", "this"]:
-                        var_name = st(arg)
-                        if var_name in param_name_to_idx:
-                            modification_param_idx = param_name_to_idx[var_name]
+                        text_idx = param_idx_by_text.get(arg.text)
+                        if text_idx is not None:
+                            modification_param_idx = text_idx
                             mod_node = node
 
             if modification_param_idx is not None and mod_node is not None:
-                parent_statement = return_first_parent_of_types(
-                    mod_node, statement_types["node_list_type"]
-                )
+                parent_statement = first_statement_of(mod_node, statement_cache)
                 if parent_statement:
                     statement_id = get_index(parent_statement, index)
                     if statement_id is not None:
-                        modifications.append((modification_param_idx, mod_node, statement_id))
+                        modifications.setdefault(modification_param_idx, []).append(
+                            (mod_node, statement_id)
+                        )
 
         if func_name:
             modification_sites_by_name[func_name] = modifications
@@ -2522,6 +2676,50 @@ def get_cfg_call_targets(cfg_graph, call_site_id):
     return target_func_ids
 
 
+def uses_reached_from(call_site_id, var_name, cfg_graph, rda_table, names_cache,
+                      successors_cache):
+    """
+    Statements after call_site_id that use var_name, found by walking the CFG
+    until a statement uses var_name without redefining it.
+    names_cache maps a statement id to the (use names, def names) of its RDA entry,
+    successors_cache maps it to a tuple of its CFG successors.
+    """
+    successors = []
+    visited = set()
+    queue = deque([call_site_id])
+
+    while queue:
+        current = queue.popleft()
+        if current in visited:
+            continue
+        visited.add(current)
+
+        uses_var = False
+        defines_var = False
+        if current != call_site_id and current in rda_table:
+            names = names_cache.get(current)
+            if names is None:
+                entry = rda_table[current]
+                names = ({used.name for used in entry["use"]},
+                         {defined.name for defined in entry["def"]})
+                names_cache[current] = names
+            if var_name in names[0]:
+                uses_var = True
+                successors.append(current)
+            defines_var = var_name in names[1]
+
+        if current == call_site_id or not uses_var or defines_var:
+            successors_of_current = successors_cache.get(current)
+            if successors_of_current is None:
+                successors_of_current = tuple(cfg_graph.successors(current))
+                successors_cache[current] = successors_of_current
+            for successor in successors_of_current:
+                if successor not in visited:
+                    queue.append(successor)
+
+    return successors
+
+
 def add_interprocedural_edges(final_graph, parser, call_sites, modification_sites_by_id,
                                function_metadata, cfg_graph, rda_table):
     """
@@ -2538,12 +2736,18 @@ def add_interprocedural_edges(final_graph, parser, call_sites, modification_site
         final_graph: The DFG graph to add edges to
         parser: C++ parser
         call_sites: List of call site information from collect_call_site_information()
-        modification_sites_by_id: Dict mapping func_def_id -> list of modifications
+        modification_sites_by_id: Dict mapping func_def_id -> {param_idx: [(node, statement_id), ...]}
         function_metadata: Dict from collect_function_metadata()
         cfg_graph: Control flow graph (contains virtual dispatch resolution)
         rda_table: RDA table with def/use information
     """
     index = parser.index
+    # the uses reached from a call site depend only on the call site and the variable
+    reached_uses = {}
+    names_cache = {}
+    successors_cache = {}
+    # edges are deduplicated as they are found and added in one call at the end
+    pending_edges = {}
 
     for call_site_info in call_sites:
         call_site_id = call_site_info["call_site_id"]
@@ -2559,10 +2763,9 @@ def add_interprocedural_edges(final_graph, parser, call_sites, modification_site
             all_param_mods = []
 
             for func_def_id in target_func_ids:
-                mods = modification_sites_by_id.get(func_def_id, [])
-                for mod_param_idx, mod_node, mod_statement_id in mods:
-                    if mod_param_idx == arg_idx:
-                        all_param_mods.append((mod_param_idx, mod_node, mod_statement_id, func_def_id))
+                mods = modification_sites_by_id.get(func_def_id, {}).get(arg_idx, ())
+                for mod_node, mod_statement_id in mods:
+                    all_param_mods.append((arg_idx, mod_node, mod_statement_id, func_def_id))
 
             if not all_param_mods:
                 continue
@@ -2576,10 +2779,10 @@ def add_interprocedural_edges(final_graph, parser, call_sites, modification_site
                              if f_id == func_def_id and m_idx == mod_param_idx]
 
                 visited_in_func = set()
-                queue_in_func = [mod_statement_id]
+                queue_in_func = deque([mod_statement_id])
 
                 while queue_in_func:
-                    current = queue_in_func.pop(0)
+                    current = queue_in_func.popleft()
                     if current in visited_in_func:
                         continue
                     visited_in_func.add(current)
@@ -2611,42 +2814,19 @@ def add_interprocedural_edges(final_graph, parser, call_sites, modification_site
                     reaching_mods.append((mod_param_idx, mod_node, mod_statement_id))
 
             for mod_param_idx, mod_node, mod_statement_id in reaching_mods:
-                successors = []
-                visited = set()
-                queue = [call_site_id]
-
-                while queue:
-                    current = queue.pop(0)
-                    if current in visited:
-                        continue
-                    visited.add(current)
-
-                    uses_var = False
-                    defines_var = False
-                    if current != call_site_id and current in rda_table:
-                        for used in rda_table[current]["use"]:
-                            if used.name == var_name:
-                                uses_var = True
-                                successors.append(current)
-                                break
-
-                        for defined in rda_table[current]["def"]:
-                            if defined.name == var_name:
-                                defines_var = True
-                                break
-
-                    if current == call_site_id or not uses_var or (uses_var and defines_var):
-                        for edge in cfg_graph.out_edges(current):
-                            if edge[1] not in visited:
-                                queue.append(edge[1])
+                reach_key = (call_site_id, var_name)
+                successors = reached_uses.get(reach_key)
+                if successors is None:
+                    successors = uses_reached_from(call_site_id, var_name, cfg_graph,
+                                                   rda_table, names_cache, successors_cache)
+                    reached_uses[reach_key] = successors
 
                 for use_site in successors:
-                    add_edge(final_graph, mod_statement_id, use_site,
-                           {'dataflow_type': 'comesFrom',
-                            'edge_type': 'DFG_edge',
-                            'color': '#00A3FF',
-                            'used_def': var_name,
-                            'interprocedural': 'modification_to_use'})
+                    queue_edge(pending_edges, mod_statement_id, use_site,
+                               dict(interprocedural_edge_attrib, used_def=var_name,
+                                    interprocedural='modification_to_use'))
+
+    add_queued_edges(final_graph, pending_edges)
 
 
 def add_argument_parameter_edges(final_graph, parser, cfg_graph, rda_table):
@@ -2664,7 +2844,7 @@ def add_argument_parameter_edges(final_graph, parser, cfg_graph, rda_table):
         cfg_graph: Control flow graph with function_call edges
         rda_table: RDA table with def/use information
     """
-    index = parser.index
+    reverse_index = parser.reverse_index
     node_list = {(node.start_point, node.end_point, node.type): node
                  for node in traverse_tree(parser.tree, [])}
 
@@ -2682,8 +2862,8 @@ def add_argument_parameter_edges(final_graph, parser, cfg_graph, rda_table):
                 call_site_id = edge[0]
                 func_def_id = edge[1]
 
-                call_site_node = node_list.get(read_index(index, call_site_id))
-                func_def_node = node_list.get(read_index(index, func_def_id))
+                call_site_node = node_list.get(read_index(reverse_index, call_site_id))
+                func_def_node = node_list.get(read_index(reverse_index, func_def_id))
 
                 if not (call_site_node and func_def_node):
                     continue
@@ -2784,6 +2964,7 @@ def add_method_member_access_edges(final_graph, parser, cfg_graph, rda_table):
         rda_table: RDA table with def/use information
     """
     index = parser.index
+    reverse_index = parser.reverse_index
     node_list = {(node.start_point, node.end_point, node.type): node
                  for node in traverse_tree(parser.tree, [])}
 
@@ -2798,8 +2979,8 @@ def add_method_member_access_edges(final_graph, parser, cfg_graph, rda_table):
                 call_site_id = edge[0]
                 method_def_id = edge[1]
 
-                call_site_node = node_list.get(read_index(index, call_site_id))
-                method_def_node = node_list.get(read_index(index, method_def_id))
+                call_site_node = node_list.get(read_index(reverse_index, call_site_id))
+                method_def_node = node_list.get(read_index(reverse_index, method_def_id))
 
                 if not (call_site_node and method_def_node):
                     continue
@@ -2849,7 +3030,7 @@ def add_method_member_access_edges(final_graph, parser, cfg_graph, rda_table):
                     parent = parent.parent
 
                 for node_id in cfg_graph.nodes:
-                    node_key = read_index(index, node_id) if node_id in index.values() else None
+                    node_key = read_index(reverse_index, node_id) if node_id in reverse_index else None
                     if not node_key:
                         continue
                     ast_node = node_list.get(node_key)
@@ -2874,7 +3055,7 @@ def add_method_member_access_edges(final_graph, parser, cfg_graph, rda_table):
                                     field_accesses.append((node_id, used.core))
 
 
-def add_function_return_edges(final_graph, parser, cfg_graph, rda_table):
+def add_function_return_edges(final_graph, parser, cfg_graph, rda_table, return_used_cache):
     """
     Add interprocedural DFG edges for function return values.
 
@@ -2889,8 +3070,9 @@ def add_function_return_edges(final_graph, parser, cfg_graph, rda_table):
         parser: C++ parser
         cfg_graph: Control flow graph with function_return/method_return edges
         rda_table: RDA table with def/use information
+        return_used_cache: is_return_value_used answers for this run
     """
-    index = parser.index
+    reverse_index = parser.reverse_index
     node_list = {(node.start_point, node.end_point, node.type): node
                  for node in traverse_tree(parser.tree, [])}
 
@@ -2904,8 +3086,8 @@ def add_function_return_edges(final_graph, parser, cfg_graph, rda_table):
                 return_node_id = edge[0]
                 call_site_id = edge[1]
 
-                return_statement = node_list.get(read_index(index, return_node_id))
-                call_site_node = node_list.get(read_index(index, call_site_id))
+                return_statement = node_list.get(read_index(reverse_index, return_node_id))
+                call_site_node = node_list.get(read_index(reverse_index, call_site_id))
 
                 if not (return_statement and call_site_node):
                     continue
@@ -2913,7 +3095,7 @@ def add_function_return_edges(final_graph, parser, cfg_graph, rda_table):
                 if return_statement.type != "return_statement" or not return_statement.named_children:
                     continue
 
-                if not is_return_value_used(call_site_node):
+                if not is_return_value_used(call_site_node, return_used_cache):
                     continue
 
                 returned_vars = []
@@ -2956,10 +3138,15 @@ def dfg_cpp(properties, CFG_results):
         (final_graph, debug_graph, rda_table, rda_solution)
     """
     parser = CFG_results.parser
+    # byte-per-index membership tables for the scope and method lookups
+    parser.scope_bitmap = parser.index_bitmap(parser.symbol_table["scope_map"])
+    parser.method_bitmap = parser.index_bitmap(parser.method_map)
     index = parser.index
+    reverse_index = parser.reverse_index
     tree = parser.tree
 
-    cfg_graph = copy.deepcopy(CFG_results.graph)
+    # only read from here on, so the driver's graph is used without a copy
+    cfg_graph = CFG_results.graph
     node_list = CFG_results.node_list
 
     cfg_records = CFG_results.CFG.records if hasattr(CFG_results, 'CFG') and hasattr(CFG_results.CFG, 'records') else {}
@@ -2967,6 +3154,8 @@ def dfg_cpp(properties, CFG_results):
 
     implicit_return_to_destructor = {ir_id: fn_id for fn_id, ir_id in implicit_return_map.items()}
 
+    # call site (start_byte, end_byte, type) -> is_return_value_used result
+    return_used_cache = {}
     processed_edges = []
 
     called_destructors = set()
@@ -3011,8 +3200,8 @@ def dfg_cpp(properties, CFG_results):
             label = edge_data.get("label", "")
 
             if label.startswith("function_call|"):
-                call_statement = node_list.get(read_index(index, edge[0]))
-                function_def = node_list.get(read_index(index, edge[1]))
+                call_statement = node_list.get(read_index(reverse_index, edge[0]))
+                function_def = node_list.get(read_index(reverse_index, edge[1]))
 
                 if call_statement and function_def:
                     if function_def.type == "function_definition":
@@ -3023,12 +3212,12 @@ def dfg_cpp(properties, CFG_results):
                                 processed_edges.append(edge)
 
             elif label in ["method_return", "function_return"]:
-                return_statement = node_list.get(read_index(index, edge[0]))
-                call_site_node = node_list.get(read_index(index, edge[1]))
+                return_statement = node_list.get(read_index(reverse_index, edge[0]))
+                call_site_node = node_list.get(read_index(reverse_index, edge[1]))
 
                 if return_statement and return_statement.type == "return_statement":
                     if return_statement.named_children:
-                        if call_site_node and is_return_value_used(call_site_node):
+                        if call_site_node and is_return_value_used(call_site_node, return_used_cache):
                             processed_edges.append(edge)
 
             elif label == "constructor_call":
@@ -3059,7 +3248,18 @@ def dfg_cpp(properties, CFG_results):
     pointer_modifications = analyze_pointer_modifications(parser, function_metadata_by_name)
 
     start_rda_init_time = time.time()
-    rda_table = build_rda_table(parser, CFG_results, lambda_map, function_metadata_by_name, pointer_modifications)
+    # The table is a pure function of the source and the CFG; with
+    # rda_cache_dir set it is reused across runs from a content-hashed pickle
+    rda_table = None
+    rda_cache_dir = properties.get("rda_cache_dir")
+    if rda_cache_dir:
+        rda_cache_file = rda_cache_path(rda_cache_dir, parser.src_language,
+                                        parser.src_code, CFG_results.graph)
+        rda_table = load_rda_table(rda_cache_file)
+    if rda_table is None:
+        rda_table = build_rda_table(parser, CFG_results, lambda_map, function_metadata_by_name, pointer_modifications)
+        if rda_cache_dir:
+            store_rda_table(rda_cache_file, rda_table)
     end_rda_init_time = time.time()
 
     start_rda_time = time.time()
@@ -3067,18 +3267,25 @@ def dfg_cpp(properties, CFG_results):
     end_rda_time = time.time()
 
     final_graph = get_required_edges_from_def_to_use(
-        index, cfg_graph, rda_solution, rda_table,
+        reverse_index, cfg_graph, rda_solution, rda_table,
         cfg_graph.nodes, processed_edges, properties, lambda_map, node_list, parser
     )
 
-    call_sites = collect_call_site_information(parser, function_metadata_by_name, cfg_graph)
-    modification_sites_by_name, modification_sites_by_id = find_modification_sites(parser, function_metadata_by_id, pointer_modifications)
-    add_interprocedural_edges(final_graph, parser, call_sites, modification_sites_by_id,
-                               function_metadata_by_name, cfg_graph, rda_table)
+    # enclosing statements, shared by the two interprocedural passes
+    statement_cache = {}
+    modification_sites_by_name, modification_sites_by_id = find_modification_sites(
+        parser, function_metadata_by_id, pointer_modifications, statement_cache
+    )
+    # call sites only produce edges from modifications inside the callee
+    if any(modification_sites_by_id.values()):
+        call_sites = collect_call_site_information(parser, function_metadata_by_name, cfg_graph,
+                                                   statement_cache)
+        add_interprocedural_edges(final_graph, parser, call_sites, modification_sites_by_id,
+                                   function_metadata_by_name, cfg_graph, rda_table)
 
     add_argument_parameter_edges(final_graph, parser, cfg_graph, rda_table)
 
-    add_function_return_edges(final_graph, parser, cfg_graph, rda_table)
+    add_function_return_edges(final_graph, parser, cfg_graph, rda_table, return_used_cache)
 
     add_method_member_access_edges(final_graph, parser, cfg_graph, rda_table)
 
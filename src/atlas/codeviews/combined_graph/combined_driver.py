@@ -1,4 +1,5 @@
 import os
+from itertools import chain
 
 import networkx as nx
 
@@ -22,20 +23,21 @@ class CombinedDriver:
         self.codeviews = codeviews
         self.graph = nx.MultiDiGraph()
         self.results = {}
+        needed = self.needed_views()
 
-        if self.codeviews["DFG"]["exists"] == True:
+        if "DFG" in needed:
             self.results["DFG"] = DFGDriver(
                 self.src_language, self.src_code, "", self.codeviews
             )
             self.DFG = self.results["DFG"].graph
 
-        if self.codeviews["AST"]["exists"] == True:
+        if "AST" in needed:
             self.results["AST"] = ASTDriver(
                 self.src_language, self.src_code, "", self.codeviews["AST"]
             )
             self.AST = self.results["AST"].graph
 
-        if self.codeviews["CFG"]["exists"] == True:
+        if "CFG" in needed:
             self.results["CFG"] = CFGDriver(
                 self.src_language, self.src_code, "", self.codeviews["CFG"]
             )
@@ -56,6 +58,20 @@ class CombinedDriver:
     def get_graph(self):
         return self.graph
 
+    def needed_views(self):
+        """
+        Codeviews whose graphs combine() will use; the other drivers are not
+        built. An AST and DFG pair with different collapsed settings combines
+        to an empty graph, so it needs neither.
+        """
+        exists = {view for view in ("AST", "CFG", "DFG")
+                  if self.codeviews[view]["exists"] == True}
+        if exists == {"AST", "DFG"}:
+            collapsed = (self.codeviews["AST"]["collapsed"], self.codeviews["DFG"]["collapsed"])
+            if collapsed != (False, False) and collapsed != (True, True):
+                return set()
+        return exists
+
     def check_validity(self):
         """Write logic for valid combinations here"""
         return True
@@ -75,37 +91,33 @@ class CombinedDriver:
     def AST_collapsed(self):
         self.graph = self.AST
 
+    def combine_graphs(self, *graphs):
+        """
+        Add the nodes, then the edges, of each graph to self.graph in order.
+        Edges are added as (u, v, data) so parallel edges from different
+        views get their own keys instead of overwriting each other.
+        """
+        self.graph.add_nodes_from(
+            chain.from_iterable(graph.nodes(data=True) for graph in graphs)
+        )
+        self.graph.add_edges_from(
+            chain.from_iterable(graph.edges(data=True) for graph in graphs)
+        )
+
     def combine_AST_DFG_simple(self):
-        self.graph.add_nodes_from(self.AST.nodes(data=True))
-        self.graph.add_nodes_from(self.DFG.nodes(data=True))
-        self.graph.add_edges_from(self.AST.edges(data=True))
-        self.graph.add_edges_from(self.DFG.edges(data=True))
+        self.combine_graphs(self.AST, self.DFG)
 
     def combine_CFG_DFG_simple(self):
-        self.graph.add_nodes_from(self.CFG.nodes(data=True))
-        self.graph.add_nodes_from(self.DFG.nodes(data=True))
-        self.graph.add_edges_from(self.CFG.edges(data=True))
-        self.graph.add_edges_from(self.DFG.edges(data=True))
+        self.combine_graphs(self.CFG, self.DFG)
 
     def combine_AST_CFG_simple(self):
-        self.graph.add_nodes_from(self.AST.nodes(data=True))
-        self.graph.add_nodes_from(self.CFG.nodes(data=True))
-        self.graph.add_edges_from(self.AST.edges(data=True))
-        self.graph.add_edges_from(self.CFG.edges(data=True))
+        self.combine_graphs(self.AST, self.CFG)
 
     def combine_AST_CFG_DFG_simple(self):
-        self.graph.add_nodes_from(self.AST.nodes(data=True))
-        self.graph.add_nodes_from(self.CFG.nodes(data=True))
-        self.graph.add_nodes_from(self.DFG.nodes(data=True))
-        self.graph.add_edges_from(self.AST.edges(data=True))
-        self.graph.add_edges_from(self.CFG.edges(data=True))
-        self.graph.add_edges_from(self.DFG.edges(data=True))
+        self.combine_graphs(self.AST, self.CFG, self.DFG)
 
     def combine_AST_DFG_collapsed(self):
-        self.graph.add_nodes_from(self.AST.nodes(data=True))
-        self.graph.add_nodes_from(self.DFG.nodes(data=True))
-        self.graph.add_edges_from(self.AST.edges(data=True))
-        self.graph.add_edges_from(self.DFG.edges(data=True))
+        self.combine_graphs(self.AST, self.DFG)
 
     def combine(self):
         """Combine all combinations into a single graph"""
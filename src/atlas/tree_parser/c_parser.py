@@ -1,5 +1,35 @@
 from ..tree_parser.custom_parser import CustomParser
 
+identifier_types = frozenset({"identifier"})
+# names a pointer typedef can declare
+typedef_name_types = frozenset({"type_identifier", "identifier"})
+# parents of an identifier that may declare it
+declarator_parent_types = frozenset({"init_declarator", "parameter_declaration",
+                                     "pointer_declarator", "array_declarator"})
+# siblings that can come right before a declared identifier in a declaration
+declaration_prev_types = frozenset({'primitive_type', 'type_identifier', 'sized_type_specifier',
+                                    'struct_specifier', 'union_specifier', 'enum_specifier',
+                                    'storage_class_specifier', 'type_qualifier'})
+declaration_types = frozenset({"declaration", "parameter_declaration"})
+# children of a declaration that hold its base type
+type_specifier_types = frozenset({'primitive_type', 'type_identifier', 'sized_type_specifier',
+                                  'struct_specifier', 'union_specifier', 'enum_specifier'})
+# parents that make a token part of method_map
+method_parent_types = frozenset({"function_definition", "call_expression"})
+# nodes that open a new scope
+block_types = frozenset({
+    "compound_statement",
+    "if_statement",
+    "while_statement",
+    "for_statement",
+    "do_statement",
+    "switch_statement",
+    "case_statement",
+    "function_definition",
+})
+# named nodes with children that are still taken as a single token
+atomic_token_types = frozenset({"string_literal", "variadic_parameter"})
+
 
 class CParser(CustomParser):
     def __init__(self, src_language, src_code):
@@ -8,6 +38,8 @@ class CParser(CustomParser):
         self.typedef_map = {}
         self._parse_struct_definitions()
         self._parse_typedefs()
+        # type name -> expand_typedef result; typedef_map is fixed from here on
+        self.expanded_types = {}
 
     def check_declaration(self, current_node):
         """
@@ -18,13 +50,10 @@ class CParser(CustomParser):
         - parameter_declaration (function parameters)
         - pointer_declarator (pointer variables)
         """
-        parent_types = ["init_declarator", "parameter_declaration", "pointer_declarator", "array_declarator"]
-        current_types = ["identifier"]
-
         if (
             current_node.parent is not None
-            and current_node.parent.type in parent_types
-            and current_node.type in current_types
+            and current_node.parent.type in declarator_parent_types
+            and current_node.type == "identifier"
         ):
             if current_node.parent.type == "init_declarator":
                 if current_node.parent.children and current_node.parent.children[0] == current_node:
@@ -50,14 +79,12 @@ class CParser(CustomParser):
             for i, child in enumerate(current_node.parent.children):
                 if child == current_node and i > 0:
                     prev_sibling = current_node.parent.children[i-1]
-                    if prev_sibling.type in ['primitive_type', 'type_identifier', 'sized_type_specifier',
-                                             'struct_specifier', 'union_specifier', 'enum_specifier',
-                                             'storage_class_specifier', 'type_qualifier']:
+                    if prev_sibling.type in declaration_prev_types:
                         return True
             return False
 
         if current_node.parent is not None and current_node.parent.type == "declarator":
-            if current_node.parent.parent is not None and current_node.parent.parent.type in ["declaration", "parameter_declaration"]:
+            if current_node.parent.parent is not None and current_node.parent.parent.type in declaration_types:
                 return True
 
         if current_node.parent is not None and current_node.parent.type == "function_declarator":
@@ -67,14 +94,8 @@ class CParser(CustomParser):
         return False
 
     def find_identifier_in_declarator(self, node):
-        """Recursively find the identifier within a declarator node."""
-        if node.type == "identifier":
-            return node
-        for child in node.children:
-            result = self.find_identifier_in_declarator(child)
-            if result is not None:
-                return result
-        return None
+        """Find the first identifier within a declarator node (pre-order)."""
+        return next(self.descendants_of_types(node, identifier_types), None)
 
     def get_type(self, node):
         """
@@ -87,9 +108,6 @@ class CParser(CustomParser):
 
         Returns the full type including pointers, e.g., "char*", "int**", "uint32_t*"
         """
-        datatypes = ['primitive_type', 'type_identifier', 'sized_type_specifier',
-                     'struct_specifier', 'union_specifier', 'enum_specifier']
-
         current = node
         pointer_count = 0
         is_array = False
@@ -103,11 +121,11 @@ class CParser(CustomParser):
             if current.type == "array_declarator":
                 is_array = True
 
-            if current.type in ["declaration", "parameter_declaration"]:
+            if current.type in declaration_types:
                 base_type = None
                 for child in current.children:
-                    if child.type in datatypes:
-                        base_type = child.text.decode('utf-8')
+                    if child.type in type_specifier_types:
+                        base_type = self.node_text(child)
                         break
 
                 if base_type:
@@ -125,11 +143,9 @@ class CParser(CustomParser):
         return None
 
     def scope_check(self, parent_scope, child_scope):
-        """Check if parent_scope is a subset of child_scope."""
-        for p in parent_scope:
-            if p not in child_scope:
-                return False
-        return True
+        """Check if parent_scope is a subset of child_scope. Both are
+        scope_stack snapshots, so that is the same as being a prefix of it."""
+        return parent_scope == child_scope[:len(parent_scope)]
 
     def longest_scope_match(self, name_matches, symbol_table):
         """Given a list of name matches, return the longest scope match."""
@@ -155,104 +171,25 @@ class CParser(CustomParser):
         """
         Create tokens for C language.
         Handles C-specific constructs like pointers, arrays, function calls, etc.
+        The tree is walked with one TreeCursor rather than by recursion, so
+        deeply nested code can't reach the recursion limit.
         """
-        remove_list = ["function_definition", "call_expression"]
-
-        block_types = [
-            "compound_statement",
-            "if_statement",
-            "while_statement",
-            "for_statement",
-            "do_statement",
-            "switch_statement",
-            "case_statement",
-            "function_definition",
-        ]
-
-        if root_node.is_named and root_node.type in block_types:
-            symbol_table["scope_id"] = symbol_table["scope_id"] + 1
-            symbol_table["scope_stack"].append(symbol_table["scope_id"])
-
-        if (
-            root_node.is_named
-            and (len(root_node.children) == 0 or root_node.type in ["string_literal", "variadic_parameter"])
-            and root_node.type != "comment"
-        ):
-            index = self.index[(root_node.start_point, root_node.end_point, root_node.type)]
-
-            label[index] = root_node.text.decode("UTF-8")
-
-            start_line[index] = root_node.start_point[0]
-
-            all_tokens.append(index)
-
-            symbol_table["scope_map"][index] = symbol_table["scope_stack"].copy()
-
-            current_node = root_node
-
-            if current_node.parent is not None and current_node.parent.type in remove_list:
-                method_map.append(index)
-                if current_node.next_named_sibling is not None and current_node.next_named_sibling.type == "argument_list":
-                    method_calls.append(index)
-
-            if current_node.parent is not None and current_node.parent.type == "call_expression":
-                if current_node.parent.children and current_node.parent.children[0] == current_node:
-                    method_map.append(index)
-                    method_calls.append(index)
-
-            if current_node.parent is not None and current_node.parent.type == "field_expression":
-                field_node = current_node.parent.child_by_field_name("field")
-                if field_node is not None:
-                    field_index = self.index[(field_node.start_point, field_node.end_point, field_node.type)]
-                    current_index = self.index[(current_node.start_point, current_node.end_point, current_node.type)]
-                    if field_index == current_index:
-                        method_map.append(current_index)
-
-                while current_node.parent is not None and current_node.parent.type == "field_expression":
-                    current_node = current_node.parent
-
-                if current_node.parent is not None and current_node.parent.type == "call_expression":
-                    method_map.append(index)
-                    method_calls.append(index)
-                label[index] = current_node.text.decode("UTF-8")
-
-            if self.check_declaration(current_node):
-                variable_name = label[index]
-                declaration[index] = variable_name
-
-                variable_type = self.get_type(current_node.parent)
-                if variable_type is not None:
-                    symbol_table["data_type"][index] = variable_type
-            else:
-                current_scope = symbol_table['scope_map'][index]
-
-                if current_node.parent is not None and current_node.parent.type == "field_expression":
-                    field_variable = current_node.parent.children[-1]
-                    field_variable_name = field_variable.text.decode('utf-8')
-
-                    for (ind, var) in declaration.items():
-                        if var == field_variable_name:
-                            parent_scope = symbol_table['scope_map'][ind]
-                            if self.scope_check(parent_scope, current_scope):
-                                declaration_map[index] = ind
-                                break
-                else:
-                    name_matches = []
-                    for (ind, var) in declaration.items():
-                        if var == label[index]:
-                            parent_scope = symbol_table['scope_map'][ind]
-                            if self.scope_check(parent_scope, current_scope):
-                                name_matches.append((ind, var))
-
-                    if name_matches:
-                        closest_index = self.longest_scope_match(name_matches, symbol_table)
-                        declaration_map[index] = closest_index
-
-        else:
-            for child in root_node.children:
-                self.create_all_tokens(
-                    src_code,
-                    child,
+        cursor = root_node.walk()
+        depth = 0
+        while True:
+            node = cursor.node
+            if node.is_named and node.type in block_types:
+                symbol_table["scope_id"] = symbol_table["scope_id"] + 1
+                symbol_table["scope_stack"].append(symbol_table["scope_id"])
+                self.scope_snapshot = None
+
+            if (
+                node.is_named
+                and (node.child_count == 0 or node.type in atomic_token_types)
+                and node.type != "comment"
+            ):
+                self.add_token(
+                    node,
                     all_tokens,
                     label,
                     method_map,
@@ -262,9 +199,22 @@ class CParser(CustomParser):
                     declaration_map,
                     symbol_table,
                 )
-
-        if root_node.is_named and root_node.type in block_types:
-            symbol_table["scope_stack"].pop(-1)
+            elif cursor.goto_first_child():
+                depth += 1
+                continue
+
+            # node is finished; so is every ancestor it was the last child of
+            while True:
+                if node.is_named and node.type in block_types:
+                    symbol_table["scope_stack"].pop(-1)
+                    self.scope_snapshot = None
+                if depth == 0 or cursor.goto_next_sibling():
+                    break
+                cursor.goto_parent()
+                depth -= 1
+                node = cursor.node
+            if depth == 0:
+                break
 
         return (
             all_tokens,
@@ -277,6 +227,91 @@ class CParser(CustomParser):
             symbol_table,
         )
 
+    def add_token(
+        self,
+        node,
+        all_tokens,
+        label,
+        method_map,
+        method_calls,
+        start_line,
+        declaration,
+        declaration_map,
+        symbol_table,
+    ):
+        """Record a token node for create_all_tokens and resolve its declaration."""
+        index = self.index[(node.start_point, node.end_point, node.type)]
+
+        label[index] = self.node_text(node)
+
+        start_line[index] = node.start_point[0]
+
+        all_tokens.append(index)
+
+        # tokens in the same block share one copy of the scope stack
+        if self.scope_snapshot is None:
+            self.scope_snapshot = symbol_table["scope_stack"].copy()
+        symbol_table["scope_map"][index] = self.scope_snapshot
+
+        current_node = node
+
+        if current_node.parent is not None and current_node.parent.type in method_parent_types:
+            method_map.append(index)
+            if current_node.next_named_sibling is not None and current_node.next_named_sibling.type == "argument_list":
+                method_calls.append(index)
+
+        if current_node.parent is not None and current_node.parent.type == "call_expression":
+            if current_node.parent.children and current_node.parent.children[0] == current_node:
+                method_map.append(index)
+                method_calls.append(index)
+
+        if current_node.parent is not None and current_node.parent.type == "field_expression":
+            field_node = current_node.parent.child_by_field_name("field")
+            if field_node is not None:
+                field_index = self.index[(field_node.start_point, field_node.end_point, field_node.type)]
+                current_index = self.index[(current_node.start_point, current_node.end_point, current_node.type)]
+                if field_index == current_index:
+                    method_map.append(current_index)
+
+            while current_node.parent is not None and current_node.parent.type == "field_expression":
+                current_node = current_node.parent
+
+            if current_node.parent is not None and current_node.parent.type == "call_expression":
+                method_map.append(index)
+                method_calls.append(index)
+            label[index] = self.node_text(current_node)
+
+        if self.check_declaration(current_node):
+            variable_name = label[index]
+            declaration[index] = variable_name
+            self.declarations_by_name.setdefault(variable_name, []).append(index)
+
+            variable_type = self.get_type(current_node.parent)
+            if variable_type is not None:
+                symbol_table["data_type"][index] = variable_type
+        else:
+            current_scope = symbol_table['scope_map'][index]
+
+            if current_node.parent is not None and current_node.parent.type == "field_expression":
+                field_variable = current_node.parent.children[-1]
+                field_variable_name = self.node_text(field_variable)
+
+                for ind in self.declarations_by_name.get(field_variable_name, ()):
+                    parent_scope = symbol_table['scope_map'][ind]
+                    if self.scope_check(parent_scope, current_scope):
+                        declaration_map[index] = ind
+                        break
+            else:
+                name_matches = []
+                for ind in self.declarations_by_name.get(label[index], ()):
+                    parent_scope = symbol_table['scope_map'][ind]
+                    if self.scope_check(parent_scope, current_scope):
+                        name_matches.append((ind, declaration[ind]))
+
+                if name_matches:
+                    closest_index = self.longest_scope_match(name_matches, symbol_table)
+                    declaration_map[index] = closest_index
+
     def _parse_struct_definitions(self):
         """
         Parse all struct definitions in the code and build a mapping of
@@ -292,7 +327,7 @@ class CParser(CustomParser):
 
                 for child in node.children:
                     if child.type == "type_identifier":
-                        struct_name = child.text.decode('utf-8')
+                        struct_name = self.node_text(child)
                     elif child.type == "field_declaration_list":
                         field_list = child
 
@@ -308,25 +343,25 @@ class CParser(CustomParser):
                                     if fc.type == 'struct_specifier':
                                         for sc in fc.children:
                                             if sc.type == "type_identifier":
-                                                field_type = "struct " + sc.text.decode('utf-8')
+                                                field_type = "struct " + self.node_text(sc)
                                                 break
                                     else:
-                                        field_type = fc.text.decode('utf-8')
+                                        field_type = self.node_text(fc)
 
                                 elif fc.type == "field_identifier":
-                                    field_names.append(fc.text.decode('utf-8'))
+                                    field_names.append(self.node_text(fc))
                                 elif fc.type == "pointer_declarator":
-                                    pointer_count = fc.text.decode('utf-8').count('*')
+                                    pointer_count = fc.text.count(b'*')
                                     for pchild in fc.named_children:
                                         if pchild.type == "field_identifier":
-                                            field_names.append(pchild.text.decode('utf-8'))
+                                            field_names.append(self.node_text(pchild))
                                             break
                                     if field_type:
                                         field_type += "*" * pointer_count
                                 elif fc.type == "array_declarator":
                                     for achild in fc.children:
                                         if achild.type == "field_identifier":
-                                            field_names.append(achild.text.decode('utf-8'))
+                                            field_names.append(self.node_text(achild))
                                             break
                                     if field_type:
                                         field_type += "*"
@@ -379,22 +414,17 @@ class CParser(CustomParser):
 
                 if any(c.type == 'pointer_declarator' for c in children):
                     if children[0].type in ['primitive_type', 'sized_type_specifier', 'type_identifier']:
-                        actual_type = children[0].text.decode('utf-8')
+                        actual_type = self.node_text(children[0])
 
                     for child in children:
                         if child.type == 'pointer_declarator':
-                            pointer_count = child.text.decode('utf-8').count('*')
-
-                            def find_typedef_name(node):
-                                if node.type in ['type_identifier', 'identifier']:
-                                    return node.text.decode('utf-8')
-                                for c in node.named_children:
-                                    result = find_typedef_name(c)
-                                    if result:
-                                        return result
-                                return None
+                            pointer_count = child.text.count(b'*')
 
-                            typedef_name = find_typedef_name(child)
+                            typedef_name = None
+                            for name_node in self.descendants_of_types(child, typedef_name_types):
+                                typedef_name = self.node_text(name_node)
+                                if typedef_name:
+                                    break
 
                 elif any(c.type == 'function_declarator' for c in children):
                     if children[0].type in ['primitive_type', 'type_identifier']:
@@ -406,7 +436,7 @@ class CParser(CustomParser):
                                 if fc.type == 'pointer_declarator':
                                     for pdc in fc.named_children:
                                         if pdc.type in ['identifier', 'type_identifier']:
-                                            typedef_name = pdc.text.decode('utf-8')
+                                            typedef_name = self.node_text(pdc)
                                             break
 
                 elif any(c.type == 'struct_specifier' for c in children):
@@ -414,21 +444,21 @@ class CParser(CustomParser):
                         if child.type == 'struct_specifier':
                             for sc in child.children:
                                 if sc.type == "type_identifier":
-                                    actual_type = "struct " + sc.text.decode('utf-8')
+                                    actual_type = "struct " + self.node_text(sc)
                                     break
                             if not actual_type:
-                                actual_type = child.text.decode('utf-8')
+                                actual_type = self.node_text(child)
 
                         elif child.type in ['type_identifier', 'primitive_type'] and i > 0:
-                            typedef_name = child.text.decode('utf-8')
+                            typedef_name = self.node_text(child)
 
                 else:
                     if len(children) >= 2:
                         if children[0].type in ['primitive_type', 'sized_type_specifier', 'type_identifier']:
-                            actual_type = children[0].text.decode('utf-8')
+                            actual_type = self.node_text(children[0])
 
                         if children[-1].type in ['type_identifier', 'primitive_type']:
-                            typedef_name = children[-1].text.decode('utf-8')
+                            typedef_name = self.node_text(children[-1])
 
                 if actual_type and pointer_count > 0:
                     actual_type += "*" * pointer_count
@@ -451,13 +481,18 @@ class CParser(CustomParser):
         Returns:
             Expanded type string, or original if not a typedef
         """
+        expanded = self.expanded_types.get(type_name)
+        if expanded is not None:
+            return expanded
+
         if type_name.endswith('*'):
             base = type_name.rstrip('*')
             stars = '*' * type_name.count('*')
-            expanded = self.expand_typedef(base.strip())
-            return expanded + stars
-
-        if type_name in self.typedef_map:
-            return self.expand_typedef(self.typedef_map[type_name])
+            expanded = self.expand_typedef(base.strip()) + stars
+        elif type_name in self.typedef_map:
+            expanded = self.expand_typedef(self.typedef_map[type_name])
+        else:
+            expanded = type_name
 
-        return type_name
+        self.expanded_types[type_name] = expanded
+        return expanded
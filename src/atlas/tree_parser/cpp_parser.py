@@ -1,5 +1,50 @@
 from ..tree_parser.custom_parser import CustomParser
 
+identifier_types = frozenset({"identifier"})
+# parents of an identifier that may declare it
+declarator_parent_types = frozenset({"init_declarator", "parameter_declaration",
+                                     "optional_parameter_declaration", "pointer_declarator",
+                                     "reference_declarator", "array_declarator"})
+# siblings that can come right before a declared identifier in a declaration
+declaration_prev_types = frozenset({'primitive_type', 'type_identifier', 'sized_type_specifier',
+                                    'struct_specifier', 'class_specifier', 'union_specifier',
+                                    'enum_specifier', 'storage_class_specifier', 'type_qualifier',
+                                    'auto', 'template_type', 'qualified_identifier'})
+# the same for a member declared in a field_declaration
+field_declaration_prev_types = frozenset({'primitive_type', 'type_identifier', 'sized_type_specifier',
+                                          'template_type', 'qualified_identifier', 'auto'})
+# nodes whose children carry the declared type
+typed_declaration_types = frozenset({"declaration", "parameter_declaration",
+                                     "optional_parameter_declaration", "field_declaration"})
+# children of a declaration that hold its type
+type_specifier_types = frozenset({'primitive_type', 'type_identifier', 'sized_type_specifier',
+                                  'struct_specifier', 'class_specifier', 'union_specifier',
+                                  'enum_specifier', 'template_type', 'qualified_identifier',
+                                  'auto', 'decltype'})
+# parents that make a token part of method_map
+method_parent_types = frozenset({"function_definition", "call_expression",
+                                 "class_specifier", "struct_specifier"})
+# nodes that open a new scope
+block_types = frozenset({
+    "compound_statement",
+    "if_statement",
+    "while_statement",
+    "for_statement",
+    "for_range_loop",
+    "do_statement",
+    "switch_statement",
+    "case_statement",
+    "function_definition",
+    "class_specifier",
+    "struct_specifier",
+    "namespace_definition",
+    "try_statement",
+    "catch_clause",
+    "lambda_expression",
+})
+# named nodes with children that are still taken as a single token
+atomic_token_types = frozenset({"string_literal", "raw_string_literal"})
+
 
 class CppParser(CustomParser):
     def __init__(self, src_language, src_code):
@@ -17,14 +62,10 @@ class CppParser(CustomParser):
         - auto declarations
         - structured bindings
         """
-        parent_types = ["init_declarator", "parameter_declaration", "optional_parameter_declaration",
-                        "pointer_declarator", "reference_declarator", "array_declarator"]
-        current_types = ["identifier"]
-
         if (
             current_node.parent is not None
-            and current_node.parent.type in parent_types
-            and current_node.type in current_types
+            and current_node.parent.type in declarator_parent_types
+            and current_node.type == "identifier"
         ):
             if current_node.parent.type == "init_declarator":
                 declarator = current_node.parent.children[0] if current_node.parent.children else None
@@ -51,10 +92,7 @@ class CppParser(CustomParser):
             for i, child in enumerate(current_node.parent.children):
                 if child == current_node and i > 0:
                     prev_sibling = current_node.parent.children[i-1]
-                    if prev_sibling.type in ['primitive_type', 'type_identifier', 'sized_type_specifier',
-                                             'struct_specifier', 'class_specifier', 'union_specifier',
-                                             'enum_specifier', 'storage_class_specifier', 'type_qualifier',
-                                             'auto', 'template_type', 'qualified_identifier']:
+                    if prev_sibling.type in declaration_prev_types:
                         return True
             return False
 
@@ -71,21 +109,14 @@ class CppParser(CustomParser):
             for i, child in enumerate(current_node.parent.children):
                 if child == current_node and i > 0:
                     prev_sibling = current_node.parent.children[i-1]
-                    if prev_sibling.type in ['primitive_type', 'type_identifier', 'sized_type_specifier',
-                                             'template_type', 'qualified_identifier', 'auto']:
+                    if prev_sibling.type in field_declaration_prev_types:
                         return True
 
         return False
 
     def find_identifier_in_declarator(self, node):
-        """Recursively find the identifier within a declarator node."""
-        if node.type == "identifier":
-            return node
-        for child in node.children:
-            result = self.find_identifier_in_declarator(child)
-            if result is not None:
-                return result
-        return None
+        """Find the first identifier within a declarator node (pre-order)."""
+        return next(self.descendants_of_types(node, identifier_types), None)
 
     def get_type(self, node):
         """
@@ -95,17 +126,13 @@ class CppParser(CustomParser):
         This function traverses up the tree to find the declaration or parameter_declaration node,
         then searches for the type specifier among its children.
         """
-        datatypes = ['primitive_type', 'type_identifier', 'sized_type_specifier',
-                     'struct_specifier', 'class_specifier', 'union_specifier', 'enum_specifier',
-                     'template_type', 'qualified_identifier', 'auto', 'decltype']
-
         current = node
 
         while current is not None:
-            if current.type in ["declaration", "parameter_declaration", "optional_parameter_declaration", "field_declaration"]:
+            if current.type in typed_declaration_types:
                 for child in current.children:
-                    if child.type in datatypes:
-                        return child.text.decode('utf-8')
+                    if child.type in type_specifier_types:
+                        return self.node_text(child)
                 return None
 
             current = current.parent
@@ -113,11 +140,9 @@ class CppParser(CustomParser):
         return None
 
     def scope_check(self, parent_scope, child_scope):
-        """Check if parent_scope is a subset of child_scope."""
-        for p in parent_scope:
-            if p not in child_scope:
-                return False
-        return True
+        """Check if parent_scope is a subset of child_scope. Both are
+        scope_stack snapshots, so that is the same as being a prefix of it."""
+        return parent_scope == child_scope[:len(parent_scope)]
 
     def longest_scope_match(self, name_matches, symbol_table):
         """Given a list of name matches, return the longest scope match."""
@@ -143,133 +168,25 @@ class CppParser(CustomParser):
         """
         Create tokens for C++ language.
         Handles C++-specific constructs like classes, namespaces, templates, references, etc.
+        The tree is walked with one TreeCursor rather than by recursion, so
+        deeply nested code can't reach the recursion limit.
         """
-        remove_list = ["function_definition", "call_expression", "class_specifier", "struct_specifier"]
-
-        block_types = [
-            "compound_statement",
-            "if_statement",
-            "while_statement",
-            "for_statement",
-            "for_range_loop",
-            "do_statement",
-            "switch_statement",
-            "case_statement",
-            "function_definition",
-            "class_specifier",
-            "struct_specifier",
-            "namespace_definition",
-            "try_statement",
-            "catch_clause",
-            "lambda_expression",
-        ]
-
-        if root_node.is_named and root_node.type in block_types:
-            symbol_table["scope_id"] = symbol_table["scope_id"] + 1
-            symbol_table["scope_stack"].append(symbol_table["scope_id"])
-
-        if (
-            root_node.is_named
-            and (len(root_node.children) == 0 or root_node.type in ["string_literal", "raw_string_literal"])
-            and root_node.type != "comment"
-        ):
-            index = self.index[(root_node.start_point, root_node.end_point, root_node.type)]
-
-            label[index] = root_node.text.decode("UTF-8")
-
-            start_line[index] = root_node.start_point[0]
-
-            all_tokens.append(index)
-
-            symbol_table["scope_map"][index] = symbol_table["scope_stack"].copy()
-
-            current_node = root_node
-
-            if current_node.parent is not None and current_node.parent.type in remove_list:
-                method_map.append(index)
-                if current_node.next_named_sibling is not None and current_node.next_named_sibling.type == "argument_list":
-                    method_calls.append(index)
-
-            if current_node.parent is not None and current_node.parent.type == "call_expression":
-                function_node = current_node.parent.child_by_field_name("function")
-                if function_node == current_node or (function_node and self.find_identifier_in_declarator(function_node) == current_node):
-                    method_map.append(index)
-                    method_calls.append(index)
-
-            if current_node.parent is not None and current_node.parent.type == "field_expression":
-                field_node = current_node.parent.child_by_field_name("field")
-                if field_node is not None:
-                    field_index = self.index[(field_node.start_point, field_node.end_point, field_node.type)]
-                    current_index = self.index[(current_node.start_point, current_node.end_point, current_node.type)]
-                    if field_index == current_index:
-                        method_map.append(current_index)
-
-                while current_node.parent is not None and current_node.parent.type == "field_expression":
-                    current_node = current_node.parent
-
-                if current_node.parent is not None and current_node.parent.type == "call_expression":
-                    method_map.append(index)
-                    method_calls.append(index)
-                label[index] = current_node.text.decode("UTF-8")
-
-            if current_node.parent is not None and current_node.parent.type == "qualified_identifier":
-                if current_node.parent.children and current_node.parent.children[-1] == current_node:
-                    label[index] = current_node.parent.text.decode("UTF-8")
-
-            if current_node.parent is not None and current_node.parent.type == "template_function":
-                method_map.append(index)
-                if current_node.next_named_sibling is not None and current_node.next_named_sibling.type == "template_argument_list":
-                    method_calls.append(index)
-
-            if self.check_declaration(current_node):
-                variable_name = label[index]
-                declaration[index] = variable_name
-
-                variable_type = self.get_type(current_node.parent)
-                if variable_type is not None:
-                    symbol_table["data_type"][index] = variable_type
-            else:
-                current_scope = symbol_table['scope_map'][index]
-
-                if current_node.parent is not None and current_node.parent.type == "field_expression":
-                    field_variable = current_node.parent.children[-1]
-                    field_variable_name = field_variable.text.decode('utf-8')
-
-                    for (ind, var) in declaration.items():
-                        if var == field_variable_name:
-                            parent_scope = symbol_table['scope_map'][ind]
-                            if self.scope_check(parent_scope, current_scope):
-                                declaration_map[index] = ind
-                                break
-                elif current_node.parent is not None and current_node.parent.type == "qualified_identifier":
-                    qualified_name = current_node.parent.text.decode('utf-8')
-                    name_matches = []
-                    for (ind, var) in declaration.items():
-                        if var == qualified_name or var == label[index]:
-                            parent_scope = symbol_table['scope_map'][ind]
-                            if self.scope_check(parent_scope, current_scope):
-                                name_matches.append((ind, var))
-
-                    if name_matches:
-                        closest_index = self.longest_scope_match(name_matches, symbol_table)
-                        declaration_map[index] = closest_index
-                else:
-                    name_matches = []
-                    for (ind, var) in declaration.items():
-                        if var == label[index]:
-                            parent_scope = symbol_table['scope_map'][ind]
-                            if self.scope_check(parent_scope, current_scope):
-                                name_matches.append((ind, var))
-
-                    if name_matches:
-                        closest_index = self.longest_scope_match(name_matches, symbol_table)
-                        declaration_map[index] = closest_index
-
-        else:
-            for child in root_node.children:
-                self.create_all_tokens(
-                    src_code,
-                    child,
+        cursor = root_node.walk()
+        depth = 0
+        while True:
+            node = cursor.node
+            if node.is_named and node.type in block_types:
+                symbol_table["scope_id"] = symbol_table["scope_id"] + 1
+                symbol_table["scope_stack"].append(symbol_table["scope_id"])
+                self.scope_snapshot = None
+
+            if (
+                node.is_named
+                and (node.child_count == 0 or node.type in atomic_token_types)
+                and node.type != "comment"
+            ):
+                self.add_token(
+                    node,
                     all_tokens,
                     label,
                     method_map,
@@ -279,9 +196,22 @@ class CppParser(CustomParser):
                     declaration_map,
                     symbol_table,
                 )
-
-        if root_node.is_named and root_node.type in block_types:
-            symbol_table["scope_stack"].pop(-1)
+            elif cursor.goto_first_child():
+                depth += 1
+                continue
+
+            # node is finished; so is every ancestor it was the last child of
+            while True:
+                if node.is_named and node.type in block_types:
+                    symbol_table["scope_stack"].pop(-1)
+                    self.scope_snapshot = None
+                if depth == 0 or cursor.goto_next_sibling():
+                    break
+                cursor.goto_parent()
+                depth -= 1
+                node = cursor.node
+            if depth == 0:
+                break
 
         return (
             all_tokens,
@@ -293,3 +223,113 @@ class CppParser(CustomParser):
             declaration_map,
             symbol_table,
         )
+
+    def add_token(
+        self,
+        node,
+        all_tokens,
+        label,
+        method_map,
+        method_calls,
+        start_line,
+        declaration,
+        declaration_map,
+        symbol_table,
+    ):
+        """Record a token node for create_all_tokens and resolve its declaration."""
+        index = self.index[(node.start_point, node.end_point, node.type)]
+
+        label[index] = self.node_text(node)
+
+        start_line[index] = node.start_point[0]
+
+        all_tokens.append(index)
+
+        # tokens in the same block share one copy of the scope stack
+        if self.scope_snapshot is None:
+            self.scope_snapshot = symbol_table["scope_stack"].copy()
+        symbol_table["scope_map"][index] = self.scope_snapshot
+
+        current_node = node
+
+        if current_node.parent is not None and current_node.parent.type in method_parent_types:
+            method_map.append(index)
+            if current_node.next_named_sibling is not None and current_node.next_named_sibling.type == "argument_list":
+                method_calls.append(index)
+
+        if current_node.parent is not None and current_node.parent.type == "call_expression":
+            function_node = current_node.parent.child_by_field_name("function")
+            if function_node == current_node or (function_node and self.find_identifier_in_declarator(function_node) == current_node):
+                method_map.append(index)
+                method_calls.append(index)
+
+        if current_node.parent is not None and current_node.parent.type == "field_expression":
+            field_node = current_node.parent.child_by_field_name("field")
+            if field_node is not None:
+                field_index = self.index[(field_node.start_point, field_node.end_point, field_node.type)]
+                current_index = self.index[(current_node.start_point, current_node.end_point, current_node.type)]
+                if field_index == current_index:
+                    method_map.append(current_index)
+
+            while current_node.parent is not None and current_node.parent.type == "field_expression":
+                current_node = current_node.parent
+
+            if current_node.parent is not None and current_node.parent.type == "call_expression":
+                method_map.append(index)
+                method_calls.append(index)
+            label[index] = self.node_text(current_node)
+
+        if current_node.parent is not None and current_node.parent.type == "qualified_identifier":
+            if current_node.parent.children and current_node.parent.children[-1] == current_node:
+                label[index] = self.node_text(current_node.parent)
+
+        if current_node.parent is not None and current_node.parent.type == "template_function":
+            method_map.append(index)
+            if current_node.next_named_sibling is not None and current_node.next_named_sibling.type == "template_argument_list":
+                method_calls.append(index)
+
+        if self.check_declaration(current_node):
+            variable_name = label[index]
+            declaration[index] = variable_name
+            self.declarations_by_name.setdefault(variable_name, []).append(index)
+
+            variable_type = self.get_type(current_node.parent)
+            if variable_type is not None:
+                symbol_table["data_type"][index] = variable_type
+        else:
+            current_scope = symbol_table['scope_map'][index]
+
+            if current_node.parent is not None and current_node.parent.type == "field_expression":
+                field_variable = current_node.parent.children[-1]
+                field_variable_name = self.node_text(field_variable)
+
+                for ind in self.declarations_by_name.get(field_variable_name, ()):
+                    parent_scope = symbol_table['scope_map'][ind]
+                    if self.scope_check(parent_scope, current_scope):
+                        declaration_map[index] = ind
+                        break
+            elif current_node.parent is not None and current_node.parent.type == "qualified_identifier":
+                qualified_name = self.node_text(current_node.parent)
+                name_matches = []
+                candidates = self.declarations_by_name.get(qualified_name, [])
+                if qualified_name != label[index]:
+                    # indices grow in declaration order, so sorting restores it
+                    candidates = sorted(candidates + self.declarations_by_name.get(label[index], []))
+                for ind in candidates:
+                    parent_scope = symbol_table['scope_map'][ind]
+                    if self.scope_check(parent_scope, current_scope):
+                        name_matches.append((ind, declaration[ind]))
+
+                if name_matches:
+                    closest_index = self.longest_scope_match(name_matches, symbol_table)
+                    declaration_map[index] = closest_index
+            else:
+                name_matches = []
+                for ind in self.declarations_by_name.get(label[index], ()):
+                    parent_scope = symbol_table['scope_map'][ind]
+                    if self.scope_check(parent_scope, current_scope):
+                        name_matches.append((ind, declaration[ind]))
+
+                if name_matches:
+                    closest_index = self.longest_scope_match(name_matches, symbol_table)
+                    declaration_map[index] = closest_index
@@ -3,6 +3,7 @@ import subprocess
 from tree_sitter import Parser
 
 from atlas import get_language_map
+from atlas.utils.src_parser import traverse_tree
 
 
 def get_commit_hash(directory):
@@ -27,6 +28,9 @@ class CustomParser:
         self.src_code = src_code
         self.index = {}
         self.language_map = get_language_map()
+        # filled by the first nodes_of_types call
+        self.preorder_nodes = None
+        self.type_positions = None
         self.root_node, self.tree = self.parse()
         self.all_tokens = []
         self.label = {}
@@ -34,13 +38,20 @@ class CustomParser:
         self.method_calls = []
         self.start_line = {}
         self.declaration = {}
+        # variable name -> indices of its declarations, in declaration order
+        self.declarations_by_name = {}
         self.declaration_map = {}
+        # (start_byte, end_byte) -> decoded source text, filled by node_text
+        self.text_cache = {}
         self.symbol_table = {
             "scope_stack": [0],
             "scope_map": {},
             "scope_id": 0,
             "data_type": {},
         }
+        # copy of symbol_table["scope_stack"] shared by the tokens of the
+        # current block; dropped by create_all_tokens whenever the stack changes
+        self.scope_snapshot = None
 
     def create_AST_id(self, root_node, AST_index, AST_id):
         """Create an id for each node in the AST. This AST id is maintained and used across all code views so that
@@ -62,4 +73,59 @@ class CustomParser:
         tree = parser.parse(bytes(self.src_code, "utf8"))
         self.root_node = tree.root_node
         self.create_AST_id(self.root_node, self.index, [5])
+        # index id -> node key and index id -> start row, for the data flow passes
+        self.reverse_index = {idx: key for key, idx in self.index.items()}
+        self.line_of_index = {idx: key[0][0] for key, idx in self.index.items()}
         return self.root_node, tree
+
+    def node_text(self, node):
+        """Decoded source text of node, decoded once per byte range"""
+        key = (node.start_byte, node.end_byte)
+        text = self.text_cache.get(key)
+        if text is None:
+            text = node.text.decode("utf-8")
+            self.text_cache[key] = text
+        return text
+
+    def index_bitmap(self, indices):
+        """Return a bytearray with a 1 at every AST index id in indices, so
+        membership can be tested with bitmap[idx] instead of a map lookup"""
+        bitmap = bytearray(max(self.reverse_index, default=0) + 1)
+        for idx in indices:
+            bitmap[idx] = 1
+        return bitmap
+
+    def descendants_of_types(self, node, node_types):
+        """Yield node and the nodes under it whose type is in node_types, in
+        pre-order, walking with a TreeCursor instead of recursing"""
+        cursor = node.walk()
+        depth = 0
+        while True:
+            current = cursor.node
+            if current.type in node_types:
+                yield current
+            if cursor.goto_first_child():
+                depth += 1
+                continue
+            while depth and not cursor.goto_next_sibling():
+                cursor.goto_parent()
+                depth -= 1
+            if depth == 0:
+                return
+
+    def nodes_of_types(self, node_types):
+        """Return the nodes whose type is in node_types, in pre-order.
+        The tree is walked once, on the first call, and each node's pre-order
+        position is kept by type, so the data flow passes that each need a
+        few node types don't each walk the whole tree"""
+        if self.type_positions is None:
+            self.preorder_nodes = []
+            self.type_positions = {}
+            for position, node in enumerate(traverse_tree(self.tree)):
+                self.preorder_nodes.append(node)
+                self.type_positions.setdefault(node.type, []).append(position)
+        positions = []
+        for node_type in node_types:
+            positions.extend(self.type_positions.get(node_type, ()))
+        positions.sort()
+        return [self.preorder_nodes[position] for position in positions]
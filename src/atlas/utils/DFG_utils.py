@@ -1,3 +1,12 @@
+import hashlib
+import os
+import pickle
+
+# Bump when Identifier/Literal or the RDA table layout changes, so tables
+# pickled by an older version are not picked up again
+rda_cache_version = 2
+
+
 def tree_to_token_index(root_node):
     """Returns all tokens in the tree rooted at the given root node using index values"""
     if (
@@ -42,3 +51,38 @@ def index_to_code_token(index, code):
             s += code[i]
         s += code[end_point[0]][: end_point[1]]
     return s
+
+
+def rda_cache_path(cache_dir, src_language, src_code, cfg_graph):
+    """Returns the file an RDA table for this source and CFG is cached in.
+    The table depends on the source and on which statements made it into the
+    CFG, so both are part of the content hash"""
+    digest = hashlib.sha256()
+    for part in (str(rda_cache_version), src_language, src_code,
+                 repr(sorted(cfg_graph.nodes))):
+        digest.update(part.encode("utf-8"))
+        digest.update(b"\0")
+    key = digest.hexdigest()
+    return os.path.join(cache_dir, "rda", key[:2], key[2:] + ".pkl")
+
+
+def load_rda_table(path):
+    """Returns the RDA table cached at path, or None if there is no usable one.
+    A cache entry is only an optimization, so whatever makes it unloadable
+    (a truncated file, a newer pickle protocol, a class that moved) counts
+    as a miss"""
+    try:
+        with open(path, "rb") as f:
+            return pickle.load(f)
+    except Exception:
+        return None
+
+
+def store_rda_table(path, rda_table):
+    """Caches an RDA table at path; the file is written under a temporary
+    name and moved into place so readers never see a partial table"""
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp_path = "%s.%d.tmp" % (path, os.getpid())
+    with open(tmp_path, "wb") as f:
+        pickle.dump(rda_table, f, protocol=pickle.HIGHEST_PROTOCOL)
+    os.replace(tmp_path, path)
@@ -1,16 +1,24 @@
 def traverse_tree(tree, finest_granularity=None):
-    if finest_granularity is None:
-        finest_granularity = []
+    """
+    Yield the nodes under tree in pre-order using a single TreeCursor.
+    Each cursor position is wrapped in a Node only once; the same wrapper is
+    used for the finest_granularity check and for the yield.
+    """
+    finest_granularity = frozenset(finest_granularity) if finest_granularity else frozenset()
     cursor = tree.walk()
+    node = cursor.node
 
     reached_root = False
     while not reached_root:
-        yield cursor.node
+        yield node
 
-        if cursor.goto_first_child() and cursor.node.type not in finest_granularity:
-            continue
+        if cursor.goto_first_child():
+            node = cursor.node
+            if node.type not in finest_granularity:
+                continue
 
         if cursor.goto_next_sibling():
+            node = cursor.node
             continue
 
         retracing = True
@@ -20,4 +28,5 @@ def traverse_tree(tree, finest_granularity=None):
                 reached_root = True
 
             if cursor.goto_next_sibling():
+                node = cursor.node
                 retracing = False
@@ -0,0 +1,30 @@
+import pytest
+
+pytest.importorskip("tree_sitter")
+pytest.importorskip("networkx")
+
+from atlas.codeviews.CFG.CFG_driver import CFGDriver  # noqa: E402
+
+REPEATED_CALL = """
+int f(int x) {
+    return x;
+}
+
+int main() {
+    int x = 1;
+    int y = f(x) + f(x);
+    return y;
+}
+"""
+
+
+def test_cfg_c_keeps_parallel_call_edges():
+    graph = CFGDriver("c", REPEATED_CALL, "").graph
+    returns = [
+        (src, dest)
+        for src, dest, data in graph.edges(data=True)
+        if data["controlflow_type"] == "function_return"
+    ]
+    # one function_return edge per call site, even when they share endpoints
+    assert len(returns) == 2
+    assert returns[0] == returns[1]
@@ -0,0 +1,68 @@
+import pytest
+
+pytest.importorskip("tree_sitter")
+pytest.importorskip("networkx")
+
+from atlas.codeviews.SDFG.SDFG import DfgRda  # noqa: E402
+
+SOURCES = {
+    "c": """
+int add(int *total, int x) {
+    *total += x;
+    return *total;
+}
+
+int main() {
+    int total = 0;
+    for (int i = 0; i < 3; i++) {
+        add(&total, i);
+    }
+    return total;
+}
+""",
+    "cpp": """
+class Counter {
+public:
+    int count = 0;
+    void bump(int by) { count += by; }
+};
+
+int main() {
+    Counter c;
+    int step = 2;
+    c.bump(step);
+    return c.count;
+}
+""",
+}
+
+
+def dfg_properties(rda_cache_dir=None):
+    dfg = {"last_use": True, "last_def": True, "alex_algo": True}
+    if rda_cache_dir:
+        dfg["rda_cache_dir"] = str(rda_cache_dir)
+    return {"CFG": {}, "DFG": dfg}
+
+
+def graph_edges(result):
+    return sorted(
+        (src, dest, repr(sorted(data.items())))
+        for src, dest, data in result.graph.edges(data=True)
+    )
+
+
+@pytest.mark.parametrize("src_language", sorted(SOURCES))
+def test_rda_cache_matches_uncached_run(tmp_path, src_language):
+    src_code = SOURCES[src_language]
+    uncached = DfgRda(src_language=src_language, src_code=src_code,
+                      properties=dfg_properties())
+
+    cold = DfgRda(src_language=src_language, src_code=src_code,
+                  properties=dfg_properties(tmp_path))
+    assert list((tmp_path / "rda").rglob("*.pkl"))
+
+    warm = DfgRda(src_language=src_language, src_code=src_code,
+                  properties=dfg_properties(tmp_path))
+
+    assert graph_edges(cold) == graph_edges(uncached)
+    assert graph_edges(warm) == graph_edges(uncached)
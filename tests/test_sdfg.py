@@ -0,0 +1,53 @@
+import pytest
+
+pytest.importorskip("tree_sitter")
+pytest.importorskip("networkx")
+
+from atlas.codeviews.SDFG.SDFG import DfgRda, clear_caches  # noqa: E402
+
+SOURCE = """
+int scale(int *value, int by) {
+    *value = *value * by;
+    return *value;
+}
+
+int main() {
+    int x = 2;
+    int y = 0;
+    while (x < 100) {
+        y = scale(&x, 3);
+    }
+    return x + y;
+}
+"""
+
+DFG_PROPERTIES = [
+    {"last_use": True, "last_def": True, "alex_algo": True},
+    {"last_use": False, "last_def": True, "alex_algo": False},
+]
+
+
+def run(dfg_properties):
+    return DfgRda(src_language="c", src_code=SOURCE,
+                  properties={"CFG": {}, "DFG": dict(dfg_properties)})
+
+
+def graph_edges(result):
+    return sorted(
+        (src, dest, repr(sorted(data.items())))
+        for src, dest, data in result.graph.edges(data=True)
+    )
+
+
+def test_cached_cfg_matches_fresh_builds():
+    fresh = []
+    for dfg_properties in DFG_PROPERTIES:
+        clear_caches()
+        fresh.append(graph_edges(run(dfg_properties)))
+
+    clear_caches()
+    results = [run(dfg_properties) for dfg_properties in DFG_PROPERTIES]
+
+    # the second run is a cache hit and shares the first run's CFG
+    assert results[0].CFG_Results is results[1].CFG_Results
+    assert [graph_edges(result) for result in results] == fresh
@@ -0,0 +1,32 @@
+import pytest
+
+pytest.importorskip("tree_sitter")
+pytest.importorskip("networkx")
+
+from atlas.codeviews.SDFG.SDFG import DfgRda  # noqa: E402
+
+NAMESPACED_FUNCTION = """
+namespace NS {
+    int bump(int* k) {
+        *k += 1;
+        return *k;
+    }
+}
+
+int main() {
+    int x = 1;
+    NS::bump(&x);
+    return x;
+}
+"""
+
+
+def test_dfg_cpp_namespaced_function():
+    result = DfgRda(src_language="cpp", src_code=NAMESPACED_FUNCTION)
+    assert result.graph.number_of_nodes() > 0
+    defined = {
+        identifier.name
+        for entry in result.rda_table.values()
+        for identifier in entry["def"]
+    }
+    assert "NS::bump" in defined